@@ -5,6 +5,8 @@ import pygame
 import sys
 from core.config            import Config
 from core.game_state        import GameState
+from core.stats_store       import StatsStore, result_from_state
+from core.scenes            import Scene, SceneManager
 
 from screens.settings_logic import SettingsLogic
 from screens.settings_render import SettingsRender
@@ -17,8 +19,15 @@ from screens.playing_logic  import PlayingLogic
 from screens.playing_render import PlayingRender
 from screens.stats_logic    import StatsLogic
 from screens.stats_render   import StatsRender
-from helpers.draw_helpers   import draw_modal,draw_button,draw_text_center
+from helpers.draw_helpers   import (
+    draw_modal, draw_button, reset_ui_caches, end_ui_frame,
+    draw_modal_backdrop, draw_modal_box, modal_backdrop_ready, release_modal_backdrop
+)
+from helpers.widgets        import button_layer
+from helpers.perf_hud       import FrameProfiler
+from helpers.input_events   import install_event_filter, frame_events
 from game.board_helpers     import create_board
+from game                   import ai_strategies, monte_carlo
 from screens.menu_tk import MenuTk 
 
 """
@@ -27,10 +36,13 @@ Purpose:
   - Entry point: Tk menu launcher and Pygame game loop.
   - Initializes subsystems (graphics, audio, state, screens).
   - Manages scene transitions: menu, settings, lobby, placing, playing, stats.
-  - Handles window events, modal dialogs, and scaling.
+    Pygame screens live in a SceneManager: built on first visit, dispatched
+    by name, with enter/exit hooks run on every scene change.
+  - Handles window events, modal dialogs, and scaling (input is filtered,
+    motion-coalesced and remapped to canvas space by helpers/input_events).
+  - Profiles each loop phase per scene (F3 HUD, F4 JSONL recording).
 Future Hooks:
   - Support fullscreen toggle and dynamic resolution.
-  - Log performance metrics (FPS, memory).
 """
 
 def show_tk_menu(state=None):
@@ -53,6 +65,9 @@ def show_tk_menu(state=None):
     def quit_app():
         # Exit the whole application
         import sys
+        if state and state.stats_store:
+            state.stats_store.close()
+        monte_carlo.shutdown()
         sys.exit()
 
     # — Instantiate your Tk menu, giving it exactly those callbacks —
@@ -71,12 +86,15 @@ def run_game(initial_state="menu", state=None):
     # ─── Pygame Initialization ───────────────────────────────────────────────────
     pygame.init()
     pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+    # fonts/buttons cached by a previous run died with pygame.quit()
+    reset_ui_caches()
  
     # -----------------------------------------
     VW, VH = Config.WIDTH, Config.HEIGHT
     canvas = pygame.Surface((VW, VH))
     screen = pygame.display.set_mode((VW, VH), pygame.RESIZABLE)
     pygame.display.set_caption("Battleship")
+    install_event_filter()
 
      # ─── Load & start background music ─────────────────────────
     bgm_path = "resources/music/background_music.mp3"
@@ -98,47 +116,109 @@ def run_game(initial_state="menu", state=None):
     if state is None:
         
         state = GameState(lambda: None)
+    if state.stats_store is None:
+        state.stats_store = StatsStore()
+    # Expert samples on a process pool: start its workers before the first move
+    if state.difficulty == "Expert":
+        monte_carlo.prewarm(Config.MC_WORKERS)
     # remember initial state (menu, settings, etc.)
     state.game_state = initial_state
-    placing_logic  = PlacingLogic(screen, state)
-    placing_render = PlacingRender(placing_logic)
-    state.reset_callback = placing_logic.reset
     state.is_fullscreen = False
-    
 
- 
-    settings_logic  = SettingsLogic(screen, state)
-    settings_render = SettingsRender(settings_logic)
+    # ─── Scenes (each built the first time it is shown) ─────────────────────────
+    scenes = SceneManager()
 
-    lobby_logic     = LobbyLogic(screen, state)
-    lobby_render    = LobbyRender(lobby_logic)
+    def reset_placing():
+        # an unbuilt placing scene starts from a clean board anyway
+        scene = scenes.peek("placing")
+        if scene:
+            scene.logic.reset()
+    state.reset_callback = reset_placing
 
-    
-     # create the two SFX
-    hit_sfx  = pygame.mixer.Sound("resources/music/hit.mp3")
-    miss_sfx = pygame.mixer.Sound("resources/music/ship-miss.mp3")
-    hit_sfx.set_volume(0.7)
-    miss_sfx.set_volume(0.7)
-    playing_logic   = PlayingLogic(screen, state, hit_sfx=hit_sfx, miss_sfx=miss_sfx)
-    playing_render  = PlayingRender(playing_logic)
+    def build_placing():
+        logic = PlacingLogic(screen, state)
+        render = PlacingRender(logic)
 
-    stats_logic     = StatsLogic(screen, state)
-    stats_render    = StatsRender(stats_logic)
+        def update(state, now):
+            if state.network:
+                logic.update(state)
+        return Scene(logic, render,
+                     handle=logic.handle_event, update=update,
+                     exit=lambda state: render.release())
+
+    def build_playing():
+        # create the two SFX
+        hit_sfx  = pygame.mixer.Sound("resources/music/hit.mp3")
+        miss_sfx = pygame.mixer.Sound("resources/music/ship-miss.mp3")
+        hit_sfx.set_volume(0.7)
+        miss_sfx.set_volume(0.7)
+        logic  = PlayingLogic(screen, state, hit_sfx=hit_sfx, miss_sfx=miss_sfx)
+        render = PlayingRender(logic)
+
+        def update(state, now):
+            # turn logic first so `my_turn` is updated before click handling
+            if state.network:
+                logic.handle_network_turn(now)
+            else:
+                logic.handle_ai_turn(now)
+
+        def enter(state):
+            logic.reset()
+            state.timer_start = pygame.time.get_ticks()
+            state.score = 0
+            state.hit_count = 0
+            state.last_shot_time = state.timer_start
+        return Scene(logic, render,
+                     handle=logic.handle_event, update=update,
+                     enter=enter, exit=lambda state: render.release())
+
+    def build_stats():
+        logic  = StatsLogic(screen, state)
+        render = StatsRender(logic)
+
+        def enter(state):
+            # Persist the finished match (write-behind, never blocks the frame)
+            result = result_from_state(state, pygame.time.get_ticks())
+            if result:
+                state.stats_store.record(result)
+            # Build the summary + cached panel once for the whole visit
+            render.on_enter(state)
+            # Next match's boards get built while the player reads the stats
+            state.prepare_next_board()
+        return Scene(logic, render, enter=enter, exit=lambda state: render.on_exit())
+
+    def build_lobby():
+        logic = LobbyLogic(screen, state)
+        return Scene(logic, LobbyRender(logic))
+
+    def build_settings():
+        logic = SettingsLogic(screen, state)
+        return Scene(logic, SettingsRender(logic))
+
+    scenes.register("placing",  build_placing)
+    scenes.register("playing",  build_playing)
+    scenes.register("stats",    build_stats)
+    scenes.register("lobby",    build_lobby)
+    scenes.register("settings", build_settings)
 
     def restart_game():
         """
         Reset boards, stats, AI/multiplayer state, and clear networking/lobby UI.
         """
         state.reset_all()
-        playing_logic.reset()
+        playing = scenes.peek("playing")
+        if playing:
+            playing.logic.reset()
         # clear networking so we can host/join again
         state.network   = None
         state.is_host   = False
         # reset lobby UI fields
-        lobby_logic.mode        = None
-        lobby_logic.waiting     = False
-        lobby_logic.ip_input    = ""
-        lobby_logic.host_ip_str = ""
+        lobby = scenes.peek("lobby")
+        if lobby:
+            lobby.logic.mode        = None
+            lobby.logic.waiting     = False
+            lobby.logic.ip_input    = ""
+            lobby.logic.host_ip_str = ""
 
         state.local_ready      = False
         state.remote_ready     = False
@@ -147,6 +227,12 @@ def run_game(initial_state="menu", state=None):
 
    
     clock = pygame.time.Clock()
+    perf  = FrameProfiler()
+
+    def expert_sample_rate():
+        rate = ai_strategies.report().get("Expert", {}).get("samples_per_s")
+        return f"Expert MC {rate:,.0f} samples/s" if rate else None
+    perf.info = expert_sample_rate
     
     if state.game_state == "placing_multi":
         state.pass_play_mode   = True
@@ -156,8 +242,9 @@ def run_game(initial_state="menu", state=None):
         state.current_player   = 0
 
         # 3) Build two fresh boards for ships & two for attacks
-        state.pass_play_boards  = [create_board(), create_board()]
-        state.pass_play_attacks = [create_board(), create_board()]
+        n = state.rules.grid_size
+        state.pass_play_boards  = [create_board(n), create_board(n)]
+        state.pass_play_attacks = [create_board(n), create_board(n)]
 
         # 4) Switch to the placement screen
         state.game_state       = "placing"
@@ -168,11 +255,13 @@ def run_game(initial_state="menu", state=None):
     while state.running:
         now = pygame.time.get_ticks()
         if state.game_state == "menu":
+            perf.stop_recording()
             pygame.quit()
             show_tk_menu(state)
             return
         if state.game_state == "settings":
             # 1) Tear down Pygame entirely
+            perf.stop_recording()
             pygame.quit()
             # 2) Launch the standalone Tk Settings window
             SettingsTk(
@@ -184,27 +273,15 @@ def run_game(initial_state="menu", state=None):
             return
             
            
-        # 1) Turn logic first so `my_turn` is updated before click handling
-        if state.game_state == "playing":
-            if state.network:
-                playing_logic.handle_network_turn(now)
-            else:
-                playing_logic.handle_ai_turn(now)
-        if state.game_state == "placing" and state.network:
-            placing_logic.update(state)
+        perf.begin_frame(state.game_state)
 
-        raw_events = pygame.event.get()
-        win_w, win_h = screen.get_size()
-        scale_x = VW / win_w
-        scale_y = VH / win_h
+        # 1) Turn logic / network polling for the current scene
+        scenes.update(state.game_state, state, now)
+        perf.mark("turn")
 
-        events = []
-        for ev in raw_events:
-            # remap any mouse position into canvas space
-            if hasattr(ev, "pos"):
-                mx, my = ev.pos
-                ev.pos = (int(mx * scale_x), int(my * scale_y))
-            events.append(ev)
+        win_w, win_h = screen.get_size()
+        # one motion event per run, positions remapped into canvas space
+        events = frame_events(pygame.event.get(), VW / win_w, VH / win_h)
 
         for event in events:
             # Quit → show modal
@@ -220,6 +297,17 @@ def run_game(initial_state="menu", state=None):
                 battle_background = pygame.transform.smoothscale(battle_bg_img, (VW, VH))
                 continue
 
+            # AI replies computed off-thread; delivered even while a modal is open
+            if event.type == Config.AI_MOVE_EVENT:
+                playing = scenes.peek("playing")
+                if playing:
+                    playing.logic.receive_ai_move(event)
+                continue
+
+            # Profiler hotkeys work on every screen, modal or not
+            if perf.handle_event(event):
+                continue
+
             # Block input while a modal is open
             if state.show_restart_modal or state.show_quit_modal:
                 continue
@@ -234,18 +322,14 @@ def run_game(initial_state="menu", state=None):
                     state.show_quit_modal = True
                 continue
 
-            # Dispatch to each screen’s logic
-          
-            if state.game_state == "lobby":
-                lobby_logic.handle_event(event)
-            elif state.game_state == "settings":
-                settings_logic.handle_event(event)
-            elif state.game_state == "placing":
-                placing_logic.handle_event(event, state)
-            elif state.game_state == "playing":
-                playing_logic.handle_event(event, state)
-            elif state.game_state == "stats":
-                stats_logic.handle_event(event)
+            # Dispatch to the current screen’s logic
+            scenes.handle_event(state.game_state, event, state)
+
+        # Buttons (retained layer): hover + click dispatch from this frame's events.
+        # Runs after scene handlers, like the old draw-time polling did.
+        for event in events:
+            button_layer.handle_event(event)
+        perf.mark("events")
 
         # ─── 2) Scene‐change bookkeeping ─────────────────────────────────────────
         if prev_scene != state.game_state:
@@ -253,34 +337,30 @@ def run_game(initial_state="menu", state=None):
                 state.history.append(prev_scene)
             state.skip_push = False
 
-            if state.game_state == "playing":
-                playing_logic.reset()
-                state.timer_start = pygame.time.get_ticks()
-                state.score = 0
-                state.hit_count = 0
-                state.last_shot_time = state.timer_start
+            # exit hook of the old scene, enter hook of the new one
+            scenes.switch(prev_scene, state.game_state, state)
 
         prev_scene = state.game_state
 
         # ─── 3) DRAW EVERYTHING INTO THE CANVAS ────────────────────────────────
-        # Background
-        if state.game_state == "menu":
-            canvas.blit(menu_background, (0, 0))
-        else:
-            canvas.blit(battle_background, (0, 0))
+        show_pass_modal = getattr(state, "show_pass_modal", False)
+        modal_open = (state.show_restart_modal or state.show_quit_modal
+                      or state.opponent_left or show_pass_modal)
+        if not modal_open:
+            release_modal_backdrop()
+
+        # While a modal stays open its cached backdrop covers the whole canvas,
+        # so the scene underneath is only drawn once (when the modal opens).
+        if not (modal_open and modal_backdrop_ready()):
+            # Background
+            if state.game_state == "menu":
+                canvas.blit(menu_background, (0, 0))
+            else:
+                canvas.blit(battle_background, (0, 0))
 
-        # UI layer
-        
-        if state.game_state == "lobby":
-            lobby_render.draw(canvas, state)
-        elif state.game_state == "settings":
-            settings_render.draw(canvas, state)
-        elif state.game_state == "placing":
-            placing_render.draw(canvas, state)
-        elif state.game_state == "playing":
-            playing_render.draw(canvas, state)
-        elif state.game_state == "stats":
-            stats_render.draw(canvas, state)
+            # UI layer
+            scenes.draw(state.game_state, canvas, state)
+        perf.mark("draw")
 
         # Modals (draw *into* canvas so they scale, not onto screen)
         if state.show_restart_modal:
@@ -288,7 +368,7 @@ def run_game(initial_state="menu", state=None):
             def _no():    state.show_restart_modal = False
             draw_modal(canvas, "Restart game?", "All progress will be lost.", _ok, _no)
         elif state.show_quit_modal:
-            def _yes():   pygame.quit(); sys.exit()
+            def _yes():   perf.stop_recording(); state.stats_store.close(); monte_carlo.shutdown(); pygame.quit(); sys.exit()
             def _no2():   state.show_quit_modal = False
             draw_modal(canvas, "Quit game?", "Are you sure?", _yes, _no2)
         if state.opponent_left:
@@ -297,45 +377,25 @@ def run_game(initial_state="menu", state=None):
                     "Opponent Disconnected",
                     "Other player left.",
                     _goto_menu, _goto_menu)
-        if getattr(state, "show_pass_modal", False):
+        if show_pass_modal:
             def confirm_pass():
                 state.show_pass_modal   = False
-                state.player_board     = create_board()
-                placing_logic.reset()
+                state.player_board     = create_board(state.rules.grid_size)
+                reset_placing()
                 state.pass_play_stage   = 2
                 state.game_state        = "placing"
 
-            # 2) Snapshot & blur the battlefield behind
-            bg      = canvas.copy()
-            # 1) Show the static battle background (no ships visible)
-            canvas.blit(battle_background, (0, 0))
-            w, h = canvas.get_size()
-
-            # 3) Dark translucent overlay
-            overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            canvas.blit(overlay, (0, 0))
-
-            # 4) Draw the modal box
-            box_w, box_h = 400, 180
-            box_rect = pygame.Rect(
-                (Config.WIDTH  - box_w) // 2,
-                (Config.HEIGHT - box_h) // 2,
-                box_w, box_h
-            )
-            pygame.draw.rect(canvas, Config.DARK_GRAY, box_rect)
-            pygame.draw.rect(canvas, Config.WHITE,    box_rect, 2)
+            # 1) Show the static battle background (no ships visible),
+            #    darkened once and cached while the modal stays open
+            if not modal_backdrop_ready():
+                canvas.blit(battle_background, (0, 0))
+            draw_modal_backdrop(canvas, blur=False)
 
-            draw_text_center(
-                canvas, "Pass to Player 2",
-                box_rect.centerx, box_rect.y + 40, 36
-            )
-            draw_text_center(
-                canvas, "Press Yes when ready",
-                box_rect.centerx, box_rect.y + 80, 24
-            )
+            # 2) Draw the modal box
+            box_rect = draw_modal_box(canvas, "Pass to Player 2", "Press Yes when ready")
 
-            # 5) Single “Yes” button
+            # 3) Single “Yes” button
+            button_layer.block_below()
             draw_button(
                 canvas, "Yes",
                 box_rect.centerx - 50,
@@ -346,15 +406,25 @@ def run_game(initial_state="menu", state=None):
                 3
             )
 
+        # Commit this frame's buttons for next frame's hit testing
+        end_ui_frame()
+        perf.mark("modals")
+        perf.draw(canvas, clock.get_fps())
+
         # ─── 4) STRETCH + FLIP ONCE ─────────────────────────────────────────────
         win_w, win_h = screen.get_size()
         scaled = pygame.transform.smoothscale(canvas, (win_w, win_h))
         screen.blit(scaled, (0, 0))
         pygame.display.flip()
+        perf.mark("present")
+        perf.end_frame()
 
         clock.tick(Config.FPS)
 
     # ─── Shutdown ─────────────────────────────────────────────────────────────
+    perf.stop_recording()
+    state.stats_store.close()
+    monte_carlo.shutdown()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,372 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import platform
+import tempfile
+
+import pygame
+
+"""
+Module: bench.py
+Purpose:
+  - Micro-benchmarks for the engine, AI and rendering hot paths:
+      board.create_board / board.reset_all
+      board.place_fleet[<grid>]          place_fleet for a whole computer fleet
+      ai.<difficulty>.turn                AI decision time per turn over full games
+      ai.expert.sample / .pool_sample     Monte Carlo cost per sampled fleet (1 core / pool)
+      ai.expert.endgame                   exact endgame search from an empty table
+      network.framing_1k                  1000 JSON messages over a socketpair
+      render.draw_grid / render.playing   frame cost under the SDL dummy driver
+  - Every result is milliseconds per operation (lower is better), the best of
+    REPEAT timed runs.
+  - Baselines are per machine and never committed: --save writes
+    benchmarks/baselines/<machine key>.json, and a compare run only reads the
+    file recorded on this machine. A result counts as a regression only if it
+    stays slower than baseline by more than --threshold after up to --retries
+    re-runs (the best result is kept), so one noisy run does not fail the gate.
+  - Runs against a throwaway HEATMAP_CACHE_PATH / STATS_DB_PATH, leaving the
+    player's ~/.p_battleship caches alone.
+Usage:
+  python -m benchmarks.bench --save          # record this machine's baseline
+  python -m benchmarks.bench                 # compare with it
+  python -m benchmarks.bench --only ai       # run benchmarks whose name starts with "ai"
+  python -m benchmarks.bench --only ai --save  # re-record just those baseline entries
+Future Hooks:
+  - Track a history of runs per machine instead of a single baseline.
+"""
+
+ROOT          = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR  = os.path.join(ROOT, "benchmarks", "baselines")   # git-ignored
+GRID_SIZES    = (5, 10, 15, 20)
+AI_GAMES      = 5
+REPEAT        = 5
+RETRIES       = 2      # extra runs of a benchmark that looks regressed
+
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)    # resources/ paths are relative to the repo root
+pygame.init()
+
+from core.config import Config
+Config.update_layout()
+_screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
+
+from core.game_state        import GameState
+from game.board_helpers     import create_board, place_ship_randomly, place_fleet, Cell
+from helpers.draw_helpers   import draw_grid, reset_ui_caches
+from screens.playing_logic  import PlayingLogic
+from screens.playing_render import PlayingRender
+from game.draggable_ship    import DraggableShip
+from game                   import monte_carlo
+from game.monte_carlo       import MonteCarloSearch, sample_counts, encode
+from game.endgame           import EndgameSolver, enumerate_layouts
+from game                   import ai_strategies, heatmaps
+from network                import Network
+
+
+def measure(fn, number: int, repeat: int = REPEAT) -> float:
+    """Best-of-`repeat` milliseconds per call of fn() over `number` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) * 1000 / number)
+    return best
+
+
+def set_grid(size: int):
+    Config.GRID_SIZE = size
+    Config.update_layout()
+    reset_ui_caches()
+
+
+# ─── Engine ─────────────────────────────────────────────────────────────────
+def bench_board():
+    set_grid(Config.DEFAULT_GRID_SIZE)
+    state = GameState(lambda: None)
+    yield "board.create_board", measure(create_board, 2000)
+    yield "board.reset_all",    measure(state.reset_all, 500)
+
+    for size in GRID_SIZES:
+        set_grid(size)
+        random.seed(size)
+
+        yield f"board.place_fleet[{size}]", measure(
+            lambda: place_fleet(create_board(), Config.SHIP_SIZES), 500)
+    set_grid(Config.DEFAULT_GRID_SIZE)
+
+
+# ─── AI ─────────────────────────────────────────────────────────────────────
+def _ai_turn_times(difficulty: str, seed: int) -> list:
+    """Play one AI-only game and return the wall time of every AI turn (ms)."""
+    random.seed(seed)
+    state = GameState(lambda: None)
+    state.sfxenabled = False
+    state.difficulty = difficulty
+    for length in Config.SHIP_SIZES:
+        ship = DraggableShip(length, 0, 0)
+        ship.place(place_ship_randomly(state.player_board, length))
+        state.placed_ships.append(ship)     # lets the AI see sunk ships
+    state.player_ships = state.count_ships(state.player_board)
+    state.game_state   = "playing"
+    logic = PlayingLogic(_screen, state, hit_sfx=None, miss_sfx=None)
+
+    times, now = [], 0
+    while state.game_state == "playing" and len(times) < Config.GRID_SIZE ** 2:
+        now += 2000
+        state.ai_turn_pending    = True
+        state.ai_turn_start_time = 0
+        t0 = time.perf_counter()
+        logic.start_ai_turn()
+        logic.handle_ai_turn(now)
+        times.append((time.perf_counter() - t0) * 1000)
+    return times
+
+
+def bench_ai():
+    set_grid(Config.DEFAULT_GRID_SIZE)
+    Config.AI_WORKER_ENABLED = False    # time the decision itself, on this thread
+    heatmaps.get(Config.GRID_SIZE, Config.SHIP_SIZES)   # play from the prior, as warmed games do
+    for diff in Config.DIFFICULTIES:
+        if diff == "Expert":
+            continue    # spends its whole time budget by design; see bench_expert
+        best = float("inf")
+        for _ in range(REPEAT):
+            times = []
+            for seed in range(AI_GAMES):
+                times.extend(_ai_turn_times(diff, seed))
+            best = min(best, sum(times) / len(times))
+        yield f"ai.{diff.lower()}.turn", best
+
+    # Strategy instrumentation (informational, not compared with the baseline)
+    for name, rep in ai_strategies.report().items():
+        print(f"  [{name}] moves {rep['moves']}  mean {rep['mean_ms']:.4f} ms  "
+              f"max {rep['max_ms']:.4f} ms  shots/sink {rep['shots_per_sink']:.2f}"
+              + (f"  samples/s {rep['samples_per_s']:.0f}" if rep['samples_per_s'] else ""))
+
+
+def bench_expert():
+    """Monte Carlo sampler cost per consistent fleet: in-process and across the pool."""
+    set_grid(Config.DEFAULT_GRID_SIZE)
+    random.seed(0)
+    board = create_board()
+    for length in Config.SHIP_SIZES:
+        place_ship_randomly(board, length)
+    for _ in range(25):
+        r, c = random.randrange(Config.GRID_SIZE), random.randrange(Config.GRID_SIZE)
+        board[r][c] = Cell.HIT if board[r][c] in (Cell.SHIP, Cell.HIT) else Cell.MISS
+    view = [[cell if cell in (Cell.HIT, Cell.MISS) else Cell.EMPTY for cell in row] for row in board]
+    hits, blocked, lengths = encode(view, Config.SHIP_SIZES, ())
+
+    n = Config.GRID_SIZE
+    yield "ai.expert.sample", measure(
+        lambda: sample_counts(n, lengths, hits, blocked, float("inf"), 1, max_samples=200), 1) / 200
+
+    monte_carlo.prewarm(Config.MC_WORKERS, block=True)
+    search = MonteCarloSearch(Config.MC_WORKERS)
+    best = float("inf")
+    for _ in range(REPEAT):
+        search.best_cell(view, Config.SHIP_SIZES, (), time.perf_counter() + Config.AI_TIME_BUDGET_MS / 1000)
+        if search.last_rate:
+            best = min(best, 1000 / search.last_rate)
+    monte_carlo.shutdown()
+    yield "ai.expert.pool_sample", best
+
+    # 6x6, one 3-ship, misses until at most ENDGAME_SEARCH_LAYOUTS layouts remain
+    random.seed(3)
+    n, fleet = 6, [3]
+    view = [[Cell.EMPTY] * n for _ in range(n)]
+    while True:
+        view[random.randrange(n)][random.randrange(n)] = Cell.MISS
+        hits, blocked, lengths = encode(view, fleet, ())
+        found = enumerate_layouts(n, lengths, hits, blocked, 10_000, float("inf"))
+        if len(found) <= Config.ENDGAME_SEARCH_LAYOUTS:
+            break
+    yield "ai.expert.endgame", measure(
+        lambda: EndgameSolver(Config.ENDGAME_MAX_LAYOUTS, Config.ENDGAME_SEARCH_LAYOUTS)
+                .best_cell(view, fleet, (), float("inf")), 5)
+
+
+# ─── Network ────────────────────────────────────────────────────────────────
+def bench_network():
+    a, b = socket.socketpair()
+    sender, receiver = Network.from_socket(a), Network.from_socket(b)
+    msg = {"type": "shot", "row": 3, "col": 7}
+
+    def round_trip_1k():
+        for _ in range(1000):
+            sender.send(msg)
+        for _ in range(1000):
+            receiver.queue.get(timeout=5)
+
+    yield "network.framing_1k", measure(round_trip_1k, 1)
+    a.close()
+    b.close()
+
+
+# ─── Rendering ──────────────────────────────────────────────────────────────
+def bench_render():
+    set_grid(Config.DEFAULT_GRID_SIZE)
+    random.seed(0)
+    canvas = pygame.Surface((Config.WIDTH, Config.HEIGHT))
+    state  = GameState(lambda: None)
+    state.sfxenabled = False
+    for length in Config.SHIP_SIZES:
+        place_ship_randomly(state.player_board, length)
+    # a mid-game board: a third of each grid already shot at
+    for board in (state.player_board, state.player_attacks):
+        for _ in range(Config.GRID_SIZE ** 2 // 3):
+            r, c = random.randrange(Config.GRID_SIZE), random.randrange(Config.GRID_SIZE)
+            board[r][c] = Cell.HIT if board[r][c] == Cell.SHIP else Cell.MISS
+    state.game_state = "playing"
+
+    yield "render.draw_grid", measure(
+        lambda: draw_grid(canvas, state.player_board, Config.BOARD_OFFSET_X,
+                          Config.BOARD_OFFSET_Y, show_ships=True), 200)
+
+    logic  = PlayingLogic(_screen, state, hit_sfx=None, miss_sfx=None)
+    render = PlayingRender(logic)
+    yield "render.playing", measure(lambda: render.draw(canvas, state), 200)
+
+
+BENCHMARKS = {
+    "board":   bench_board,
+    "ai":      bench_ai,
+    "ai.expert": bench_expert,
+    "network": bench_network,
+    "render":  bench_render,
+}
+
+
+def machine_key() -> str:
+    """File-name-safe id of this machine and interpreter; baselines are only valid here."""
+    raw = f"{socket.gethostname()}-{platform.system()}-{platform.machine()}-py{platform.python_version()}"
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in raw)
+
+
+def default_baseline() -> str:
+    return os.path.join(BASELINE_DIR, machine_key() + ".json")
+
+
+def _selected(name: str, only) -> bool:
+    """`only` is a name prefix, or a collection of exact names (re-runs)."""
+    if only is None:
+        return True
+    if isinstance(only, str):
+        return name.startswith(only)
+    return name in only
+
+
+def run(only=None) -> dict:
+    results = {}
+    for group, bench in BENCHMARKS.items():
+        if isinstance(only, str) and not (group.startswith(only) or only.startswith(group)):
+            continue
+        if only is not None and not isinstance(only, str) and \
+                not any(name.startswith(group) for name in only):
+            continue
+        for name, ms in bench():
+            if not _selected(name, only):
+                continue
+            results[name] = ms
+            print(f"  {name:<28} {ms:10.4f} ms")
+    return results
+
+
+def _regressed(results: dict, baseline: dict, threshold: float) -> list:
+    return [name for name, ms in results.items()
+            if baseline.get(name) and (ms - baseline[name]) / baseline[name] > threshold]
+
+
+def confirm(results: dict, baseline: dict, threshold: float, retries: int) -> dict:
+    """
+    Re-run whatever looks regressed up to `retries` times, keeping each
+    benchmark's best result: noise only ever makes a run slower, so a real
+    regression is one that no run gets back under the threshold.
+    """
+    results = dict(results)
+    for attempt in range(retries):
+        suspects = _regressed(results, baseline, threshold)
+        if not suspects:
+            break
+        print(f"Re-running {len(suspects)} suspect benchmark(s), attempt {attempt + 1}/{retries}:")
+        for name, ms in run(set(suspects)).items():
+            results[name] = min(results[name], ms)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Names of benchmarks slower than baseline by more than `threshold`."""
+    failed = []
+    for name, ms in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"  {name:<28} (no baseline)")
+            continue
+        change = (ms - base) / base if base else 0.0
+        flag = "REGRESSED" if change > threshold else "ok"
+        print(f"  {name:<28} {base:10.4f} -> {ms:10.4f} ms  {change:+7.1%}  {flag}")
+        if change > threshold:
+            failed.append(name)
+    return failed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Battleship hot-path benchmarks")
+    parser.add_argument("--save", action="store_true", help="write results as this machine's baseline")
+    parser.add_argument("--baseline", default=None,
+                        help="baseline file (default: benchmarks/baselines/<machine key>.json)")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="allowed slowdown before failing (0.20 = 20%%)")
+    parser.add_argument("--retries", type=int, default=RETRIES,
+                        help="re-runs of a benchmark that looks regressed before failing")
+    parser.add_argument("--only", help="only run benchmarks whose name starts with this")
+    args = parser.parse_args(argv)
+    args.baseline = default_baseline() if args.baseline is None else args.baseline
+
+    # keep the player's heatmap / stats caches out of it
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        Config.HEATMAP_CACHE_PATH = os.path.join(tmp, "heatmaps.json")
+        Config.STATS_DB_PATH      = os.path.join(tmp, "stats.db")
+        return _main(args)
+
+
+def _main(args) -> int:
+    print("Running benchmarks...")
+    results = run(args.only)
+
+    if args.save:
+        if args.only and os.path.exists(args.baseline):
+            # partial run: keep the other baseline entries
+            with open(args.baseline, encoding="utf-8") as f:
+                results = {**json.load(f)["results"], **results}
+        data = {"machine": machine_key(), "python": platform.python_version(),
+                "pygame": pygame.version.ver, "results": results}
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        print("Baseline written to", args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline for this machine ({machine_key()}); run with --save first.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    results = confirm(results, baseline, args.threshold, args.retries)
+    print(f"Comparing with {args.baseline} (threshold {args.threshold:.0%}):")
+    failed = compare(results, baseline, args.threshold)
+    if failed:
+        print("Regressions:", ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
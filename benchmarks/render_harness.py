@@ -0,0 +1,273 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import sys
+import time
+import random
+import argparse
+
+import pygame
+
+"""
+Module: render_harness.py
+Purpose:
+  - Drives PlacingRender, PlayingRender, StatsRender and LobbyRender headlessly
+    (SDL dummy driver; no Tk window, no mixer) from scripted GameState fixtures.
+  - Times N frames per scene and saves a PNG snapshot of the last one.
+  - Compares each snapshot with benchmarks/golden/<scene>.png: a pixel differs
+    when any channel is off by more than --tolerance; a scene fails when more
+    than --max-diff of its pixels differ.
+  - Fleets sit at fixed cells and shots come from a private seeded RNG, so a
+    scene never depends on the placement sampler. The goldens were recorded
+    from the pre-optimisation renderers (placing.png adds only the Randomize /
+    Auto-place buttons drawn since), so they guard that the cached layers
+    still look the same.
+Usage:
+  python -m benchmarks.render_harness                  # time + compare with goldens
+  python -m benchmarks.render_harness --update         # re-record the goldens
+  python -m benchmarks.render_harness --scene playing --frames 500
+Future Hooks:
+  - Emit a highlighted diff image for failing scenes.
+"""
+
+ROOT       = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN_DIR = os.path.join(ROOT, "benchmarks", "golden")
+OUT_DIR    = os.path.join(ROOT, "benchmarks", "render_out")
+
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)    # resources/ paths are relative to the repo root
+pygame.init()
+
+from core.config import Config
+Config.update_layout()
+_screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
+
+from core.game_state         import GameState
+from game.board_helpers      import Cell, create_board
+from game.draggable_ship     import DraggableShip
+from helpers.draw_helpers    import reset_ui_caches, end_ui_frame
+from helpers.perf_hud        import percentile
+from screens.placing_logic   import PlacingLogic
+from screens.placing_render  import PlacingRender
+from screens.playing_logic   import PlayingLogic
+from screens.playing_render  import PlayingRender
+from screens.stats_logic     import StatsLogic
+from screens.stats_render    import StatsRender
+from screens.lobby_logic     import LobbyLogic
+from screens.lobby_render    import LobbyRender
+
+FIXED_ELAPSED_MS = 83_000   # the playing timer always reads 01:23
+
+# (row, col, horizontal) of each ship in Config.SHIP_SIZES order (10x10: 5, 4, 3)
+PLAYER_FLEET = ((1, 1, True), (4, 6, False), (8, 2, True))
+ENEMY_FLEET  = ((0, 4, False), (6, 0, True), (2, 8, False))
+
+
+def _event(kind, **attrs):
+    return pygame.event.Event(kind, **attrs)
+
+
+def _fixed_fleet(board, spots) -> list:
+    """Put Config.SHIP_SIZES on `board` at `spots`; returns each ship's coords."""
+    fleet = []
+    for length, (r, c, horizontal) in zip(Config.SHIP_SIZES, spots):
+        coords = [(r, c + i) if horizontal else (r + i, c) for i in range(length)]
+        for rr, cc in coords:
+            board[rr][cc] = Cell.SHIP
+        fleet.append(coords)
+    return fleet
+
+
+def _new_state() -> GameState:
+    state = GameState(lambda: None)
+    state.sfxenabled = False
+    state.computer_board        = create_board()
+    state.computer_ships_coords = _fixed_fleet(state.computer_board, ENEMY_FLEET)
+    state.computer_ships        = state.count_ships(state.computer_board)
+    return state
+
+
+def _play_out(state, shots: int, seed: int):
+    """Fire `shots` deterministic shots each way (board markers only)."""
+    rng  = random.Random(seed)
+    size = Config.GRID_SIZE
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    for r, c in cells[:shots]:
+        hit = state.computer_board[r][c] == Cell.SHIP
+        state.computer_board[r][c]  = Cell.HIT if hit else Cell.MISS
+        state.player_attacks[r][c]  = Cell.HIT if hit else Cell.MISS
+        state.player_shots += 1
+        state.player_hits  += hit
+    rng.shuffle(cells)
+    for r, c in cells[:shots]:
+        hit = state.player_board[r][c] == Cell.SHIP
+        state.player_board[r][c] = Cell.HIT if hit else Cell.MISS
+        state.ai_shots += 1
+        state.ai_hits  += hit
+    state.computer_ships = state.count_ships(state.computer_board)
+    state.player_ships   = state.count_ships(state.player_board)
+
+
+# ─── Fixtures: each returns (state, draw(canvas)) ───────────────────────────
+def fixture_placing():
+    state = _new_state()
+    logic = PlacingLogic(_screen, state)
+    state.reset_callback = logic.reset
+    state.reset_all()
+    state.game_state = "placing"
+    render = PlacingRender(logic)
+
+    def drag(ship, row, col, release):
+        ox, oy = ship.rect.center
+        logic.handle_event(_event(pygame.MOUSEBUTTONDOWN, pos=(ox, oy), button=1), state)
+        tx = logic.grid_offset_x + col * Config.CELL_SIZE + Config.CELL_SIZE // 2
+        ty = logic.grid_offset_y + row * Config.CELL_SIZE + Config.CELL_SIZE // 2
+        logic.handle_event(_event(pygame.MOUSEMOTION, pos=(tx, ty), rel=(tx - ox, ty - oy),
+                                  buttons=(1, 0, 0)), state)
+        if release:
+            logic.handle_event(_event(pygame.MOUSEBUTTONUP, pos=(tx, ty), button=1), state)
+
+    drag(logic.active_ship, 2, 4, release=True)      # one ship placed
+    drag(logic.active_ship, 6, 3, release=False)     # next ship mid-drag (preview)
+    return state, lambda canvas: render.draw(canvas, state)
+
+
+def fixture_playing():
+    state = _new_state()
+    for length, coords in zip(Config.SHIP_SIZES, _fixed_fleet(state.player_board, PLAYER_FLEET)):
+        ship = DraggableShip(length, 0, 0)
+        if coords[0][1] == coords[-1][1]:
+            ship.rotate()
+        ship.place(coords)
+        state.placed_ships.append(ship)
+    _play_out(state, shots=30, seed=2)
+    # sink the first enemy ship so its sprite is revealed
+    for r, c in state.computer_ships_coords[0]:
+        state.computer_board[r][c] = state.player_attacks[r][c] = Cell.HIT
+    state.computer_ships = state.count_ships(state.computer_board)
+    state.game_state = "playing"
+    state.score      = 120
+    logic  = PlayingLogic(_screen, state, hit_sfx=None, miss_sfx=None)
+    render = PlayingRender(logic)
+
+    def draw(canvas):
+        state.timer_start = pygame.time.get_ticks() - FIXED_ELAPSED_MS
+        render.draw(canvas, state)
+    return state, draw
+
+
+def fixture_stats():
+    state = _new_state()
+    _fixed_fleet(state.player_board, PLAYER_FLEET)
+    _play_out(state, shots=45, seed=3)
+    for i in range(state.player_shots):
+        state.player_shot_times.append(1000 + i * 1500)
+    for i in range(state.ai_shots):
+        state.ai_shot_times.append(1700 + i * 1500)
+    state.winner     = "Player"
+    state.score      = 310
+    state.game_state = "stats"
+    render = StatsRender(StatsLogic(_screen, state))
+    render.on_enter(state)
+    return state, lambda canvas: render.draw(canvas, state)
+
+
+def fixture_lobby():
+    state = _new_state()
+    state.game_state = "lobby"
+    logic = LobbyLogic(_screen, state)
+    logic.mode     = "join"
+    logic.ip_input = "192.168.1.42:5003"
+    render = LobbyRender(logic)
+    return state, lambda canvas: render.draw(canvas, state)
+
+
+SCENES = {
+    "placing": fixture_placing,
+    "playing": fixture_playing,
+    "stats":   fixture_stats,
+    "lobby":   fixture_lobby,
+}
+
+
+# ─── Running & comparing ────────────────────────────────────────────────────
+def run_scene(name: str, frames: int):
+    """Render `frames` frames of a scene; return (frame times in ms, last canvas)."""
+    reset_ui_caches()
+    _, draw = SCENES[name]()
+    background = pygame.transform.smoothscale(
+        pygame.image.load("resources/images/cartoon_battle_bg.png").convert(),
+        (Config.WIDTH, Config.HEIGHT))
+    canvas = pygame.Surface((Config.WIDTH, Config.HEIGHT))
+    times = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        canvas.blit(background, (0, 0))
+        draw(canvas)
+        end_ui_frame()
+        times.append((time.perf_counter() - t0) * 1000)
+    return times, canvas
+
+
+def diff_fraction(a: pygame.Surface, b: pygame.Surface, tolerance: int) -> float:
+    """Fraction of pixels whose RGB channels differ by more than `tolerance`."""
+    if a.get_size() != b.get_size():
+        return 1.0
+    pa = pygame.image.tobytes(a, "RGB")
+    pb = pygame.image.tobytes(b, "RGB")
+    if pa == pb:
+        return 0.0
+    differing = 0
+    for i in range(0, len(pa), 3):
+        if (abs(pa[i] - pb[i]) > tolerance or abs(pa[i + 1] - pb[i + 1]) > tolerance
+                or abs(pa[i + 2] - pb[i + 2]) > tolerance):
+            differing += 1
+    return differing / (len(pa) // 3)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Headless render timing + golden-frame check")
+    parser.add_argument("--scene", action="append", choices=sorted(SCENES),
+                        help="scene to run (repeatable; default: all)")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--update", action="store_true", help="overwrite the golden images")
+    parser.add_argument("--tolerance", type=int, default=8, help="per-channel slack (0-255)")
+    parser.add_argument("--max-diff", type=float, default=0.001,
+                        help="allowed fraction of differing pixels")
+    parser.add_argument("--out", default=OUT_DIR, help="where snapshots are written")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    failed = []
+    for name in args.scene or SCENES:
+        times, canvas = run_scene(name, args.frames)
+        ordered = sorted(times)
+        snap = os.path.join(args.out, f"{name}.png")
+        pygame.image.save(canvas, snap)
+        line = (f"{name:<8} {args.frames} frames  mean {sum(times) / len(times):7.3f} ms  "
+                f"p95 {percentile(ordered, 95):7.3f} ms  first {times[0]:7.3f} ms")
+
+        golden = os.path.join(GOLDEN_DIR, f"{name}.png")
+        if args.update:
+            pygame.image.save(canvas, golden)
+            print(line, " golden updated")
+            continue
+        if not os.path.exists(golden):
+            print(line, " no golden (run with --update)")
+            continue
+        frac = diff_fraction(canvas, pygame.image.load(golden), args.tolerance)
+        ok = frac <= args.max_diff
+        print(line, f" diff {frac:.4%}", "ok" if ok else f"FAILED (see {snap})")
+        if not ok:
+            failed.append(name)
+
+    if failed:
+        print("Golden mismatch:", ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
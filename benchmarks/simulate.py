@@ -0,0 +1,301 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import sys
+import time
+import argparse
+
+try:
+    import numpy as np    # optional: only the batch simulator needs it
+except ImportError:
+    np = None
+
+"""
+Module: simulate.py
+Purpose:
+  - Lockstep batch simulator for calibrating AI difficulty and scoring
+    constants over millions of AI-only games (AI fires until count_ships
+    would be 0). Every game in a batch lives in stacked NumPy arrays
+    (games x GRID_SIZE x GRID_SIZE) and all of them advance one shot per step.
+  - Rules are board-state stand-ins for the strategies, so they vectorise:
+      random    (Easy)    any untried cell: the game's rule exactly
+      hunt      (~Medium) cells next to an unsunk hit first
+      advanced  (~Hard)   extend lines of 2+ unsunk hits, then neighbours,
+                          then the smallest ship's parity class
+    Only Easy is the shipped strategy. The game's Medium keeps a FIFO of hit
+    neighbours, and its Hard opens from the heatmap order and probes fixed
+    directions, so hunt/advanced numbers approximate those levels and are
+    labelled that way in the output.
+  - Randomness is a counter-based hash of (seed, game, step, cell), so the
+    plain loop (board_helpers.create_board / fire_at per game) and the batch
+    version make the same choices and produce identical per-game results.
+  - Score per game uses Config's hit / miss / sink constants (no time bonus:
+    simulated shots take no wall time).
+  - Board size and fleet come from a core.rules.Rules per call, never from
+    the global Config grid, so one run can cover several grid sizes.
+Usage:
+  python -m benchmarks.simulate --difficulty Hard --games 1000000
+  python -m benchmarks.simulate --grid 15 --loop-games 500   # compare vs the loop
+  python -m benchmarks.simulate --grid 8 10 15 20            # several sizes, one process
+Future Hooks:
+  - Pit two rules against each other for win rates instead of shots-to-finish.
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)    # resources/ paths are relative to the repo root
+
+from core.config        import Config
+from core.rules         import Rules
+from game.board_helpers import create_board, fire_at, Cell, placement_masks
+
+RULES = {"Easy": "random", "Medium": "hunt", "Hard": "advanced"}
+EXACT = {"random"}        # rules that are the shipped strategy, not an approximation
+
+M64 = (1 << 64) - 1
+P1, P2, P3 = 0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9
+PLACE_STEP = 1 << 32      # placement draws use steps above any shot step
+NOISE_BITS = 53           # tie-break bits under the rule priority
+
+
+# ─── Shared hash (scalar and vectorised forms agree bit for bit) ────────────
+def _mix(z: int) -> int:
+    z = (z + 0x9E3779B97F4A7C15) & M64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & M64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & M64
+    return z ^ (z >> 31)
+
+
+def _hash(seed: int, game: int, step: int, cell: int) -> int:
+    a = (seed * P1 + game) & M64
+    a = (a * P2 + step) & M64
+    return _mix((a * P3 + cell) & M64)
+
+
+def _hash_np(seed, games, step, cells):
+    """_hash() for every (game, cell) pair: uint64 array of shape (len(games), len(cells))."""
+    u = np.uint64
+    a = u((seed * P1) & M64) + games.astype(np.uint64)
+    a = a * u(P2) + u(step)
+    z = a[:, None] * u(P3) + cells[None, :]
+    z = z + u(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> u(30))) * u(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> u(27))) * u(0x94D049BB133111EB)
+    return z ^ (z >> u(31))
+
+
+def _fleet_tables(n, fleet):
+    return [placement_masks(L, n) for L in fleet]
+
+
+def _score(misses: int, fleet) -> int:
+    hits = sum(fleet)
+    return (hits * Config.BASE_HIT_POINTS - misses * Config.MISS_PENALTY
+            + len(fleet) * Config.SHIP_SUNK_BONUS + hits * Config.SHIP_LENGTH_BONUS)
+
+
+# ─── Reference: one game at a time on the real board helpers ────────────────
+def play_one(rule: str, seed: int, game: int, rules: Rules) -> tuple:
+    """(shots, misses, score) for one AI-only game under `rules`."""
+    n, fleet = rules
+    board  = create_board(n)
+    ship   = [[0] * n for _ in range(n)]     # ship id per cell (1-based)
+    occ    = 0
+    for s, table in enumerate(_fleet_tables(n, fleet)):
+        attempt = 0
+        while True:
+            m = table[_hash(seed, game, PLACE_STEP * (s + 1) + attempt, 0) % len(table)]
+            attempt += 1
+            if not m & occ:
+                break
+        occ |= m
+        for i in range(n * n):
+            if m >> i & 1:
+                board[i // n][i % n] = Cell.SHIP
+                ship[i // n][i % n]  = s + 1
+
+    lengths = list(fleet)
+    hits_on = [0] * len(fleet)
+    parity  = min(fleet)
+    shots = misses = 0
+    while sum(row.count(Cell.SHIP) for row in board):
+        unsunk = lambda r, c: (0 <= r < n and 0 <= c < n and board[r][c] == Cell.HIT
+                               and hits_on[ship[r][c] - 1] < lengths[ship[r][c] - 1])
+        best, pick = -1, None
+        for r in range(n):
+            for c in range(n):
+                if board[r][c] in (Cell.HIT, Cell.MISS):
+                    continue
+                prio = 1
+                if rule != "random":
+                    near = any(unsunk(r + dr, c + dc) for dr, dc in ((-1,0),(1,0),(0,-1),(0,1)))
+                    if rule == "hunt":
+                        prio = 2 if near else 1
+                    elif any(unsunk(r + dr, c + dc) and unsunk(r + 2*dr, c + 2*dc)
+                             for dr, dc in ((-1,0),(1,0),(0,-1),(0,1))):
+                        prio = 4
+                    else:
+                        prio = 3 if near else 2 if (r + c) % parity == 0 else 1
+                key = (prio << NOISE_BITS) | (_hash(seed, game, shots, r * n + c) >> 11)
+                if key > best:
+                    best, pick = key, (r, c)
+
+        r, c = pick
+        hit, _ = fire_at(r, c, board)
+        shots += 1
+        if hit:
+            hits_on[ship[r][c] - 1] += 1
+        else:
+            misses += 1
+    return shots, misses, _score(misses, fleet)
+
+
+def run_loop(rule, seed, games, rules, first=0) -> list:
+    return [play_one(rule, seed, g, rules) for g in range(first, first + games)]
+
+
+# ─── Batch: every game advances one shot per step ───────────────────────────
+def _shift(a, dr, dc):
+    """a moved by (dr, dc) over the last two axes; cells shifted in are False."""
+    out = np.zeros_like(a)
+    n = a.shape[-1]
+    rs, rd = (slice(0, n - dr), slice(dr, n)) if dr >= 0 else (slice(-dr, n), slice(0, n + dr))
+    cs, cd = (slice(0, n - dc), slice(dc, n)) if dc >= 0 else (slice(-dc, n), slice(0, n + dc))
+    out[:, rd, cd] = a[:, rs, cs]
+    return out
+
+
+def run_batch(rule, seed, games, rules, first=0) -> list:
+    """Same results as run_loop(), computed in lockstep with NumPy."""
+    n, fleet = rules
+    G     = games
+    gids  = np.arange(first, first + G, dtype=np.uint64)
+    cells = np.arange(n * n, dtype=np.uint64)
+    ship  = np.zeros((G, n * n), dtype=np.int8)
+
+    # Fleet placement: redraw only the games whose candidate overlaps
+    for s, table in enumerate(_fleet_tables(n, fleet)):
+        bits = np.array([[m >> i & 1 for i in range(n * n)] for m in table], dtype=bool)
+        pending = np.arange(G)
+        attempt = 0
+        while len(pending):
+            h   = _hash_np(seed, gids[pending], PLACE_STEP * (s + 1) + attempt, cells[:1])[:, 0]
+            idx = (h % np.uint64(len(table))).astype(np.int64)
+            cand = bits[idx]
+            ok   = ~(cand & (ship[pending] > 0)).any(axis=1)
+            placed = pending[ok]
+            ship[placed] = np.where(cand[ok], s + 1, ship[placed])
+            pending = pending[~ok]
+            attempt += 1
+    ship = ship.reshape(G, n, n)
+
+    is_ship = ship > 0
+    shot    = np.zeros((G, n, n), dtype=bool)
+    lengths = np.array(fleet)
+    shots   = np.zeros(G, dtype=np.int64)
+    misses  = np.zeros(G, dtype=np.int64)
+    active  = np.ones(G, dtype=bool)
+    rows, cols = np.indices((n, n))
+    parity  = ((rows + cols) % min(fleet) == 0)
+    dirs    = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+    step = 0
+    while active.any():
+        live = np.flatnonzero(active)
+        sh   = shot[live]
+        sid  = ship[live]
+        hit  = sh & is_ship[live]
+        prio = np.ones((len(live), n, n), dtype=np.uint64)
+        if rule != "random":
+            # unsunk hits: hit cells of ships with fewer hits than their length
+            sunk = np.zeros_like(hit)
+            for s in range(len(fleet)):
+                cells_s = sid == s + 1
+                done = (cells_s & sh).sum(axis=(1, 2)) == lengths[s]
+                sunk |= cells_s & done[:, None, None]
+            unsunk = hit & ~sunk
+            near = np.zeros_like(unsunk)
+            line = np.zeros_like(unsunk)
+            for dr, dc in dirs:
+                nb = _shift(unsunk, -dr, -dc)          # neighbour at (r+dr, c+dc) is unsunk
+                near |= nb
+                line |= nb & _shift(unsunk, -2*dr, -2*dc)
+            if rule == "hunt":
+                prio += near
+            else:
+                prio = np.where(line, 4, np.where(near, 3, np.where(parity, 2, 1))).astype(np.uint64)
+
+        noise = _hash_np(seed, gids[live], step, cells) >> np.uint64(11)
+        key = (prio.reshape(len(live), -1) << np.uint64(NOISE_BITS)) | noise
+        key[sh.reshape(len(live), -1)] = 0
+        pick = key.argmax(axis=1)
+
+        r, c = np.divmod(pick, n)
+        shot[live, r, c] = True
+        shots[live] += 1
+        misses[live] += ~is_ship[live, r, c]
+        active[live] = (is_ship[live] & ~shot[live]).any(axis=(1, 2))
+        step += 1
+
+    return [(int(s), int(m), _score(int(m), fleet)) for s, m in zip(shots, misses)]
+
+
+# ─── CLI ────────────────────────────────────────────────────────────────────
+def _summary(results) -> str:
+    if not results:
+        return "no games"
+    shots = sorted(r[0] for r in results)
+    mean  = sum(shots) / len(shots)
+    score = sum(r[2] for r in results) / len(results)
+    return (f"shots mean {mean:6.2f}  p50 {shots[len(shots)//2]:3d}  "
+            f"p95 {shots[int(len(shots)*0.95)]:3d}  max {shots[-1]:3d}  score {score:8.1f}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Batch AI-only game simulator")
+    ap.add_argument("--difficulty", choices=sorted(RULES), default="Hard")
+    ap.add_argument("--grid",       type=int, nargs="+", default=[Config.DEFAULT_GRID_SIZE])
+    ap.add_argument("--games",      type=int, default=100_000, help="batch-simulated games")
+    ap.add_argument("--batch",      type=int, default=10_000, help="games per lockstep batch")
+    ap.add_argument("--loop-games", type=int, default=200, help="games replayed one at a time")
+    ap.add_argument("--seed",       type=int, default=1)
+    args = ap.parse_args(argv)
+
+    rule = RULES[args.difficulty]
+    ok   = True
+    for n in args.grid:
+        ok = _simulate(rule, Rules.for_grid(n), args) and ok
+    return 0 if ok else 1
+
+
+def _simulate(rule, rules, args) -> bool:
+    n, fleet = rules
+    label = args.difficulty if rule in EXACT else f"approximate {args.difficulty}"
+    print(f"{label} ({rule} rule) on {n}x{n}, fleet {list(fleet)}")
+
+    t0 = time.perf_counter()
+    loop = run_loop(rule, args.seed, args.loop_games, rules)
+    loop_rate = len(loop) / max(time.perf_counter() - t0, 1e-9)
+    print(f"  loop   {len(loop):>9} games  {loop_rate:10.0f} games/s  {_summary(loop)}")
+
+    if np is None:
+        print("  batch  skipped: numpy is not installed")
+        return True
+
+    t0 = time.perf_counter()
+    batch = []
+    for first in range(0, args.games, args.batch):
+        batch.extend(run_batch(rule, args.seed, min(args.batch, args.games - first), rules, first))
+    batch_rate = len(batch) / max(time.perf_counter() - t0, 1e-9)
+    print(f"  batch  {len(batch):>9} games  {batch_rate:10.0f} games/s  {_summary(batch)}")
+    if not loop or not batch:
+        return True    # nothing to compare
+    print(f"  speedup x{batch_rate / loop_rate:.1f}")
+
+    same = batch[:len(loop)] == loop
+    print(f"  first {min(len(loop), len(batch))} games identical to the loop: {same}")
+    return same
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 import random
 import os
+import types
+import weakref
 import pygame
 
 
@@ -7,11 +9,16 @@ import pygame
 Module: config.py
 Purpose:
   - Global constants for window, grid, scoring, asset paths.
-  - Layout recalculation when grid size changes.
-  - Stub for smart ship generator.
+  - Defaults for new matches: a match snapshots GRID_SIZE / SHIP_SIZES into
+    an immutable core.rules.Rules, so changing these only affects later matches.
+  - Layout recalculation when grid size changes (geometry from core.rules.Layout).
+  - Layout-change hook: update_layout() calls every subscribe_layout() callback
+    when the grid size or screen geometry actually changed (a GameState that
+    follows Config starts a new round; renders rebuild from state.layout).
+  - Fleet presets per grid size, or a smart fleet composed for
+    SMART_FLEET_DENSITY (compose_fleet, checked to pack on the grid).
 Future Hooks:
   - Sync Config changes over network.
-  - Plug in advanced packing algorithm in generate_ships_for_grid().
 """
 
 class Config:
@@ -57,11 +64,33 @@ class Config:
 
     # ─── Optional Smart‐placement Toggle ───
     USE_SMART_SHIP_GENERATOR = False
+    SMART_FLEET_DENSITY      = 0.15        # share of cells covered by ships (classic 10x10: 15/100)
+    SMART_SHIP_PATTERN       = (5, 4, 3, 3)  # lengths cycled through; each needs a hull sprite
+    _smart_fleets            = {}          # (grid size, density) -> composed fleet
 
     # ─── AI Difficulty Settings ───
-    DIFFICULTIES        = ['Easy', 'Medium', 'Hard']
+    DIFFICULTIES        = ['Easy', 'Medium', 'Hard', 'Expert']
     DEFAULT_DIFFICULTY  = 'Easy'
 
+    # ─── AI Turn Timing ───
+    AI_TURN_DELAY_MS    = 1000   # cosmetic "thinking" pause before the AI fires
+    AI_TIME_BUDGET_MS   = 250    # soft budget handed to the strategy per move
+    AI_DEADLINE_MS      = 3000   # hard limit after the player's shot; then a random cell is fired
+    AI_WORKER_ENABLED   = True   # False: decide synchronously inside the frame
+    AI_MOVE_EVENT       = pygame.USEREVENT + 1
+    MC_WORKERS          = 0      # Expert sampling processes (0 = one per CPU core)
+    AI_TRACE_MEMORY     = False  # tracemalloc peak per AI move (slows every allocation)
+
+    # ─── Opening Heatmaps (game/heatmaps.py) ───
+    HEATMAP_EXACT_LIMIT   = 50_000   # max placement combinations enumerated exactly
+    HEATMAP_SAMPLES       = 100_000  # sampled fleets when enumeration is too big
+    HEATMAP_OPENING_SHOTS = 4        # Expert fires from the prior until a hit or this many shots
+
+    # ─── Exact Endgame (game/endgame.py) ───
+    ENDGAME_MAX_LAYOUTS   = 200      # Expert uses exact layout counts at or below this many layouts
+    ENDGAME_SEARCH_LAYOUTS = 12      # ... and a full expected-shots search at or below this many
+    ENDGAME_TIME_LIMIT_MS = 150      # hard limit per move; then the likeliest cell is fired
+
     ASSET_DIR = os.path.join(os.path.dirname(__file__), "..", "resources", "images")
 
     EXPLOSION_IMG = pygame.transform.scale(
@@ -75,34 +104,121 @@ class Config:
 
     EXPLOSION_FADE_DURATION = 500  # milliseconds
     MISS_FADE_DURATION      = 500  # ms (same fade duration for splashes)
+    EFFECT_FADE_STEPS       = 16   # alpha frames baked per effect image
 
     FPS = 60
 
+    SHOT_TIME_WINDOW = 32   # raw shot stamps kept per TimingSeries (0 = aggregates only)
+
+    # ─── Lifetime Stats Storage ───
+    STATS_DB_PATH = os.path.join(os.path.expanduser("~"), ".p_battleship", "stats.db")
+    HEATMAP_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".p_battleship", "heatmaps.json")
+
+    # ─── Performance HUD (F3 toggles, F4 records) ───
+    PERF_HUD_ENABLED = False
+    PERF_WINDOW      = 240   # frames kept per scene for percentiles
+    PERF_HUD_REFRESH = 15    # frames between overlay re-renders / RSS samples
+    PERF_LOG_PATH    = "perf_log.jsonl"
+
     PLAYING_CELL_SIZE      = None
     PLAYING_GRID_WIDTH     = None
     PLAY_BOARD_OFFSET_X    = None
     PLAY_ENEMY_OFFSET_X    = None
     PLAY_BOARD_OFFSET_Y    = None
 
+    # ─── Layout-change hook ───
+    _published_layout  = None  # (GRID_SIZE, Layout) as of the last notification
+    _layout_listeners  = []    # weak refs to callback() run after a layout change
+
+    @staticmethod
+    def subscribe_layout(callback) -> None:
+        """
+        Call callback() after every layout change. Bound methods are held
+        weakly, so an object that is dropped stops listening by itself.
+        """
+        if isinstance(callback, types.MethodType):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        Config._layout_listeners.append(ref)
+
+    @staticmethod
+    def _publish_layout() -> None:
+        alive = []
+        for ref in Config._layout_listeners:
+            callback = ref()
+            if callback is not None:
+                alive.append(ref)
+                callback()
+        Config._layout_listeners[:] = alive
+
     @staticmethod
     def generate_ships_for_grid():
         """
         Populate Config.SHIP_SIZES for current GRID_SIZE.
-        Stub: implement smarter packing (e.g. minimal clustering).
+        Smart mode composes a fleet for SMART_FLEET_DENSITY (see compose_fleet);
+        otherwise one of four presets is used.
+        A changed fleet invalidates the AI's opening heatmap.
         """
-        if Config.USE_SMART_SHIP_GENERATOR:
-            # (Your existing smart‐placement logic)
-            pass
+        previous = list(Config.SHIP_SIZES)
+        Config.SHIP_SIZES = Config.fleet_for_grid(Config.GRID_SIZE)
+
+        if Config.SHIP_SIZES != previous:
+            from game import heatmaps
+            heatmaps.invalidate()
+
+    @staticmethod
+    def fleet_for_grid(grid_size: int, smart: bool = None) -> list:
+        """Fleet for a grid size without touching Config (smart defaults to the toggle)."""
+        smart = Config.USE_SMART_SHIP_GENERATOR if smart is None else smart
+        if smart:
+            return Config.compose_fleet(grid_size)
+        # Simple presets
+        if grid_size <= 6:
+            return [3]
+        elif grid_size <= 8:
+            return [4, 3]
+        elif grid_size <= 12:
+            return [5, 4, 3]
         else:
-            # Simple presets
-            if Config.GRID_SIZE <= 6:
-                Config.SHIP_SIZES = [3]
-            elif Config.GRID_SIZE <= 8:
-                Config.SHIP_SIZES = [4, 3]
-            elif Config.GRID_SIZE <= 12:
-                Config.SHIP_SIZES = [5, 4, 3]
-            else:
-                Config.SHIP_SIZES = [ 5, 4, 3, 3]
+            return [ 5, 4, 3, 3]
+
+    @staticmethod
+    def compose_fleet(grid_size: int, density: float = None) -> list:
+        """
+        Ship lengths (longest first) covering about `density` of an n x n grid.
+        Lengths cycle through SMART_SHIP_PATTERN, capped at half the board so
+        small grids still leave room to hunt; the fleet is checked to pack
+        (board_helpers.fleet_fits) and cached per (grid size, density).
+        """
+        density = Config.SMART_FLEET_DENSITY if density is None else density
+        key = (grid_size, density)
+        fleet = Config._smart_fleets.get(key)
+        if fleet is not None:
+            return list(fleet)
+
+        from game.board_helpers import fleet_fits
+        shortest = min(Config.SMART_SHIP_PATTERN)
+        longest  = max(shortest, grid_size // 2)
+        pattern  = [L for L in Config.SMART_SHIP_PATTERN if L <= longest]
+        target   = max(shortest, round(density * grid_size * grid_size))
+
+        fleet, total, i = [], 0, 0
+        while True:
+            L = pattern[i % len(pattern)]
+            if total + L > target:
+                # top up with the longest pattern ship that still fits the target
+                L = max((x for x in pattern if total + x <= target), default=None)
+                if L is None:
+                    break
+            fleet.append(L)
+            total += L
+            i += 1
+        fleet.sort(reverse=True)
+        while len(fleet) > 1 and not fleet_fits(fleet, grid_size):
+            fleet.pop()
+        Config._smart_fleets[key] = tuple(fleet)
+        return fleet
 
     @staticmethod
     def update_layout():
@@ -111,26 +227,18 @@ class Config:
         - Recompute CELL_SIZE to fit viewport
         - Update grid offsets for placement & play
         - Regenerate SHIP_SIZES via generate_ships_for_grid()
+        - Notify layout subscribers if the grid or geometry changed
         """
-        padding = 3
-        max_w   = Config.WIDTH  // (2 * Config.GRID_SIZE + padding)
-        max_h   = Config.HEIGHT // (Config.GRID_SIZE + 4)
-        raw_cs  = min(max_w, max_h)
-
-        # base cell for placement & menu
-        Config.CELL_SIZE      = max(20, min(raw_cs, 60))
-        Config.GRID_WIDTH     = Config.CELL_SIZE * Config.GRID_SIZE
-        Config.BOARD_OFFSET_X = (Config.WIDTH - (2 * Config.GRID_WIDTH + Config.SPACE_BETWEEN)) // 2
-        Config.ENEMY_OFFSET_X = Config.BOARD_OFFSET_X + Config.GRID_WIDTH + Config.SPACE_BETWEEN
-        Config.BOARD_OFFSET_Y = (Config.HEIGHT - Config.GRID_WIDTH) // 2
-
-        # ─── NEW: compute playing-screen sizes ───
-        Config.PLAYING_CELL_SIZE = int(Config.CELL_SIZE * Config.PLAYING_BOARD_SCALE)
-        Config.PLAYING_GRID_WIDTH = Config.PLAYING_CELL_SIZE * Config.GRID_SIZE
-
-        diff = (Config.GRID_WIDTH - Config.PLAYING_GRID_WIDTH) // 2
-        Config.PLAY_BOARD_OFFSET_X  = Config.BOARD_OFFSET_X + diff
-        Config.PLAY_ENEMY_OFFSET_X  = Config.ENEMY_OFFSET_X + diff
-        Config.PLAY_BOARD_OFFSET_Y  = Config.BOARD_OFFSET_Y + diff
-
-        Config.generate_ships_for_grid()
\ No newline at end of file
+        from core.rules import Layout
+        layout = Layout.compute(Config.GRID_SIZE, Config.WIDTH, Config.HEIGHT)
+        for field, value in zip(layout._fields, layout):
+            setattr(Config, field.upper(), value)
+
+        Config.generate_ships_for_grid()
+
+        # Compare with what subscribers last saw, not with the attributes on
+        # entry: callers assign GRID_SIZE before calling update_layout().
+        current = (Config.GRID_SIZE, layout)
+        if current != Config._published_layout:
+            Config._published_layout = current
+            Config._publish_layout()
\ No newline at end of file
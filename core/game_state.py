@@ -1,5 +1,12 @@
-from game.board_helpers import create_board, place_ship_randomly, Cell
+import random
+import threading
+from concurrent.futures import Future
+
+from game.board_helpers import create_board, place_fleet, Cell
 from core.config import Config
+from core.rules import Rules, Layout
+from core.timing_series import TimingSeries
+from game.effects import EffectPool
 
 """
 Module: game_state.py
@@ -8,13 +15,29 @@ Purpose:
   - Tracks UI flags, scores, timing, and scene history.
   - Manages network handles & handshake flags for multiplayer.
   - Offers reset routines at various scopes: per‑round, per‑match.
+  - Each round snapshots its Rules (grid size + fleet) from Config, or uses
+    the fixed rules it was created with, plus the screen Layout for that
+    grid; boards, AI, stats, renders and input read state.rules and
+    state.layout, so Config changes only apply to later rounds.
+  - A state without fixed rules follows Config layout changes
+    (Config.subscribe_layout): a new grid size starts a fresh round.
+  - Pre-generates the next match's computer fleet (and a suggested player
+    layout) on a background thread while the stats screen is up, so
+    "Play Again" swaps in a ready board. The thread only completes a
+    Future; reset() takes the result if it is finished and was built for
+    this round's Rules, so a late or stale build can never be consumed.
 Future Hooks:
   - Close or reinitialize network socket on reset_all.
   - Emit "reset" events to remote peer.
 """
 class GameState:
-    def __init__(self, reset_callback):
+    def __init__(self, reset_callback, rules: Rules = None):
         self.reset_callback = reset_callback
+        self.fixed_rules    = rules     # None: every round takes Rules.from_config()
+        self.rules          = None      # this round's Rules (set by reset())
+        self.layout         = None      # this round's screen Layout (set by reset())
+        if rules is None:
+            Config.subscribe_layout(self.on_layout_changed)
 
         # Persistent UI toggles & flags
         self.show_restart_modal = False
@@ -22,18 +45,16 @@ class GameState:
         self.audio_enabled      = True  # safe to read in draw_top_bar
         self.sfxenabled = True
 
-        # AI difficulty & memory
+        # AI difficulty (strategy memory lives in PlayingLogic.strategy)
         self.difficulty       = Config.DEFAULT_DIFFICULTY
-        self.ai_targets       = []      # for Medium/Hard hunt modes
-        self.last_player_hit  = None    # last successful AI hit
 
         # Stats counters & timestamps
         self.player_shots      = 0
         self.player_hits       = 0
         self.ai_shots          = 0
         self.ai_hits           = 0
-        self.player_shot_times = []     # list of pygame.time.get_ticks()
-        self.ai_shot_times     = []     # same for AI
+        self.player_shot_times = TimingSeries(Config.SHOT_TIME_WINDOW)  # pygame.time.get_ticks() stamps
+        self.ai_shot_times     = TimingSeries(Config.SHOT_TIME_WINDOW)  # same for AI
         self.winner            = None   # "Player" or "AI"
 
         self.timer_start = None    # will hold pygame.time.get_ticks() when play begins
@@ -53,7 +74,15 @@ class GameState:
         # per-player Pass&Play stats
         self.pass_play_shots         = [0, 0]
         self.pass_play_hits          = [0, 0]
-        self.pass_play_shot_times    = [[], []]
+        self.pass_play_shot_times    = [TimingSeries(Config.SHOT_TIME_WINDOW),
+                                        TimingSeries(Config.SHOT_TIME_WINDOW)]
+
+        # hit/miss animations (pooled; see game/effects.py)
+        self.effects = EffectPool()
+
+        # next match's boards, built ahead of time by prepare_next_board()
+        self._next_boards   = None   # Future -> (Rules, computer board, coords, suggestion)
+        self.suggested_layout = None  # player fleet coords offered by placement (or None)
 
         # Kick off first full reset
         self.reset_all()
@@ -70,27 +99,26 @@ class GameState:
         self.history = []       # stack of previous scenes
         self.skip_push = False
 
+        self.stats_store = None   # StatsStore for lifetime history (set by Main)
 
-        #explostion
-        self.explosions             = []
-        self.miss_splashes  = []
 
 
 
     def reset(self):
         """Reinitialize only the two boards & attacks; re‑invoke placement callback."""
         # clear boards and flags but keep scores
-        self.player_board   = create_board()
-        self.computer_board = create_board()
-        self.computer_ships_coords = []
-        self.player_attacks = [
-            [Cell.EMPTY for _ in range(Config.GRID_SIZE)]
-            for _ in range(Config.GRID_SIZE)
-        ]
-        # Place the computer’s ships randomly
-        for size in Config.SHIP_SIZES:
-            coords = place_ship_randomly(self.computer_board, size)
-            self.computer_ships_coords.append(coords)
+        self.rules = rules = self.next_rules()
+        self.layout = Layout.compute(rules.grid_size)
+        self.player_board   = create_board(rules.grid_size)
+        self.player_attacks = create_board(rules.grid_size)
+        # Place the computer’s ships randomly (pre-generated if ready)
+        ready = self._take_next_boards()
+        if ready:
+            self.computer_board, self.computer_ships_coords, self.suggested_layout = ready
+        else:
+            self.computer_board = create_board(rules.grid_size)
+            self.computer_ships_coords = place_fleet(self.computer_board, rules.ship_sizes)
+            self.suggested_layout = None
 
         self.pass_play_mode    = False
         self.pass_play_stage   = 0
@@ -103,6 +131,59 @@ class GameState:
         # … invoke placement callback …
         self.reset_callback()
 
+    def next_rules(self) -> Rules:
+        """Rules the next round will be played with."""
+        return self.fixed_rules or Rules.from_config()
+
+    def on_layout_changed(self):
+        """Config.update_layout(): start a new round if it no longer matches Config."""
+        if self.rules is None:
+            return
+        rules = self.next_rules()
+        if rules != self.rules or Layout.compute(rules.grid_size) != self.layout:
+            self.reset_with_counts()
+
+    def prepare_next_board(self):
+        """
+        Build the next match's computer fleet and a suggested player layout on
+        a daemon thread (called when the stats screen opens). reset() uses
+        them if the rules still match; otherwise they are dropped.
+        """
+        key = self.next_rules()
+        pending = self._next_boards
+        if pending is not None and (not pending.done() or self._built_for(pending) == key):
+            return
+
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        def build():
+            rng   = random.Random()    # leave the main thread's seeded stream alone
+            n, sizes = key
+            try:
+                board  = create_board(n)
+                coords = place_fleet(board, sizes, rng)
+                suggestion = place_fleet(create_board(n), sizes, rng)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result((key, board, coords, suggestion))
+
+        self._next_boards = future
+        threading.Thread(target=build, daemon=True).start()
+
+    @staticmethod
+    def _built_for(future):
+        """Rules a finished pre-generation Future was built for (None if it failed)."""
+        return None if future.exception() is not None else future.result()[0]
+
+    def _take_next_boards(self):
+        """(board, coords, suggestion) from prepare_next_board() if finished and still valid."""
+        future, self._next_boards = self._next_boards, None
+        if future is None or not future.done() or self._built_for(future) != self.rules:
+            return None
+        return future.result()[1:]
+
     def count_ships(self, board):
         """Return count of SHIP cells on given board."""
         return sum(row.count(Cell.SHIP) for row in board)
@@ -119,7 +200,7 @@ class GameState:
         """
         Full-match reset:
         - Calls reset_with_counts()
-        - Clears UI, stats, AI memory, pass‑and‑play info
+        - Clears UI, stats, pass‑and‑play info (AI memory is per strategy)
         - Preserves audio_enabled and difficulty across matches
         Future: also call self.network.close() if exists
         """
@@ -135,17 +216,13 @@ class GameState:
         self.ai_turn_pending   = False
         self.ai_turn_start_time= 0
 
-        # Clear any in‐flight AI memory
-        self.ai_targets        = []
-        self.last_player_hit   = None
-
         # Reset stats & shot timings
         self.player_shots      = 0
         self.player_hits       = 0
         self.ai_shots          = 0
         self.ai_hits           = 0
-        self.player_shot_times = []
-        self.ai_shot_times     = []
+        self.player_shot_times = TimingSeries(Config.SHOT_TIME_WINDOW)
+        self.ai_shot_times     = TimingSeries(Config.SHOT_TIME_WINDOW)
         self.winner            = None
 
         # Scene & modal flags
@@ -160,19 +237,19 @@ class GameState:
         # clear per-player stats
         self.pass_play_shots         = [0, 0]
         self.pass_play_hits          = [0, 0]
-        self.pass_play_shot_times    = [[], []]
+        self.pass_play_shot_times    = [TimingSeries(Config.SHOT_TIME_WINDOW),
+                                        TimingSeries(Config.SHOT_TIME_WINDOW)]
 
 
         self.pass_play_shots      = [0, 0]
         self.pass_play_score           = [0, 0]
         self.pass_play_last_shot_time  = [0, 0]
-        self.pass_play_shot_times = [[], []]
+        self.pass_play_shot_times = [TimingSeries(Config.SHOT_TIME_WINDOW),
+                                     TimingSeries(Config.SHOT_TIME_WINDOW)]
 
-        # Invoke placement logic callback (e.g. PlacingLogic.reset)
-        self.reset_callback()
+        # (placement callback already ran inside reset())
 
         # clear explosion history
-        self.explosions             = []
-        self.miss_splashes  = []
+        self.effects.clear()
 
         
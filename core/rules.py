@@ -0,0 +1,86 @@
+from typing import NamedTuple
+
+from core.config import Config
+
+"""
+Module: rules.py
+Purpose:
+  - Immutable per-match objects so the engine does not depend on mutable
+    Config class attributes:
+      Rules   grid size + fleet; snapshotted by GameState.reset() and passed
+              to board creation, AI strategies, stats and the simulator.
+      Layout  screen geometry for a grid size (cell size, board offsets);
+              GameState.reset() computes one per match for the placement and
+              playing screens, Config.update_layout() copies one onto Config.
+  - Config stays the source of defaults: Rules.from_config() reads the
+    current settings, Rules.for_grid() builds rules for any size without
+    touching Config, so one process can run matches of different sizes side
+    by side (rooms, simulations).
+Future Hooks:
+  - Carry per-match scoring constants and turn timing in Rules as well.
+"""
+
+
+class Rules(NamedTuple):
+    """What a match is played with: an n x n board and the fleet (longest first)."""
+    grid_size:  int
+    ship_sizes: tuple
+
+    @classmethod
+    def from_config(cls) -> "Rules":
+        """The rules a new match gets from the current settings."""
+        return cls(Config.GRID_SIZE, tuple(Config.SHIP_SIZES))
+
+    @classmethod
+    def for_grid(cls, grid_size: int, smart: bool = None) -> "Rules":
+        """Rules for `grid_size` with the fleet Config would pick (Config untouched)."""
+        return cls(grid_size, tuple(Config.fleet_for_grid(grid_size, smart)))
+
+
+class Layout(NamedTuple):
+    """Pixel geometry of the placement and playing screens for one grid size."""
+    cell_size:           int
+    grid_width:          int
+    board_offset_x:      int
+    enemy_offset_x:      int
+    board_offset_y:      int
+    playing_cell_size:   int
+    playing_grid_width:  int
+    play_board_offset_x: int
+    play_enemy_offset_x: int
+    play_board_offset_y: int
+
+    @classmethod
+    def compute(cls, grid_size: int, width: int = None, height: int = None) -> "Layout":
+        """Fit two grid_size boards into a width x height window."""
+        width  = Config.WIDTH if width is None else width
+        height = Config.HEIGHT if height is None else height
+        padding = 3
+        max_w   = width  // (2 * grid_size + padding)
+        max_h   = height // (grid_size + 4)
+        raw_cs  = min(max_w, max_h)
+
+        # base cell for placement & menu
+        cell_size      = max(20, min(raw_cs, 60))
+        grid_width     = cell_size * grid_size
+        board_offset_x = (width - (2 * grid_width + Config.SPACE_BETWEEN)) // 2
+        enemy_offset_x = board_offset_x + grid_width + Config.SPACE_BETWEEN
+        board_offset_y = (height - grid_width) // 2
+
+        # playing screen: the same boards scaled down and re-centred
+        playing_cell_size  = int(cell_size * Config.PLAYING_BOARD_SCALE)
+        playing_grid_width = playing_cell_size * grid_size
+        diff = (grid_width - playing_grid_width) // 2
+        return cls(cell_size, grid_width, board_offset_x, enemy_offset_x, board_offset_y,
+                   playing_cell_size, playing_grid_width,
+                   board_offset_x + diff, enemy_offset_x + diff, board_offset_y + diff)
+
+    @property
+    def grid_origin(self) -> tuple:
+        """Top-left pixel of the placement grid (inside the panel frame)."""
+        return (self.board_offset_x + 34, self.board_offset_y + 31)
+
+    @property
+    def play_top(self) -> int:
+        """Top pixel row of both playing-screen grids (below the top bar)."""
+        return self.play_board_offset_y + Config.TOP_BAR_HEIGHT
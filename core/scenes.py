@@ -0,0 +1,73 @@
+"""
+Module: scenes.py
+Purpose:
+  - Scene registry for the Pygame loop. Each screen is registered as a factory
+    and only built (logic + render, assets, sounds) the first time it is shown,
+    so screens a session never visits cost no startup time or memory.
+  - A Scene bundles the logic/render pair with its event handler, an optional
+    per-frame update, and enter/exit hooks (warm caches on entry, release
+    canvas-sized surfaces on exit).
+  - Main dispatches events, updates and draws with one lookup on
+    state.game_state instead of if/elif chains.
+Future Hooks:
+  - Drop rarely used scenes entirely on exit (rebuild on next entry).
+"""
+
+
+class Scene:
+    """One screen: logic, render, and the hooks Main calls around it."""
+
+    def __init__(self, logic, render, handle=None, update=None, enter=None, exit=None):
+        self.logic  = logic
+        self.render = render
+        # handle(event, state); most screens' handle_event() takes only the event
+        self.handle = handle or (lambda event, state: logic.handle_event(event))
+        self.update = update    # update(state, now) before event dispatch, or None
+        self.enter  = enter     # enter(state) when the scene becomes current, or None
+        self.exit   = exit      # exit(state) when another scene takes over, or None
+
+
+class SceneManager:
+    def __init__(self):
+        self.factories = {}     # name -> () -> Scene
+        self.scenes    = {}     # name -> Scene, built on first use
+
+    def register(self, name: str, factory) -> None:
+        self.factories[name] = factory
+
+    def get(self, name: str):
+        """The scene called `name`, building it on first use (None if unregistered)."""
+        scene = self.scenes.get(name)
+        if scene is None and name in self.factories:
+            scene = self.scenes[name] = self.factories[name]()
+        return scene
+
+    def peek(self, name: str):
+        """The scene if it has already been built, without building it."""
+        return self.scenes.get(name)
+
+    # ─── Per-frame dispatch ─────────────────────────────────────────────────
+    def update(self, name: str, state, now: int) -> None:
+        scene = self.get(name)
+        if scene and scene.update:
+            scene.update(state, now)
+
+    def handle_event(self, name: str, event, state) -> None:
+        scene = self.get(name)
+        if scene:
+            scene.handle(event, state)
+
+    def draw(self, name: str, canvas, state) -> None:
+        scene = self.get(name)
+        if scene:
+            scene.render.draw(canvas, state)
+
+    # ─── Lifecycle ──────────────────────────────────────────────────────────
+    def switch(self, old: str, new: str, state) -> None:
+        """Run `old`'s exit hook (if it was built) and `new`'s enter hook."""
+        scene = self.scenes.get(old)
+        if scene and scene.exit:
+            scene.exit(state)
+        scene = self.get(new)
+        if scene and scene.enter:
+            scene.enter(state)
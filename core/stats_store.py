@@ -0,0 +1,315 @@
+import os
+import csv
+import json
+import time
+import sqlite3
+import threading
+from queue import Queue
+
+from core.config import Config
+
+"""
+Module: stats_store.py
+Purpose:
+  - Local SQLite history of finished matches (lifetime stats).
+  - Write-behind queue: the game loop enqueues results, a daemon thread commits them.
+  - Pre-aggregated rollups (overall, per-mode, per-difficulty, per-grid-size) updated
+    with every insert, mirrored in memory so summaries never rescan the games table.
+    The mirror is updated up front and rolled back if the write fails, so it
+    never counts games that are not in the database.
+  - Bulk import of tournament results (CSV or JSON) in a single transaction;
+    malformed rows are skipped and counted instead of aborting the import.
+Future Hooks:
+  - Sync lifetime summaries with a network peer.
+  - Export rollups for a leaderboard screen.
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    played_at   REAL    NOT NULL,
+    mode        TEXT    NOT NULL,
+    difficulty  TEXT,
+    grid_size   INTEGER NOT NULL,
+    won         INTEGER NOT NULL,
+    shots       INTEGER NOT NULL,
+    hits        INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    score       INTEGER NOT NULL,
+    source      TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollups (
+    dimension   TEXT    NOT NULL,
+    key         TEXT    NOT NULL,
+    games       INTEGER NOT NULL,
+    wins        INTEGER NOT NULL,
+    shots       INTEGER NOT NULL,
+    hits        INTEGER NOT NULL,
+    win_time_ms INTEGER NOT NULL,
+    PRIMARY KEY (dimension, key)
+);
+"""
+
+_UPSERT_ROLLUP = """
+INSERT INTO rollups (dimension, key, games, wins, shots, hits, win_time_ms)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(dimension, key) DO UPDATE SET
+    games       = games       + excluded.games,
+    wins        = wins        + excluded.wins,
+    shots       = shots       + excluded.shots,
+    hits        = hits        + excluded.hits,
+    win_time_ms = win_time_ms + excluded.win_time_ms
+"""
+
+_INSERT_GAME = """
+INSERT INTO games (played_at, mode, difficulty, grid_size, won, shots, hits,
+                   duration_ms, score, source)
+VALUES (:played_at, :mode, :difficulty, :grid_size, :won, :shots, :hits,
+        :duration_ms, :score, :source)
+"""
+
+# Index of each counter inside a rollup row: [games, wins, shots, hits, win_time_ms]
+_GAMES, _WINS, _SHOTS, _HITS, _WIN_TIME = range(5)
+
+
+def _normalize(result: dict, source: str) -> dict:
+    """Coerce a loosely-typed result dict (game loop, CSV, JSON) into a games row."""
+    won = result.get("won", False)
+    if isinstance(won, str):
+        won = won.strip().lower() in ("1", "true", "yes", "won", "win")
+    difficulty = result.get("difficulty") or None
+    return {
+        "played_at":   float(result.get("played_at") or time.time()),
+        "mode":        str(result.get("mode") or "ai"),
+        "difficulty":  difficulty,
+        "grid_size":   int(result.get("grid_size") or Config.GRID_SIZE),
+        "won":         1 if won else 0,
+        "shots":       int(result.get("shots") or 0),
+        "hits":        int(result.get("hits") or 0),
+        "duration_ms": int(result.get("duration_ms") or 0),
+        "score":       int(result.get("score") or 0),
+        "source":      str(result.get("source") or source),
+    }
+
+
+def _rollup_keys(row: dict):
+    """Yield every (dimension, key) bucket a games row contributes to."""
+    yield "all", "all"
+    yield "mode", row["mode"]
+    if row["difficulty"]:
+        yield "difficulty", row["difficulty"]
+    yield "grid_size", str(row["grid_size"])
+
+
+def _rollup_delta(row: dict) -> list[int]:
+    return [
+        1,
+        row["won"],
+        row["shots"],
+        row["hits"],
+        row["duration_ms"] if row["won"] else 0,
+    ]
+
+
+def _rollup_deltas(rows) -> dict:
+    """Summed counter deltas per (dimension, key) bucket for a batch of rows."""
+    deltas = {}
+    for row in rows:
+        delta = _rollup_delta(row)
+        for bucket in _rollup_keys(row):
+            acc = deltas.setdefault(bucket, [0] * 5)
+            for i, v in enumerate(delta):
+                acc[i] += v
+    return deltas
+
+
+def result_from_state(state, now_ms: int) -> dict | None:
+    """
+    Build a result dict for the match that just ended.
+    Pass & Play matches are not recorded (there is no "you" to credit).
+    """
+    if state.pass_play_mode or state.winner is None:
+        return None
+    start = state.timer_start if state.timer_start is not None else now_ms
+    return {
+        "mode":        "network" if state.network else "ai",
+        "difficulty":  None if state.network else state.difficulty,
+        "grid_size":   state.rules.grid_size,
+        "won":         state.winner == "Player",
+        "shots":       state.player_shots,
+        "hits":        state.player_hits,
+        "duration_ms": max(0, now_ms - start),
+        "score":       state.score,
+    }
+
+
+class StatsStore:
+    """
+    Lifetime match history backed by SQLite.
+
+    record() and import_results() update the in-memory rollups immediately and
+    hand the rows to a background writer, so the caller (the game loop) never
+    waits on disk I/O; a batch whose transaction fails is taken back out of
+    the rollups. summary()/breakdown() read only the in-memory rollups.
+    `skipped` counts malformed results dropped by import_results().
+    A ":memory:" store keeps its one connection open for the writer thread
+    (every new connection would be a fresh, empty database).
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or Config.STATS_DB_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock    = threading.Lock()
+        self._queue   = Queue()
+        self._rollups = {}
+        self._writer  = None
+        self.skipped  = 0
+
+        self._memory_conn = None
+
+        # Schema + rollup mirror are loaded once, on the caller's thread
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+            for dim, key, *counts in conn.execute(
+                "SELECT dimension, key, games, wins, shots, hits, win_time_ms FROM rollups"
+            ):
+                self._rollups[(dim, key)] = list(counts)
+            conn.commit()
+        finally:
+            self._release(conn)
+
+    def _connect(self):
+        if self.path != ":memory:":
+            return sqlite3.connect(self.path)
+        if self._memory_conn is None:
+            # handed to the writer thread once the constructor is done with it
+            self._memory_conn = sqlite3.connect(self.path, check_same_thread=False)
+        return self._memory_conn
+
+    def _release(self, conn):
+        if conn is not self._memory_conn:
+            conn.close()
+
+    # ─── Writes (write-behind) ──────────────────────────────────────────────
+    def record(self, result: dict) -> None:
+        """Queue one finished match for persistence."""
+        self.import_results([result], source="local")
+
+    def import_results(self, results, source: str = "import") -> int:
+        """
+        Queue many results (e.g. a tournament export) as one transaction.
+        Rows that cannot be coerced (e.g. played_at "yesterday") are skipped.
+        Returns the number of rows accepted.
+        """
+        rows, skipped = [], 0
+        for r in results:
+            try:
+                rows.append(_normalize(r, source))
+            except (TypeError, ValueError, AttributeError):
+                skipped += 1
+        if skipped:
+            self.skipped += skipped
+            print(f"Stats import: skipped {skipped} malformed result(s)")
+        if not rows:
+            return 0
+        deltas = _rollup_deltas(rows)
+        self._apply(deltas, 1)
+        self._ensure_writer()
+        self._queue.put((rows, deltas))
+        return len(rows)
+
+    def import_file(self, path: str, source: str = "tournament") -> int:
+        """Bulk-import a .csv (header row required) or .json (list of objects) file."""
+        if path.lower().endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                results = json.load(f)
+        else:
+            with open(path, newline="", encoding="utf-8") as f:
+                results = list(csv.DictReader(f))
+        return self.import_results(results, source=source)
+
+    def flush(self) -> None:
+        """Block until every queued result has been committed."""
+        if self._writer:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._writer:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _apply(self, deltas: dict, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) batch deltas from the in-memory rollups."""
+        with self._lock:
+            for bucket, acc in deltas.items():
+                counts = self._rollups.setdefault(bucket, [0] * 5)
+                for i, v in enumerate(acc):
+                    counts[i] += sign * v
+                if not counts[_GAMES]:
+                    del self._rollups[bucket]
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                batch = self._queue.get()
+                if batch is None:
+                    self._queue.task_done()
+                    break
+                rows, deltas = batch
+                try:
+                    with conn:
+                        conn.executemany(_INSERT_GAME, rows)
+                        conn.executemany(
+                            _UPSERT_ROLLUP,
+                            [(dim, key, *acc) for (dim, key), acc in deltas.items()]
+                        )
+                except sqlite3.Error as e:
+                    # the transaction was rolled back: take the batch out of the mirror too
+                    self._apply(deltas, -1)
+                    print("Stats write failed:", e)
+                finally:
+                    self._queue.task_done()
+        finally:
+            self._release(conn)
+
+    # ─── Reads (rollups only) ───────────────────────────────────────────────
+    def summary(self, dimension: str = "all", key: str = "all") -> dict:
+        """Return games, wins, win_rate, accuracy and avg_win_ms for one bucket."""
+        with self._lock:
+            counts = list(self._rollups.get((dimension, str(key)), [0] * 5))
+        games, wins = counts[_GAMES], counts[_WINS]
+        shots, hits = counts[_SHOTS], counts[_HITS]
+        return {
+            "games":      games,
+            "wins":       wins,
+            "win_rate":   (wins / games * 100) if games else 0.0,
+            "accuracy":   (hits / shots * 100) if shots else 0.0,
+            "avg_win_ms": (counts[_WIN_TIME] / wins) if wins else 0.0,
+        }
+
+    def breakdown(self, dimension: str) -> dict:
+        """Return {key: summary} for every bucket of a dimension (e.g. 'difficulty')."""
+        with self._lock:
+            keys = [k for (d, k) in self._rollups if d == dimension]
+        return {k: self.summary(dimension, k) for k in sorted(keys)}
+
+
+if __name__ == "__main__":
+    # Bulk import: python -m core.stats_store results.csv [more.json ...]
+    import sys
+    store = StatsStore()
+    for p in sys.argv[1:]:
+        print(f"{p}: {store.import_file(p)} results imported")
+    store.close()
+    print(store.summary())
@@ -0,0 +1,68 @@
+from array import array
+
+"""
+Module: timing_series.py
+Purpose:
+  - Compact container for shot timestamps (pygame ticks, ms).
+  - Keeps count, first/last stamp and min/max/mean gap incrementally,
+    so stats read in O(1) no matter how long a match runs.
+  - Optionally retains the most recent N raw stamps in an array-backed ring buffer.
+Future Hooks:
+  - Feed the recent window into a per-shot timing graph on the stats screen.
+"""
+
+class TimingSeries:
+    """
+    Drop-in replacement for the old `list` of shot ticks: call append(now).
+    Aggregates are over the gaps between consecutive shots.
+    """
+    __slots__ = ("count", "first", "last", "min_gap", "max_gap", "_ring", "_head")
+
+    def __init__(self, window: int = 0):
+        self.count   = 0
+        self.first   = None
+        self.last    = None
+        self.min_gap = None
+        self.max_gap = None
+        # ring buffer of the last `window` stamps (signed 64-bit)
+        self._ring = array("q", bytes(8 * window))
+        self._head = 0
+
+    def append(self, stamp: int) -> None:
+        """Record one shot timestamp."""
+        if self.count == 0:
+            self.first = stamp
+        else:
+            gap = stamp - self.last
+            if self.min_gap is None or gap < self.min_gap:
+                self.min_gap = gap
+            if self.max_gap is None or gap > self.max_gap:
+                self.max_gap = gap
+        self.last   = stamp
+        self.count += 1
+
+        if self._ring:
+            self._ring[self._head] = stamp
+            self._head = (self._head + 1) % len(self._ring)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def total_ms(self) -> int:
+        """Time between the first and the last shot."""
+        return self.last - self.first if self.count > 1 else 0
+
+    @property
+    def mean_ms(self) -> float:
+        """Average gap between shots."""
+        return self.total_ms / (self.count - 1) if self.count > 1 else 0
+
+    def recent(self) -> list[int]:
+        """Retained raw stamps, oldest first (empty when no window was requested)."""
+        size = len(self._ring)
+        if not size:
+            return []
+        if self.count < size:
+            return self._ring[:self.count].tolist()
+        return (self._ring[self._head:] + self._ring[:self._head]).tolist()
@@ -0,0 +1,375 @@
+import time
+import inspect
+import threading
+import tracemalloc
+from abc import ABC, abstractmethod
+from random import randint, shuffle
+
+from core.config import Config
+from core.rules import Rules
+from game.board_helpers import Cell
+from game.monte_carlo import MonteCarloSearch
+from game.endgame import EndgameSolver
+from game import heatmaps
+
+"""
+Module: ai_strategies.py
+Purpose:
+  - AIStrategy interface (an ABC): choose(view) -> (r, c) decides from an AIView
+    (read-only; may run on the AI worker thread), observe(r, c, hit) learns
+    from the shot on the main thread. Each strategy owns its compact state.
+  - Registry keyed by difficulty name: @register('Hard') / create('Hard', rules).
+    A strategy is built for one match's Rules (grid size + fleet), never
+    reading the global Config grid, so many matches can share a process.
+  - Hard and Expert open from the cached prior heatmap (game/heatmaps.py)
+    instead of searching blind. The heatmap is built off the main thread;
+    until it is ready they search the smallest ship's parity class. Expert switches to the exact endgame solver
+    (game/endgame.py) once few enough layouts remain.
+  - Per-strategy instrumentation: decision time, Monte Carlo samples/s, peak memory per move
+    (when Config.AI_TRACE_MEMORY is on) and shots-to-sink.
+Future Hooks:
+  - Load third-party strategies from a plugins directory.
+"""
+
+_registry = {}
+
+
+def register(name: str):
+    """Class decorator adding a strategy to the registry under `name`."""
+    def deco(cls):
+        if inspect.isabstract(cls):
+            missing = ", ".join(sorted(cls.__abstractmethods__))
+            raise TypeError(f"AI strategy {name!r} does not implement {missing}")
+        cls.name = name
+        _registry[name] = cls
+        return cls
+    return deco
+
+
+def create(name: str, rules: Rules = None) -> "AIStrategy":
+    """
+    Fresh strategy instance for a match played under `rules` (default: the
+    current Config settings); unknown names fall back to the default.
+    """
+    cls = _registry.get(name)
+    if cls is None:
+        print(f"Unknown AI strategy {name!r}; using {Config.DEFAULT_DIFFICULTY}")
+        cls = _registry[Config.DEFAULT_DIFFICULTY]
+    return cls(Rules.from_config() if rules is None else rules)
+
+
+def names() -> list:
+    return list(_registry)
+
+
+# ─── Shared helpers ─────────────────────────────────────────────────────────
+def unknown(view, r: int, c: int) -> bool:
+    """True if (r,c) is on the board and not yet shot at."""
+    size = len(view.board)
+    return 0 <= r < size and 0 <= c < size and view.board[r][c] == Cell.EMPTY
+
+
+def random_target(view):
+    """A random untried cell (None only if every cell has been shot)."""
+    board = view.board
+    size  = len(board)
+    if not any(Cell.EMPTY in row for row in board):
+        return None
+    while True:
+        r, c = randint(0, size-1), randint(0, size-1)
+        if board[r][c] == Cell.EMPTY:
+            return r, c
+
+
+def parity_order(rules: Rules) -> list:
+    """Every cell, the smallest ship's parity class first, each half shuffled."""
+    n = rules.grid_size
+    k = min(rules.ship_sizes) if rules.ship_sizes else 1
+    first = [(r, c) for r in range(n) for c in range(n) if (r + c) % k == 0]
+    rest  = [(r, c) for r in range(n) for c in range(n) if (r + c) % k != 0]
+    shuffle(first)
+    shuffle(rest)
+    return first + rest
+
+
+class OpeningOrder:
+    """
+    Search order for a fresh match: the prior heatmap's opening_order() once
+    heatmaps has it in memory, parity_order() until then (never blocks).
+    """
+    __slots__ = ("rules", "cells", "prior")
+
+    def __init__(self, rules: Rules):
+        self.rules = rules
+        self.prior = False
+        self.cells = parity_order(rules) if rules.ship_sizes else []
+        self.refresh()
+
+    def refresh(self) -> list:
+        """
+        The current order, switching to the prior if it has become ready.
+        Called from observe() (main thread); choose() only reads `cells`.
+        """
+        if not self.prior and self.rules.ship_sizes:
+            n, fleet = self.rules
+            hm = heatmaps.peek(n, fleet)
+            if hm is None:
+                heatmaps.request(n, fleet)
+            else:
+                self.cells, self.prior = hm.opening_order(), True
+        return self.cells
+
+
+def next_in(order, view):
+    """First cell of `order` still unknown in the view, else a random one."""
+    board = view.board
+    for r, c in order:
+        if board[r][c] == Cell.EMPTY:
+            return r, c
+    return random_target(view)
+
+
+# ─── Instrumentation ────────────────────────────────────────────────────────
+class StrategyStats:
+    __slots__ = ("moves", "total_ms", "max_ms", "peak_kb", "sinks", "sink_shots", "sample_rate")
+
+    def __init__(self):
+        self.moves      = 0
+        self.total_ms   = 0.0
+        self.max_ms     = 0.0
+        self.peak_kb    = 0.0
+        self.sinks      = 0
+        self.sink_shots = 0
+        self.sample_rate = 0.0   # Monte Carlo samples/s on the last sampled move (Expert)
+
+    def as_dict(self) -> dict:
+        return {
+            "moves":          self.moves,
+            "mean_ms":        self.total_ms / self.moves if self.moves else 0.0,
+            "max_ms":         self.max_ms,
+            "peak_kb":        self.peak_kb,
+            "sinks":          self.sinks,
+            "shots_per_sink": self.sink_shots / self.sinks if self.sinks else 0.0,
+            "samples_per_s":  self.sample_rate,
+        }
+
+
+stats = {}   # strategy name -> StrategyStats
+
+
+def _stats_for(name):
+    s = stats.get(name)
+    if s is None:
+        s = stats[name] = StrategyStats()
+    return s
+
+
+def decide(strategy: "AIStrategy", view):
+    """strategy.choose(view), recording how long (and how much memory) it took."""
+    trace = Config.AI_TRACE_MEMORY
+    if trace:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    move  = strategy.choose(view)
+    ms    = (time.perf_counter() - start) * 1000
+
+    s = _stats_for(strategy.name)
+    s.moves    += 1
+    s.total_ms += ms
+    s.max_ms    = max(s.max_ms, ms)
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        s.peak_kb = max(s.peak_kb, (peak - base) / 1024)
+    return move
+
+
+def record_sink(name: str, shots: int) -> None:
+    """A ship was sunk `shots` shots after the strategy first hit it."""
+    s = _stats_for(name)
+    s.sinks      += 1
+    s.sink_shots += shots
+
+
+def record_sample_rate(name: str, rate: float) -> None:
+    """Samples per second the strategy's Monte Carlo search reached on its last move."""
+    _stats_for(name).sample_rate = rate
+
+
+def report() -> dict:
+    return {name: s.as_dict() for name, s in stats.items()}
+
+
+def reset_stats() -> None:
+    stats.clear()
+
+
+# ─── Strategies ─────────────────────────────────────────────────────────────
+class AIStrategy(ABC):
+    __slots__ = ()
+    name = None
+
+    def __init__(self, rules: Rules):
+        """Set up memory for one match under `rules`."""
+
+    @abstractmethod
+    def choose(self, view):
+        """Return the (r, c) to fire at. Must not mutate self."""
+
+    def observe(self, r: int, c: int, hit: bool) -> None:
+        """Learn from the result of the shot just fired."""
+
+
+@register('Easy')
+class RandomStrategy(AIStrategy):
+    """Fire at random untried cells."""
+    __slots__ = ()
+
+    def choose(self, view):
+        return random_target(view)
+
+
+@register('Medium')
+class HuntStrategy(AIStrategy):
+    """Random until a hit, then work through the hit cells' orthogonal neighbors."""
+    __slots__ = ("targets",)
+
+    def __init__(self, rules):
+        self.targets = []
+
+    def choose(self, view):
+        for r, c in self.targets:
+            if unknown(view, r, c):
+                return r, c
+        return random_target(view)
+
+    def observe(self, r, c, hit):
+        # choose() skips spent/out-of-bounds targets, so just keep the queue short
+        targets = [t for t in self.targets if t != (r, c)]
+        if hit:
+            for dr, dc in ((-1,0),(1,0),(0,-1),(0,1)):
+                t = (r + dr, c + dc)
+                if t not in targets:
+                    targets.append(t)
+        self.targets = targets
+
+
+@register('Hard')
+class HuntDestroyStrategy(AIStrategy):
+    """Search the prior's parity class; after a hit probe each direction, then follow the ship both ways."""
+    __slots__ = ("order", "origin", "directions", "direction", "last", "reversed")
+
+    def __init__(self, rules):
+        self.order = OpeningOrder(rules)
+        self._search()
+
+    def _search(self):
+        self.origin     = None      # first hit of the ship being destroyed
+        self.directions = ()        # directions not yet probed from origin
+        self.direction  = None      # locked direction once a probe hits
+        self.last       = None      # furthest hit along `direction`
+        self.reversed   = False
+
+    def choose(self, view):
+        if self.origin is None:
+            return next_in(self.order.cells, view)
+
+        r0, c0 = self.origin
+        if self.direction is None:
+            for dr, dc in self.directions:
+                if unknown(view, r0 + dr, c0 + dc):
+                    return r0 + dr, c0 + dc
+            return next_in(self.order.cells, view)
+
+        dr, dc = self.direction
+        lr, lc = self.last
+        if unknown(view, lr + dr, lc + dc):
+            return lr + dr, lc + dc
+        if not self.reversed and unknown(view, r0 - dr, c0 - dc):
+            return r0 - dr, c0 - dc
+        return next_in(self.order.cells, view)
+
+    def observe(self, r, c, hit):
+        self.order.refresh()
+        if self.origin is not None:
+            r0, c0 = self.origin
+            if self.direction is None:
+                for i, (dr, dc) in enumerate(self.directions):
+                    if (r0 + dr, c0 + dc) == (r, c):
+                        # this probe (and any skipped before it) is spent
+                        self.directions = self.directions[i+1:]
+                        if hit:
+                            self.direction, self.last = (dr, dc), (r, c)
+                        return
+            else:
+                dr, dc = self.direction
+                lr, lc = self.last
+                if (r, c) == (lr + dr, lc + dc):
+                    if hit:
+                        self.last = (r, c)
+                    elif not self.reversed:
+                        # reverse direction (fired next turn, from the origin)
+                        self.direction, self.last, self.reversed = (-dr, -dc), self.origin, True
+                    else:
+                        self._search()
+                    return
+                if not self.reversed and (r, c) == (r0 - dr, c0 - dc):
+                    self.direction, self.reversed = (-dr, -dc), True
+                    if hit:
+                        self.last = (r, c)
+                    else:
+                        self._search()
+                    return
+            # a fallback search shot: this target is exhausted
+            self._search()
+
+        if hit:
+            self.origin     = (r, c)
+            self.directions = ((-1,0),(1,0),(0,-1),(0,1))
+            self.last       = (r, c)
+
+
+@register('Expert')
+class MonteCarloStrategy(AIStrategy):
+    """
+    Fire where sampled fleets consistent with the view put ships most often;
+    solve exactly once few layouts remain. The endgame transposition table
+    and the search front-end belong to this instance (the worker processes
+    are shared, see monte_carlo.pool()); `lock` serialises choose/observe.
+    """
+    __slots__ = ("order", "endgame", "search", "lock")
+
+    def __init__(self, rules):
+        self.order   = OpeningOrder(rules)
+        self.endgame = EndgameSolver(Config.ENDGAME_MAX_LAYOUTS, Config.ENDGAME_SEARCH_LAYOUTS)
+        self.search  = MonteCarloSearch(Config.MC_WORKERS)
+        self.lock    = threading.Lock()
+
+    def choose(self, view):
+        with self.lock:
+            limit = min(view.deadline, time.perf_counter() + Config.ENDGAME_TIME_LIMIT_MS / 1000)
+            move = self.endgame.best_cell(view.board, view.ship_sizes, view.sunk, limit)
+            if move is not None:
+                return move
+
+            if self.order.cells and self._opening(view):
+                # nothing learned yet: the posterior is (almost) the cached prior
+                return next_in(self.order.cells, view)
+            move = self.search.best_cell(view.board, view.ship_sizes, view.sunk, view.deadline)
+            record_sample_rate(self.name, self.search.last_rate)
+            return move or random_target(view)
+
+    def observe(self, r, c, hit):
+        with self.lock:
+            self.order.refresh()
+
+    @staticmethod
+    def _opening(view) -> bool:
+        shots = 0
+        for row in view.board:
+            if Cell.HIT in row:
+                return False
+            shots += len(row) - row.count(Cell.EMPTY)
+        return shots < Config.HEATMAP_OPENING_SHOTS
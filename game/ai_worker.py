@@ -0,0 +1,90 @@
+import time
+import queue
+import threading
+from typing import NamedTuple
+import pygame
+from core.config import Config
+
+"""
+Module: ai_worker.py
+Purpose:
+  - Runs AI move searches on a background thread so slow strategies never
+    stall rendering or input.
+  - Each job gets a soft time budget (stamped on the view as its deadline);
+    the finished move is posted to the main loop as a Config.AI_MOVE_EVENT
+    carrying the job's token, the move and the thinking time.
+  - Tokens let the caller drop results from turns it has since abandoned
+    (restart, new match, hard deadline already hit).
+  - An abandoned job may still be inside strategy.choose(); call_after()
+    queues the strategy's observe() behind it, so a strategy is never read
+    and updated on two threads at once (busy() says whether that is needed).
+  - AIView: the immutable snapshot a strategy decides from.
+Future Hooks:
+  - Cancel long searches early instead of letting them run to their budget.
+"""
+
+
+class AIView(NamedTuple):
+    """What the AI may know about the board it is shooting at."""
+    board:      tuple    # rows of Cell: HIT / MISS, everything unshot is EMPTY
+    ship_sizes: tuple    # the whole fleet, e.g. (5, 4, 3)
+    sunk:       tuple    # coordinate tuples of ships already sunk
+    deadline:   float = float("inf")   # time.perf_counter() to answer by
+
+
+class AIWorker:
+    """One daemon thread consuming (token, choose, view, budget) jobs in order."""
+
+    def __init__(self):
+        self._jobs   = queue.Queue()
+        self._thread = None
+
+    def submit(self, token: int, choose, view, budget_ms: int) -> None:
+        """
+        Queue choose(view) to run off-thread; the view's deadline is set
+        `budget_ms` after the job actually starts.
+        """
+        self._ensure_thread()
+        self._jobs.put((token, choose, view, budget_ms))
+
+    def busy(self) -> bool:
+        """True while a submitted job has not finished (it may be running right now)."""
+        return self._jobs.unfinished_tasks > 0
+
+    def call_after(self, fn, *args) -> None:
+        """Run fn(*args) on the worker thread once every job queued so far has finished."""
+        self._ensure_thread()
+        self._jobs.put((None, fn, args, None))
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            token, choose, view, budget_ms = self._jobs.get()
+            if budget_ms is None:
+                self._call(choose, view)
+                continue
+            start = time.perf_counter()
+            try:
+                move = choose(view._replace(deadline=start + budget_ms / 1000))
+            except Exception as e:
+                print("AI worker error:", e)
+                move = None
+            think_ms = (time.perf_counter() - start) * 1000
+            try:
+                pygame.event.post(pygame.event.Event(
+                    Config.AI_MOVE_EVENT, token=token, move=move, think_ms=think_ms))
+            except pygame.error:
+                # pygame was shut down (e.g. back to the Tk menu): nobody is waiting
+                pass
+            self._jobs.task_done()
+
+    def _call(self, fn, args):
+        try:
+            fn(*args)
+        except Exception as e:
+            print("AI worker error:", e)
+        self._jobs.task_done()
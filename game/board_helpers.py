@@ -8,6 +8,14 @@ Purpose:
   - Pure-logic helpers for board grid management.
   - Cell Enum for EMPTY, SHIP, MISS, HIT.
   - Functions: create_board, place_ship_randomly, get_grid_pos, fire_at.
+  - Fleet placement from cached legal-placement tables per (grid size,
+    length): an occupancy bitmask makes each overlap test one AND, dead ends
+    backtrack, and fleets that cannot fit are rejected up front
+    (place_fleet, fleet_fits, legal_placements). When the budgeted random
+    search keeps failing, an exhaustive search over randomly ordered tables
+    either finds a layout or proves there is none.
+  - placement_masks(): the same tables as bare bitmasks minus blocked cells,
+    shared by the heatmaps, the endgame solver and the simulator.
 Future Hooks:
   - fire_at could return Ship objects for sunk detection and network notification.
 """
@@ -18,40 +26,191 @@ class Cell(Enum):
     MISS  = auto()
     HIT   = auto()
 
-def create_board():
+def create_board(grid_size: int = None):
     """Create a 2D board grid initialized with EMPTY cells."""
-    return [[Cell.EMPTY for _ in range(Config.GRID_SIZE)] for _ in range(Config.GRID_SIZE)]
+    n = Config.GRID_SIZE if grid_size is None else grid_size
+    return [[Cell.EMPTY for _ in range(n)] for _ in range(n)]
+
+# ─── Fleet placement ────────────────────────────────────────────────────────
+PLACEMENT_PROBES       = 8      # random picks tried before scanning every placement
+PLACEMENT_SEARCH_NODES = 200    # partial layouts per random attempt before restarting
+PLACEMENT_RESTARTS     = 3
+
+_placement_cache = {}   # (grid size, length) -> [(bitmask, coords), ...]
+_fits_cache      = {}   # (grid size, sorted lengths) -> a fitting layout, or None
+
+
+def legal_placements(length: int, grid_size: int = None) -> list:
+    """
+    Every straight placement of `length` on an empty grid as (bitmask, coords),
+    horizontal then vertical. Bit r*n + c is cell (r, c). Cached per (size, length).
+    """
+    n = Config.GRID_SIZE if grid_size is None else grid_size
+    key = (n, length)
+    table = _placement_cache.get(key)
+    if table is None:
+        table = []
+        for r in range(n):
+            for c in range(n - length + 1):
+                coords = tuple((r, c + i) for i in range(length))
+                table.append((_mask(coords, n), coords))
+        for r in range(n - length + 1):
+            for c in range(n):
+                coords = tuple((r + i, c) for i in range(length))
+                table.append((_mask(coords, n), coords))
+        _placement_cache[key] = table
+    return table
+
+
+def placement_masks(length: int, grid_size: int = None, blocked: int = 0) -> list:
+    """Bitmasks of every distinct placement of `length` that avoids the `blocked` cells."""
+    table = legal_placements(length, grid_size)
+    if length < 2:
+        table = table[:len(table) // 2]   # a 1-cell ship's vertical placements repeat the horizontal ones
+    return [m for m, _ in table if not m & blocked]
+
+
+def _mask(coords, n) -> int:
+    m = 0
+    for r, c in coords:
+        m |= 1 << (r * n + c)
+    return m
+
+
+def occupancy_mask(board) -> int:
+    """Bitmask of every non-EMPTY cell."""
+    n = len(board)
+    m = 0
+    for r, row in enumerate(board):
+        if row.count(Cell.EMPTY) == n:
+            continue
+        for c, cell in enumerate(row):
+            if cell != Cell.EMPTY:
+                m |= 1 << (r * n + c)
+    return m
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+def _search(tables, i, occupied, rng, budget):
+    """Bitmask/coords picks for tables[i:] avoiding `occupied`, backtracking on dead ends."""
+    if i == len(tables):
+        return []
+    budget[0] -= 1
+    if budget[0] < 0:
+        raise _OutOfBudget
+    table = tables[i]
+    for _ in range(PLACEMENT_PROBES):
+        pick = rng.choice(table)
+        if not pick[0] & occupied:
+            rest = _search(tables, i + 1, occupied | pick[0], rng, budget)
+            if rest is not None:
+                return [pick] + rest
+    for pick in rng.sample(table, len(table)):
+        if not pick[0] & occupied:
+            rest = _search(tables, i + 1, occupied | pick[0], rng, budget)
+            if rest is not None:
+                return [pick] + rest
+    return None
+
+
+def _first_fit(tables, i, occupied, start):
+    """
+    Exhaustive search in table order: a layout, or None only if none exists.
+    Ships of equal length share one table and take placements in increasing
+    order, so each set of placements is tried once.
+    """
+    if i == len(tables):
+        return []
+    table = tables[i]
+    for j in range(start, len(table)):
+        pick = table[j]
+        if not pick[0] & occupied:
+            same = i + 1 < len(tables) and tables[i + 1] is table
+            rest = _first_fit(tables, i + 1, occupied | pick[0], j + 1 if same else 0)
+            if rest is not None:
+                return [pick] + rest
+    return None
+
+
+def _shuffled(tables, rng):
+    """Randomly ordered copies of `tables`; ships of equal length still share one copy."""
+    copies = {}
+    out = []
+    for table in tables:
+        if id(table) not in copies:
+            copies[id(table)] = rng.sample(table, len(table))
+        out.append(copies[id(table)])
+    return out
+
+
+def _fit_layout(n, sizes):
+    """A layout for `sizes` (sorted longest first) on an empty n x n grid, or None (cached)."""
+    key = (n, sizes)
+    if key not in _fits_cache:
+        layout = None
+        if not sizes:
+            layout = []
+        elif sizes[0] <= n and sum(sizes) <= n * n:
+            layout = _first_fit([legal_placements(L, n) for L in sizes], 0, 0, 0)
+        _fits_cache[key] = layout
+    return _fits_cache[key]
+
+
+def fleet_fits(sizes, grid_size: int = None) -> bool:
+    """True if ships of `sizes` can all be placed on an empty grid (cached)."""
+    n = Config.GRID_SIZE if grid_size is None else grid_size
+    return _fit_layout(n, tuple(sorted(sizes, reverse=True))) is not None
+
+
+def place_fleet(board, sizes, rng=random) -> list:
+    """
+    Place a whole fleet at random around whatever is already on the board.
+    Returns one coords list per ship (in `sizes` order); raises ValueError
+    if the fleet cannot fit.
+    """
+    n = len(board)
+    if _fit_layout(n, tuple(sorted(sizes, reverse=True))) is None:
+        raise ValueError(f"Fleet {list(sizes)} does not fit on a {n}x{n} board")
+    # longest first: they have the fewest options
+    order    = sorted(range(len(sizes)), key=lambda i: -sizes[i])
+    tables   = [legal_placements(sizes[i], n) for i in order]
+    occupied = occupancy_mask(board)
+    picks    = None
+    for _ in range(PLACEMENT_RESTARTS):
+        try:
+            picks = _search(tables, 0, occupied, rng, [PLACEMENT_SEARCH_NODES])
+            break
+        except _OutOfBudget:
+            continue
+    else:
+        # tight fleet: search everything, in random order so layouts still vary;
+        # None here proves nothing fits around the ships already on the board
+        picks = _first_fit(_shuffled(tables, rng), 0, occupied, 0)
+    if picks is None:
+        raise ValueError(f"Fleet {list(sizes)} does not fit around the ships already placed")
+    coords = [None] * len(sizes)
+    for i, (_, cells) in zip(order, picks):
+        for r, c in cells:
+            board[r][c] = Cell.SHIP
+        coords[i] = list(cells)
+    return coords
+
 
 def place_ship_randomly(board, size):
     """Place a ship of given size randomly without overlap."""
-    while True:
-        orientation = random.choice(['h', 'v'])
-        if orientation == 'h':
-            row = random.randint(0, Config.GRID_SIZE - 1)
-            col = random.randint(0, Config.GRID_SIZE - size)
-            if all(board[row][col + i] == Cell.EMPTY for i in range(size)):
-                coords = []
-                for i in range(size):
-                    board[row][col + i] = Cell.SHIP
-                    coords.append((row, col + i))
-                return coords
-        else:
-            row = random.randint(0, Config.GRID_SIZE - size)
-            col = random.randint(0, Config.GRID_SIZE - 1)
-            if all(board[row + i][col] == Cell.EMPTY for i in range(size)):
-                coords = []
-                for i in range(size):
-                    board[row + i][col] = Cell.SHIP
-                    coords.append((row + i, col))
-                return coords
-            
-def get_grid_pos(mouse_pos, offset_x, offset_y, cell_size=None):
+    return place_fleet(board, [size])[0]
+
+def get_grid_pos(mouse_pos, offset_x, offset_y, cell_size=None, grid_size=None):
     """Convert pixel coords to grid (row, col)."""
-    cs = cell_size or Config.CELL_SIZE
+    cs = Config.CELL_SIZE if cell_size is None else cell_size
+    n  = Config.GRID_SIZE if grid_size is None else grid_size
     mx, my = mouse_pos
     col = (mx - offset_x) // cs
     row = (my - offset_y) // cs
-    if 0 <= row < Config.GRID_SIZE and 0 <= col < Config.GRID_SIZE:
+    if 0 <= row < n and 0 <= col < n:
         return row, col
     return None, None
 
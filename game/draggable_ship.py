@@ -1,6 +1,7 @@
 import os
 import pygame
 from core.config import Config
+from helpers.input_events import mouse_pos
 
 """
 Module: draggable_ship.py
@@ -19,12 +20,14 @@ SHIP_IMAGE_FILES = {
 }
 
 class DraggableShip:
-    def __init__(self, size: int, x: int, y: int):
+    def __init__(self, size: int, x: int, y: int, cell_size: int = None):
         """
         size: number of cells this ship spans (3, 4, or 5)
         x, y: initial top-left pixel coords for the sprite
+        cell_size: placement cell size in pixels (the round's layout.cell_size)
         """
         self.size = size
+        self.cell_size = cell_size = Config.CELL_SIZE if cell_size is None else cell_size
         self.orientation = 'h'  # 'h' or 'v'
 
         # ─── Load & validate the correct sprite ─────────────────────────────────
@@ -34,10 +37,10 @@ class DraggableShip:
         image_path = os.path.join("resources", "images", filename)
         raw = pygame.image.load(image_path).convert_alpha()
 
-        # ─── Scale it as a vertical strip: CELL_SIZE × (size × CELL_SIZE)
+        # ─── Scale it as a vertical strip: cell_size × (size × cell_size)
         vertical = pygame.transform.scale(
             raw,
-            (Config.CELL_SIZE, size * Config.CELL_SIZE)
+            (cell_size, size * cell_size)
         )
 
         # ─── Create the horizontal base image by rotating -90°
@@ -77,7 +80,7 @@ class DraggableShip:
         # ─── NEW: if the user is mid-drag, recompute the drag offset
         #          so the ship stays stuck to the cursor post-rotation
         if self.dragging:
-            mx, my = pygame.mouse.get_pos()
+            mx, my = mouse_pos()
             self.drag_offset = (self.rect.x - mx, self.rect.y - my)
     def reset_position(self):
         """
@@ -109,14 +112,15 @@ class DraggableShip:
         """
         self.coords = coords
 
-    def get_preview_cells(self, offset_x: int, offset_y: int):
+    def get_preview_cells(self, offset_x: int, offset_y: int, grid_size: int = None):
         """
         Return the grid cells this ship would occupy based on
         its current screen position & orientation.
         (Unchanged logic from your previous implementation.)
         """
-        col = (self.rect.centerx - offset_x) // Config.CELL_SIZE
-        row = (self.rect.centery  - offset_y) // Config.CELL_SIZE
+        n = Config.GRID_SIZE if grid_size is None else grid_size
+        col = (self.rect.centerx - offset_x) // self.cell_size
+        row = (self.rect.centery  - offset_y) // self.cell_size
 
         if self.orientation == 'h':
             col -= self.size // 2
@@ -125,12 +129,12 @@ class DraggableShip:
 
         cells = []
         if self.orientation == 'h':
-            if col < 0 or col + self.size > Config.GRID_SIZE or row < 0 or row >= Config.GRID_SIZE:
+            if col < 0 or col + self.size > n or row < 0 or row >= n:
                 return None
             for i in range(self.size):
                 cells.append((row, col + i))
         else:
-            if row < 0 or row + self.size > Config.GRID_SIZE or col < 0 or col >= Config.GRID_SIZE:
+            if row < 0 or row + self.size > n or col < 0 or col >= n:
                 return None
             for i in range(self.size):
                 cells.append((row + i, col))
@@ -0,0 +1,94 @@
+import heapq
+import pygame
+from core.config import Config
+
+"""
+Module: effects.py
+Purpose:
+  - Short-lived hit/miss animations (explosions, splashes) for the battle screen.
+  - Effect records use __slots__ and are recycled through a free-list pool.
+  - Expiry is a min-heap on end time, so dropping finished effects is O(log n).
+  - Fade animations are baked once per (kind, cell size) into alpha frames;
+    drawing an effect is a single blit with no per-frame surface copies.
+Future Hooks:
+  - Sunk-ship shockwave and salvo effects reusing the same pool.
+"""
+
+EXPLOSION = "explosion"
+SPLASH    = "splash"
+
+_fade_cache = {}   # (kind, cell_size) -> [Surface, ...] from opaque to transparent
+
+
+def _source(kind):
+    if kind == EXPLOSION:
+        return Config.EXPLOSION_IMG, Config.EXPLOSION_FADE_DURATION
+    return Config.MISS_IMG, Config.MISS_FADE_DURATION
+
+
+def fade_frames(kind: str, cell_size: int) -> list:
+    """Alpha-faded copies of the effect image scaled to cell_size (baked once)."""
+    key = (kind, cell_size)
+    frames = _fade_cache.get(key)
+    if frames is None:
+        img, _ = _source(kind)
+        base = pygame.transform.smoothscale(img, (cell_size, cell_size)).convert_alpha()
+        steps = Config.EFFECT_FADE_STEPS
+        frames = []
+        for i in range(steps):
+            frame = base.copy()
+            frame.set_alpha(int(255 * (1 - i / steps)))
+            frames.append(frame)
+        _fade_cache[key] = frames
+    return frames
+
+
+def clear_fade_cache():
+    """Forget baked frames (they depend on the display; call after re-init)."""
+    _fade_cache.clear()
+
+
+class Effect:
+    __slots__ = ("kind", "row", "col", "board_idx", "start", "duration", "seq")
+
+
+class EffectPool:
+    """Live effects keyed by spawn order, an expiry heap, and a free list."""
+
+    def __init__(self):
+        self._live = {}    # seq -> Effect (dicts keep spawn order for drawing)
+        self._heap = []    # (expires_at, seq)
+        self._free = []
+        self._seq  = 0
+
+    def spawn(self, kind: str, row: int, col: int, board_idx: int, now: int) -> Effect:
+        """Start an effect on board_idx (0 = left grid, 1 = right grid)."""
+        eff = self._free.pop() if self._free else Effect()
+        _, duration = _source(kind)
+        eff.kind, eff.row, eff.col, eff.board_idx = kind, row, col, board_idx
+        eff.start, eff.duration = now, duration
+        self._seq += 1
+        eff.seq = self._seq
+        self._live[eff.seq] = eff
+        heapq.heappush(self._heap, (now + duration, eff.seq))
+        return eff
+
+    def expire(self, now: int) -> None:
+        """Return every finished effect to the pool."""
+        heap, live = self._heap, self._live
+        while heap and heap[0][0] <= now:
+            _, seq = heapq.heappop(heap)
+            eff = live.pop(seq, None)
+            if eff is not None:
+                self._free.append(eff)
+
+    def clear(self) -> None:
+        self._free.extend(self._live.values())
+        self._live.clear()
+        self._heap.clear()
+
+    def __iter__(self):
+        return iter(self._live.values())
+
+    def __len__(self) -> int:
+        return len(self._live)
@@ -0,0 +1,207 @@
+import time
+
+from game.board_helpers import placement_masks
+from game.monte_carlo import encode
+
+"""
+Module: endgame.py
+Purpose:
+  - Exact endgame play for the Expert AI. Once few enough fleet layouts
+    remain consistent with the view (small boards from the first shot, late
+    game on large ones), enumerate them all:
+      <= limit layouts:        fire the likeliest cell under the exact distribution
+      <= search_limit layouts: fire the cell that minimises the expected number
+                               of shots needed to finish the fleet
+  - Layouts are occupancy bitmasks of the ships still afloat (sunk ships are
+    fixed by encode()); fleets that fill the same cells are merged and weighted.
+  - Every candidate needs the same cells hit, so expected shots = cells left +
+    expected misses, and the misses depend only on which candidates remain.
+    The transposition table is keyed on that candidate bitset (one int), and
+    a shot with hit chance p costs at least (1 - p), which prunes the search.
+  - A hard per-move deadline: on timeout the likeliest cell is returned.
+    Finished subtrees stay in the table, so the next move usually completes.
+Future Hooks:
+  - Split outcomes on "sunk" announcements as well as hit/miss.
+"""
+
+
+ENUM_NODES_PER_LAYOUT = 50   # enumeration effort per allowed layout before giving up
+
+
+class _Timeout(Exception):
+    pass
+
+
+def enumerate_layouts(n, lengths, hits, blocked, limit, deadline):
+    """
+    {occupancy mask: number of fleets} for every layout of `lengths` avoiding
+    `blocked` and covering `hits`, or None if there are more than `limit`
+    distinct masks, the search visits more than ENUM_NODES_PER_LAYOUT * limit
+    partial layouts, or the deadline (time.perf_counter()) passes first.
+    """
+    lengths = sorted(lengths, reverse=True)
+    tables  = [placement_masks(L, n, blocked) for L in lengths]
+    cover   = [sum(lengths[i:]) for i in range(len(lengths) + 1)]
+    found   = {}
+    nodes   = [0]
+    budget  = ENUM_NODES_PER_LAYOUT * limit
+
+    def extend(depth, occupied):
+        nodes[0] += 1
+        if nodes[0] & 255 == 0 and (nodes[0] > budget or time.perf_counter() > deadline):
+            raise _Timeout
+        open_hits = hits & ~occupied
+        if bin(open_hits).count("1") > cover[depth]:
+            return
+        if depth == len(tables):
+            found[occupied] = found.get(occupied, 0) + 1
+            if len(found) > limit:
+                raise _Timeout
+            return
+        for m in tables[depth]:
+            if not m & occupied:
+                extend(depth + 1, occupied | m)
+
+    try:
+        extend(0, 0)
+    except _Timeout:
+        return None
+    return found
+
+
+class EndgameSolver:
+    """Exact expected-shots search over a small set of candidate layouts."""
+
+    def __init__(self, limit: int, search_limit: int):
+        self.limit        = limit          # exact probabilities up to this many layouts
+        self.search_limit = search_limit   # full expected-cost search up to this many
+        self.layouts  = ()        # universe of candidate masks (index = bit in a candidate set)
+        self.weights  = ()
+        self.cells    = {}        # cell bit -> bitset of layouts containing it
+        self.table    = {}        # candidate bitset -> expected misses
+        self.deadline = float("inf")
+        self.nodes    = 0
+        self.last_candidates = 0
+        self.last_exact      = False
+
+    def best_cell(self, board, ship_sizes, sunk, deadline: float):
+        """
+        Same inputs as MonteCarloSearch.best_cell(). Returns (r, c), or None
+        when there are more than `limit` candidate layouts (or enumerating
+        them would overrun the deadline).
+        """
+        self.last_candidates = 0        # nothing from an earlier move survives a bail-out
+        self.last_exact      = False
+        n = len(board)
+        hits, blocked, lengths = encode(board, ship_sizes, sunk)
+        if not lengths:
+            return None
+        found = enumerate_layouts(n, lengths, hits, blocked, self.limit, deadline)
+        if not found:
+            return None
+
+        cand = self._index(found)
+        shot = hits | blocked
+        self.deadline = deadline
+        self.nodes    = 0
+        self.last_candidates = len(found)
+
+        # Unshot cells, likeliest first (the answer above search_limit or on timeout)
+        ranked = self._ranked(cand, shot)
+        if not ranked:
+            return None
+        best_bit, best = ranked[0][0], float("inf")
+        if len(found) > self.search_limit:
+            return divmod(best_bit.bit_length() - 1, n)
+        try:
+            for bit, p in ranked:
+                if p < 1 and 1 - p >= best:
+                    break
+                e = self._after(cand, bit, p, best)
+                if e < best:
+                    best_bit, best = bit, e
+            self.last_exact = True
+        except _Timeout:
+            pass
+        return divmod(best_bit.bit_length() - 1, n)
+
+    # ─── Search ─────────────────────────────────────────────────────────────
+    def _index(self, found) -> int:
+        """Reuse the current universe (and table) if it covers `found`; return the candidate bitset."""
+        pos = {m: i for i, m in enumerate(self.layouts)}
+        if not all(m in pos for m in found):
+            self.layouts = tuple(found)
+            self.weights = tuple(found[m] for m in self.layouts)
+            self.cells   = {}
+            for i, m in enumerate(self.layouts):
+                while m:
+                    low = m & -m
+                    self.cells[low] = self.cells.get(low, 0) | (1 << i)
+                    m ^= low
+            self.table = {}
+            pos = {m: i for i, m in enumerate(self.layouts)}
+        cand = 0
+        for m in found:
+            cand |= 1 << pos[m]
+        return cand
+
+    def _weight(self, cand: int) -> int:
+        w, i = 0, 0
+        weights = self.weights
+        while cand:
+            if cand & 1:
+                w += weights[i]
+            cand >>= 1
+            i += 1
+        return w
+
+    def _ranked(self, cand: int, shot: int) -> list:
+        """[(cell bit, hit probability)] for unshot cells of any candidate, most likely first."""
+        total = self._weight(cand)
+        out = []
+        for bit, holders in self.cells.items():
+            if bit & shot:
+                continue
+            inside = holders & cand
+            if inside:
+                out.append((bit, self._weight(inside) / total))
+        out.sort(key=lambda t: -t[1])
+        return out
+
+    def _after(self, cand, bit, p, bound):
+        """Expected misses if `bit` is fired next (early-outs once above `bound`)."""
+        if p >= 1:
+            # a sure hit carries no information; fired for free at the end anyway
+            return self._misses(cand)
+        e = (1 - p) * (1 + self._misses(cand & ~self.cells[bit]))
+        if e < bound:
+            e += p * self._misses(cand & self.cells[bit])
+        return e
+
+    def _misses(self, cand: int) -> float:
+        """
+        Minimum expected misses before only one candidate is left (its
+        remaining cells are then all hits). Depends on the candidate set alone:
+        every shot cell is either in all of them (a hit) or none (a miss).
+        """
+        if cand & (cand - 1) == 0:
+            return 0.0
+        cached = self.table.get(cand)
+        if cached is not None:
+            return cached
+
+        self.nodes += 1
+        if self.nodes & 15 == 0 and time.perf_counter() > self.deadline:
+            raise _Timeout
+
+        best = float("inf")
+        for bit, p in self._ranked(cand, 0):
+            if p >= 1:
+                continue
+            if 1 - p >= best:
+                break
+            e = self._after(cand, bit, p, best)
+            if e < best:
+                best = e
+        self.table[cand] = best
+        return best
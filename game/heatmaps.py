@@ -0,0 +1,253 @@
+import os
+import json
+import random
+import threading
+
+from core.config import Config
+from game.board_helpers import placement_masks
+
+"""
+Module: heatmaps.py
+Purpose:
+  - Opening priors: for a (grid size, fleet) pair, how likely each cell is to
+    hold a ship before any shot is fired. The answer is the same every game,
+    so it is computed once and cached in memory and on disk
+    (Config.HEATMAP_CACHE_PATH).
+  - Small fleets are counted exactly (every non-overlapping layout); larger
+    ones use Config.HEATMAP_SAMPLES seeded fleets placed largest-first with
+    retry-on-overlap, exactly how the computer's own boards are drawn.
+  - Parity masks: cells with (r + c) % k == offset for the smallest ship k.
+    Every ship crosses each such class, so a search only needs the class with
+    the most prior weight.
+  - Heatmap.opening_order() gives strategies a ready-made search sequence.
+  - get() may take a noticeable fraction of a second on a cold cache, so the
+    game never calls it on the main thread: peek() returns a heatmap only if
+    it is already in memory, request() computes one on a background thread.
+  - invalidate() is called by Config.generate_ships_for_grid() when the fleet
+    changes; the new entry is warmed on a background thread.
+Future Hooks:
+  - Ship the default grid sizes' heatmaps with the game resources.
+"""
+
+CACHE_VERSION = 2   # 2: sampled entries drawn from board_helpers.placement_masks order
+
+_memory  = {}                 # (n, fleet) -> Heatmap
+_pending = set()              # (n, fleet) keys being computed by request()
+_lock    = threading.Lock()   # guards _memory/_pending only; never held while computing
+_disk_lock = threading.Lock() # serialises read-modify-write of the disk cache
+
+
+class Heatmap:
+    """Prior occupancy for one (grid size, fleet), plus its best parity class."""
+
+    def __init__(self, n, fleet, weights, method, samples=0, parity_masks=None, parity=None):
+        self.n       = n
+        self.fleet   = tuple(fleet)
+        self.weights = weights          # n*n floats: P(cell holds a ship)
+        self.method  = method           # "exact" or "sampled"
+        self.samples = samples          # layouts counted
+        if parity_masks is None:
+            k = min(fleet) if fleet else 1
+            parity_masks = [
+                sum(1 << (r * n + c) for r in range(n) for c in range(n) if (r + c) % k == off)
+                for off in range(k)
+            ]
+        self.parity_masks = parity_masks
+        if parity is None:
+            parity = max(range(len(parity_masks)), key=lambda off: self._mass(parity_masks[off]))
+        self.parity = parity
+
+    def _mass(self, mask):
+        return sum(w for i, w in enumerate(self.weights) if mask >> i & 1)
+
+    @property
+    def parity_mask(self) -> int:
+        return self.parity_masks[self.parity]
+
+    def weight(self, r: int, c: int) -> float:
+        return self.weights[r * self.n + c]
+
+    def opening_order(self, rng=random) -> list:
+        """
+        Every (r, c): best-parity cells first, each group by prior weight
+        (highest first) with equal weights shuffled so games differ.
+        """
+        mask = self.parity_mask
+        keyed = [(not mask >> i & 1, -round(w, 6), rng.random(), i)
+                 for i, w in enumerate(self.weights)]
+        keyed.sort()
+        return [divmod(i, self.n) for *_, i in keyed]
+
+    def to_json(self) -> dict:
+        return {"n": self.n, "fleet": list(self.fleet), "weights": self.weights,
+                "method": self.method, "samples": self.samples,
+                "parity": self.parity, "parity_masks": [str(m) for m in self.parity_masks]}
+
+    @classmethod
+    def from_json(cls, d) -> "Heatmap":
+        return cls(d["n"], d["fleet"], d["weights"], d["method"], d.get("samples", 0),
+                   [int(m) for m in d["parity_masks"]], d["parity"])
+
+
+# ─── Computation ─────────────────────────────────────────────────────────────
+def _exact(n, fleet):
+    """Per-cell counts over every non-overlapping layout (None if too many)."""
+    tables = [placement_masks(L, n) for L in sorted(fleet, reverse=True)]
+    total = 1
+    for t in tables:
+        total *= len(t)
+    if total > Config.HEATMAP_EXACT_LIMIT:
+        return None
+
+    counts = [0] * (n * n)
+    layouts = 0
+
+    def extend(depth, occupied):
+        nonlocal layouts
+        if depth == len(tables):
+            layouts += 1
+            mask = occupied
+            while mask:
+                low = mask & -mask
+                counts[low.bit_length() - 1] += 1
+                mask ^= low
+            return
+        for m in tables[depth]:
+            if not m & occupied:
+                extend(depth + 1, occupied | m)
+
+    extend(0, 0)
+    return counts, layouts
+
+
+def _sampled(n, fleet, samples, seed):
+    """Per-cell counts over `samples` fleets drawn like place_ship_randomly()."""
+    rng    = random.Random(seed)
+    tables = [placement_masks(L, n) for L in sorted(fleet, reverse=True)]
+    counts = [0] * (n * n)
+    for _ in range(samples):
+        occupied = 0
+        for table in tables:
+            m = rng.choice(table)
+            while m & occupied:
+                m = rng.choice(table)
+            occupied |= m
+        while occupied:
+            low = occupied & -occupied
+            counts[low.bit_length() - 1] += 1
+            occupied ^= low
+    return counts, samples
+
+
+def compute(n: int, fleet) -> Heatmap:
+    """Build a heatmap from scratch: exact when feasible, sampled otherwise."""
+    fleet = tuple(sorted(fleet, reverse=True))
+    if not fleet:
+        return Heatmap(n, fleet, [0.0] * (n * n), "exact", 0)
+    found = _exact(n, fleet)
+    if found is not None:
+        counts, layouts = found
+        method = "exact"
+    else:
+        counts, layouts = _sampled(n, fleet, Config.HEATMAP_SAMPLES, seed=n * 1000 + sum(fleet))
+        method = "sampled"
+    weights = [c / layouts if layouts else 0.0 for c in counts]
+    return Heatmap(n, fleet, weights, method, layouts)
+
+
+# ─── Disk cache ──────────────────────────────────────────────────────────────
+def _key(n, fleet):
+    return f"{n}:{','.join(map(str, fleet))}"
+
+
+def _load_disk() -> dict:
+    try:
+        with open(Config.HEATMAP_CACHE_PATH) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("entries", {})
+
+
+def _save_disk(hm: Heatmap) -> None:
+    with _disk_lock:
+        _write_disk(hm)
+
+
+def _write_disk(hm: Heatmap) -> None:
+    entries = _load_disk()
+    entries[_key(hm.n, hm.fleet)] = hm.to_json()
+    path = Config.HEATMAP_CACHE_PATH
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print("Heatmap cache write failed:", e)
+
+
+# ─── Lookup ──────────────────────────────────────────────────────────────────
+def get(n: int, fleet) -> Heatmap:
+    """
+    Heatmap for (n, fleet): memory, then disk, then computed (and stored).
+    The load/compute runs outside _lock, so request()/peek() on the main
+    thread never wait for a build; two racing callers may both compute, and
+    the first to publish wins.
+    """
+    fleet = tuple(sorted(fleet, reverse=True))
+    key = (n, fleet)
+    hm = _memory.get(key)
+    if hm is not None:
+        return hm
+
+    with _disk_lock:
+        entry = _load_disk().get(_key(n, fleet))
+    if entry is not None:
+        try:
+            hm = Heatmap.from_json(entry)
+        except (KeyError, TypeError, ValueError):
+            hm = None
+    fresh = hm is None
+    if fresh:
+        hm = compute(n, fleet)
+
+    with _lock:
+        hm = _memory.setdefault(key, hm)
+    if fresh:
+        _save_disk(hm)
+    return hm
+
+
+def peek(n: int, fleet):
+    """Heatmap for (n, fleet) if it is already in memory, else None (never blocks)."""
+    return _memory.get((n, tuple(sorted(fleet, reverse=True))))
+
+
+def request(n: int, fleet) -> None:
+    """Load or compute the heatmap for (n, fleet) on a daemon thread unless ready or underway."""
+    key = (n, tuple(sorted(fleet, reverse=True)))
+    if not key[1]:
+        return
+    with _lock:
+        if key in _memory or key in _pending:
+            return
+        _pending.add(key)
+
+    def build():
+        try:
+            get(*key)
+        finally:
+            with _lock:
+                _pending.discard(key)
+
+    threading.Thread(target=build, daemon=True).start()
+
+
+def invalidate(warm: bool = True) -> None:
+    """The fleet changed: (optionally) prepare the heatmap for the new Config fleet."""
+    if warm and Config.SHIP_SIZES:
+        request(Config.GRID_SIZE, Config.SHIP_SIZES)
@@ -0,0 +1,277 @@
+import os
+import time
+import random
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout, wait
+
+"""
+Module: monte_carlo.py
+Purpose:
+  - Posterior-sampling targeting for the Expert AI.
+  - A constrained sampler builds whole fleet layouts consistent with what the
+    shooter knows: no ship on a MISS, sunk ships fixed in place, every other
+    HIT covered by one of the remaining ships. Ships that must cover a hit are
+    placed first (backtracking over the placements through that hit), the rest
+    are drawn from the placements that still fit, instead of rejecting random fleets.
+  - Sampling is spread over a ProcessPoolExecutor until a per-move deadline;
+    the cell occupied most often across all samples is fired at. A worker
+    that misses the deadline by RESULT_GRACE_S is dropped from that move;
+    until every worker has started, moves are sampled in-process.
+  - One process-wide pool (pool(), prewarm(), shutdown()) with an explicit
+    "spawn" context: workers never fork the multithreaded pygame process.
+    Like every spawned child they re-import the launching script as
+    __mp_main__ (Main.py keeps the game behind its __name__ guard, so
+    nothing runs); the tasks they execute all live in this module.
+  - The game prewarms the pool on the main thread (at start, or when Expert
+    is picked in Settings) so worker processes are not launched mid-game.
+  - Cells are bit positions (r * n + c) so overlap checks are single ANDs.
+  - Stdlib only (this module is the workers' entry point).
+Future Hooks:
+  - Weight samples by ship-adjacency rules when the game forbids touching ships.
+"""
+
+MAX_BACKTRACK  = 200   # dead ends tolerated per sample before starting over
+RESULT_GRACE_S = 0.5   # wait this long past the deadline for a worker's counts
+
+_pool      = None      # process-wide ProcessPoolExecutor (see pool())
+_starting  = []        # one _ready() future per worker of the current pool
+_pool_lock = threading.Lock()
+
+
+def _placements(n: int, length: int, blocked: int) -> list:
+    """Bitmasks of every straight placement of `length` avoiding `blocked` cells."""
+    out = []
+    for r in range(n):
+        for c in range(n):
+            if c + length <= n:
+                m = 0
+                for i in range(length):
+                    m |= 1 << (r * n + c + i)
+                if not m & blocked:
+                    out.append(m)
+            if length > 1 and r + length <= n:
+                m = 0
+                for i in range(length):
+                    m |= 1 << ((r + i) * n + c)
+                if not m & blocked:
+                    out.append(m)
+    return out
+
+
+class _Problem:
+    """Placement tables for one position, shared by every sample drawn from it."""
+
+    def __init__(self, n, lengths, hits, blocked):
+        self.n       = n
+        self.lengths = sorted(lengths, reverse=True)
+        self.hits    = hits
+        self.table   = {L: _placements(n, L, blocked) for L in set(lengths)}
+
+    def sample(self, rng: random.Random) -> int:
+        """Occupancy mask of one consistent fleet, or 0 after too many dead ends."""
+        budget = [MAX_BACKTRACK]
+        return self._extend(rng, 0, list(self.lengths), budget) or 0
+
+    def _extend(self, rng, occupied, remaining, budget):
+        if not remaining:
+            return occupied if not self.hits & ~occupied else None
+        open_hits = self.hits & ~occupied
+        if open_hits:
+            # Cover the lowest uncovered hit with some remaining ship
+            target = open_hits & -open_hits
+            options = [(L, m) for L in set(remaining) for m in self.table[L]
+                       if m & target and not m & occupied]
+        else:
+            # All hits covered: remaining ships go anywhere free
+            L = remaining[0]
+            options = [(L, m) for m in self.table[L] if not m & occupied]
+        rng.shuffle(options)
+        for L, m in options:
+            rest = list(remaining)
+            rest.remove(L)
+            found = self._extend(rng, occupied | m, rest, budget)
+            if found is not None:
+                return found
+            budget[0] -= 1
+            if budget[0] <= 0:
+                return None
+            if not open_hits:
+                # free placements are interchangeable; one retry per level is enough
+                break
+        return None
+
+
+def sample_counts(n, lengths, hits, blocked, deadline, seed, max_samples=None):
+    """
+    Draw samples until time.time() passes `deadline` (or max_samples).
+    Returns (per-cell occupancy counts, samples drawn).
+    """
+    rng     = random.Random(seed)
+    problem = _Problem(n, lengths, hits, blocked)
+    counts  = [0] * (n * n)
+    drawn   = 0
+    while time.time() < deadline and (max_samples is None or drawn < max_samples):
+        mask = problem.sample(rng)
+        if not mask:
+            continue
+        drawn += 1
+        while mask:
+            low = mask & -mask
+            counts[low.bit_length() - 1] += 1
+            mask ^= low
+    return counts, drawn
+
+
+# ─── Worker pool ─────────────────────────────────────────────────────────────
+def _worker_count(workers: int = 0) -> int:
+    return workers or os.cpu_count() or 1
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def pool(workers: int = 0) -> ProcessPoolExecutor:
+    """The shared sampling pool, started (with `workers` processes) on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = _worker_count(workers)
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context("spawn"))
+            # one task per worker, so every process is launched now and
+            # pool_ready() can tell when they have all come up
+            _starting[:] = [executor.submit(_ready) for _ in range(workers)]
+            _pool = executor
+        return _pool
+
+
+def pool_ready() -> bool:
+    """True once the pool exists and all of its workers have started."""
+    return _pool is not None and all(f.done() for f in _starting)
+
+
+def prewarm(workers: int = 0, block: bool = False) -> None:
+    """
+    Start the pool's worker processes now (e.g. at game start) rather than on
+    the first move; block=True waits until every worker is up.
+    """
+    pool(workers)
+    if block:
+        wait(list(_starting))
+
+
+def shutdown() -> None:
+    """Stop the worker processes (game exit); the next pool() call starts new ones."""
+    global _pool
+    with _pool_lock:
+        executor, _pool = _pool, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _discard(executor) -> None:
+    """Forget a broken pool so the next move starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is executor:
+            _pool = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class MonteCarloSearch:
+    """Fans sample_counts() out over the shared process pool."""
+
+    def __init__(self, workers: int = 0):
+        self.workers      = _worker_count(workers)
+        self.last_samples = 0
+        self.last_rate    = 0.0    # samples per second for the last move
+
+    def best_cell(self, board, ship_sizes, sunk, deadline: float):
+        """
+        board:      rows of cell states where only 'hit'/'miss' are meaningful
+                    (see encode()); sunk: tuple of coordinate tuples.
+        deadline:   time.perf_counter() value to have an answer by.
+        Returns (r, c), or None if no consistent layout was found in time.
+        """
+        n = len(board)
+        hits, blocked, lengths = encode(board, ship_sizes, sunk)
+        unknown = ((1 << (n * n)) - 1) & ~hits & ~blocked
+        if not unknown:
+            return None
+
+        # perf_counter deadline -> wall clock for the worker processes
+        remaining = deadline - time.perf_counter()
+        wall_deadline = time.time() + max(0.0, remaining - 0.02)
+        start   = time.perf_counter()
+        results = self._sample_pool(n, lengths, hits, blocked, wall_deadline)
+        if not results:
+            results = [sample_counts(n, lengths, hits, blocked, wall_deadline,
+                                     random.getrandbits(32))]
+
+        counts = [0] * (n * n)
+        drawn  = 0
+        for part, k in results:
+            drawn += k
+            for i, v in enumerate(part):
+                counts[i] += v
+        elapsed = time.perf_counter() - start
+        self.last_samples = drawn
+        self.last_rate    = drawn / elapsed if elapsed > 0 else 0.0
+        if not drawn:
+            return None
+
+        best = max(counts[i] for i in range(n * n) if unknown >> i & 1)
+        ties = [i for i in range(n * n) if unknown >> i & 1 and counts[i] == best]
+        return divmod(random.choice(ties), n)
+
+    def _sample_pool(self, n, lengths, hits, blocked, wall_deadline) -> list:
+        """Per-worker (counts, drawn) from the pool; [] if it is unavailable or still starting."""
+        executor = pool(self.workers)
+        if not pool_ready():
+            return []    # not prewarmed: sample in-process rather than wait for the spawns
+        results = []
+        try:
+            futures = [executor.submit(sample_counts, n, lengths, hits, blocked, wall_deadline,
+                                       random.getrandbits(32))
+                       for _ in range(self.workers)]
+            for f in futures:
+                timeout = max(0.0, wall_deadline - time.time()) + RESULT_GRACE_S
+                try:
+                    results.append(f.result(timeout=timeout))
+                except FutureTimeout:
+                    f.cancel()
+                    print("Monte Carlo worker missed the deadline; using the other workers' samples")
+        except Exception as e:
+            # Broken pool (e.g. a worker was killed): sample in-process instead
+            print("Monte Carlo pool error:", e)
+            _discard(executor)
+        return results
+
+
+def encode(board, ship_sizes, sunk):
+    """
+    Turn a shooter's view into sampler inputs:
+    (unsunk hit mask, blocked mask = misses + sunk cells, lengths still afloat).
+    Cells are compared by name so this works with board_helpers.Cell values.
+    """
+    n = len(board)
+    hits = blocked = 0
+    for r, row in enumerate(board):
+        for c, cell in enumerate(row):
+            name = getattr(cell, "name", cell)
+            if name == "HIT":
+                hits |= 1 << (r * n + c)
+            elif name == "MISS":
+                blocked |= 1 << (r * n + c)
+
+    lengths = list(ship_sizes)
+    for coords in sunk:
+        if len(coords) in lengths:
+            lengths.remove(len(coords))
+        for r, c in coords:
+            bit = 1 << (r * n + c)
+            hits &= ~bit
+            blocked |= bit
+    return hits, blocked, lengths
@@ -0,0 +1,155 @@
+import pygame
+from core.config import Config
+from game.board_helpers import Cell
+from game.draggable_ship import DraggableShip
+
+"""
+Module: board_layers.py
+Purpose:
+  - Cached layers for drawing boards without re-issuing hundreds of primitives per frame.
+  - StaticLayer: panels + grid lines for a screen layout, rendered once per layout.
+  - CellLayer: transparent per-board marker surface; only cells whose value changed
+    since the last frame are repainted.
+  - ship_sprite(): scaled/rotated hull images cached per (length, orientation, cell size).
+Future Hooks:
+  - Dirty-rect tracking so the final canvas upload only covers changed regions.
+"""
+
+_grid_lines = {}   # (grid_size, cell_size) -> Surface
+_sprites    = {}   # (length, horizontal, cell_size, base cell size) -> Surface
+
+
+def grid_lines(grid_size: int, cell_size: int) -> pygame.Surface:
+    """Transparent surface with the white outline of every cell (as draw_grid drew it)."""
+    key = (grid_size, cell_size)
+    surf = _grid_lines.get(key)
+    if surf is None:
+        px = grid_size * cell_size
+        surf = pygame.Surface((px, px), pygame.SRCALPHA)
+        for row in range(grid_size):
+            for col in range(grid_size):
+                rect = pygame.Rect(col * cell_size, row * cell_size, cell_size, cell_size)
+                pygame.draw.rect(surf, Config.WHITE, rect, 1)
+        _grid_lines[key] = surf
+    return surf
+
+
+def ship_sprite(size: int, horiz: bool, cell_size: int, base_cell: int = None) -> pygame.Surface:
+    """
+    Hull image for a ship of `size` cells, scaled to `cell_size` cells from
+    the placement sprite at `base_cell` (the round's layout.cell_size).
+    """
+    base_cell = cell_size if base_cell is None else base_cell
+    key = (size, horiz, cell_size, base_cell)
+    img = _sprites.get(key)
+    if img is None:
+        ship = DraggableShip(size, 0, 0, cell_size=base_cell)
+        if not horiz:
+            ship.rotate()
+        w = size * cell_size if horiz else cell_size
+        h = cell_size        if horiz else size * cell_size
+        img = pygame.transform.smoothscale(ship.image, (w, h))
+        _sprites[key] = img
+    return img
+
+
+def clear_layer_caches():
+    """Drop cached grid-line and sprite surfaces (e.g. after pygame re-init)."""
+    _grid_lines.clear()
+    _sprites.clear()
+
+
+def paint_marker(surface, rect, cell, show_ships=False):
+    """draw_grid's per-cell marker: X for HIT, dot for MISS, block for visible SHIP."""
+    if cell == Cell.HIT:
+        # draw_grid outlined each cell right before its marker, so the outlines
+        # of the cells after it covered the X where it overhangs right/bottom
+        clip = surface.get_clip()
+        surface.set_clip(pygame.Rect(rect.x - 1, rect.y - 1, rect.w + 1, rect.h + 1).clip(clip))
+        pygame.draw.line(surface, Config.RED, rect.topleft, rect.bottomright, 2)
+        pygame.draw.line(surface, Config.RED, rect.topright, rect.bottomleft, 2)
+        surface.set_clip(clip)
+    elif cell == Cell.MISS:
+        pygame.draw.circle(surface, Config.BLUE, rect.center, rect.w // 6)
+    elif cell == Cell.SHIP and show_ships:
+        pygame.draw.rect(surface, Config.BLUE, rect.inflate(-4, -4))
+
+
+def paint_hit_x(surface, rect, cell):
+    """draw_x() for HIT cells only (drawn above the ship sprites)."""
+    if cell == Cell.HIT:
+        half = rect.w // 2
+        x, y = rect.center
+        pygame.draw.line(surface, Config.RED, (x - half, y - half), (x + half, y + half), 2)
+        pygame.draw.line(surface, Config.RED, (x + half, y - half), (x - half, y + half), 2)
+
+
+class StaticLayer:
+    """One canvas-sized transparent surface rebuilt only when its layout key changes."""
+
+    def __init__(self):
+        self.key     = None
+        self.surface = None
+
+    def get(self, key, paint) -> pygame.Surface:
+        """Return the cached surface for `key`, calling paint(surface) on a miss."""
+        if key != self.key or self.surface is None:
+            self.surface = pygame.Surface((Config.WIDTH, Config.HEIGHT), pygame.SRCALPHA)
+            paint(self.surface)
+            self.key = key
+        return self.surface
+
+    def invalidate(self):
+        self.key = None
+
+    def release(self):
+        """Free the surface (the next get() repaints)."""
+        self.key     = None
+        self.surface = None
+
+
+class CellLayer:
+    """
+    Marker surface for one board. sync() compares each row with the copy taken
+    last frame and repaints only the cells that differ.
+    """
+
+    def __init__(self, paint):
+        self.paint     = paint     # paint(surface, rect, cell)
+        self.surface   = None
+        self._seen     = None
+        self._board    = None
+        self._cs       = None
+
+    def sync(self, board, cell_size: int) -> pygame.Surface:
+        n = len(board)
+        pad = 2    # markers may overhang the last row/column by a pixel
+        if board is not self._board or cell_size != self._cs or len(self._seen) != n:
+            # New board object (reset / pass-and-play swap) or new geometry: full repaint
+            self.surface = pygame.Surface((n * cell_size + pad, n * cell_size + pad), pygame.SRCALPHA)
+            self._seen   = [[None] * n for _ in range(n)]
+            self._board  = board
+            self._cs     = cell_size
+
+        seen, surf = self._seen, self.surface
+        for r, row in enumerate(board):
+            prev = seen[r]
+            if row == prev:
+                continue
+            for c, cell in enumerate(row):
+                if cell is not prev[c]:
+                    rect = pygame.Rect(c * cell_size, r * cell_size, cell_size, cell_size)
+                    if prev[c] is not None and prev[c] is not Cell.EMPTY:
+                        surf.fill((0, 0, 0, 0), rect)
+                    self.paint(surf, rect, cell)
+            seen[r] = row[:]
+        return surf
+
+    def invalidate(self):
+        self._board = None
+
+    def release(self):
+        """Free the surface and row snapshots (the next sync() repaints)."""
+        self.surface = None
+        self._seen   = None
+        self._board  = None
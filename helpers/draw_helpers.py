@@ -2,17 +2,20 @@ import sys
 import pygame
 from core.config import Config
 from game.board_helpers import Cell
+from helpers.fonts import get_font, clear_fonts
+from helpers.widgets import button_layer
+from helpers.board_layers import grid_lines, paint_marker, clear_layer_caches
+from game.effects import clear_fade_cache
 
 """
 Module: draw_helpers.py
 Purpose:
   - Shared rendering functions: top bar, buttons, grid, text, modals, audio toggle.
+  - Buttons are backed by the retained ButtonLayer (helpers/widgets.py);
+    clicks arrive through button_layer.handle_event() from the main loop.
 Future Hooks:
   - Overlay remote turn indicator via state.network.
 """
-# button_states: track per-button click state to debounce
-button_states = {}
-
 def draw_top_bar(screen, state):
     """Draw restart, close, and music toggle buttons."""
     # Render icons in fixed positions; check for clicks
@@ -53,109 +56,113 @@ def toggle_audio(state):
     pygame.mixer.music.set_volume(0.2 if state.audio_enabled else 0)
 
 def draw_button(screen, text, x, y, w, h, color, hover_color, action=None, border=0):
-    """Draw a button and handle hover/click callbacks."""
-    # 1) get real window mouse pos
-    mouse_win = pygame.mouse.get_pos()
-    win_w, win_h = pygame.display.get_surface().get_size()
-    # 2) compute canvas‐to‐window scale
-    sx = Config.WIDTH  / win_w
-    sy = Config.HEIGHT / win_h
-    # 3) remap into canvas coordinates
-    mouse = (mouse_win[0] * sx, mouse_win[1] * sy)
-
-    click = pygame.mouse.get_pressed()
-    rect = pygame.Rect(x, y, w, h)
-    pygame.draw.rect(screen, hover_color if rect.collidepoint(mouse) else color, rect)
-    if border>0:
-        pygame.draw.rect(screen, Config.BLACK, rect, border)
-
-    font = pygame.font.SysFont(None, 30)
-    text_surf = font.render(text, True, Config.WHITE)
-    text_rect = text_surf.get_rect(center=rect.center)
-    screen.blit(text_surf, text_rect)
-
-    key = f"{text}-{x}-{y}"
-    if key not in button_states:
-        button_states[key] = False
-
-    if rect.collidepoint(mouse):
-        if click[0] == 1 and not button_states[key]:
-            button_states[key] = True
-        
-        elif click[0] == 0:
-            if button_states.get(key, False):
-                button_states[key] = False
-                if action:
-                    action()
-    else:
-        button_states[key] = False
-
-def _cell_color(cell: Cell, show_ships: bool):
-    if cell == Cell.HIT:
-        return Config.RED
-    elif cell == Cell.MISS:
-        return Config.BLUE
-    elif cell == Cell.SHIP and show_ships:
-        return Config.BLUE
-    return None
+    """Draw a button; its action fires on click via button_layer.handle_event()."""
+    button_layer.button(screen, text, x, y, w, h, color, hover_color, action, border)
+
+def reset_ui_caches():
+    """Drop fonts and retained buttons (call right after pygame.init())."""
+    clear_fonts()
+    clear_layer_caches()
+    clear_fade_cache()
+    button_layer.clear()
+    release_modal_backdrop()
 
 def draw_grid(screen, board, offset_x, offset_y, show_ships=False, cell_size=None):
     """Render grid lines and cell states (hits, misses, optional ships)."""
-    size = cell_size or Config.CELL_SIZE
-
-    for row in range(Config.GRID_SIZE):
-        for col in range(Config.GRID_SIZE):
-            x = offset_x + col * size
-            y = offset_y + row * size
-            rect = pygame.Rect(x, y, size, size)
-            pygame.draw.rect(screen, Config.WHITE, rect, 1)
+    size = Config.CELL_SIZE if cell_size is None else cell_size
+    n = len(board)
 
+    # One blit for all cell outlines, then markers for non-empty cells only
+    screen.blit(grid_lines(n, size), (offset_x, offset_y))
+    for row in range(n):
+        for col in range(n):
             cell = board[row][col]
-            color = _cell_color(cell, show_ships)
-            if color:
-                if cell == Cell.MISS:
-                    pygame.draw.circle(screen, color, rect.center, size // 6)
-                elif cell == Cell.HIT:
-                    pygame.draw.line(screen, color, rect.topleft, rect.bottomright, 2)
-                    pygame.draw.line(screen, color, rect.topright, rect.bottomleft, 2)
-                else:
-                    pygame.draw.rect(screen, color, rect.inflate(-4, -4))
+            if cell is not Cell.EMPTY:
+                rect = pygame.Rect(offset_x + col * size, offset_y + row * size, size, size)
+                paint_marker(screen, rect, cell, show_ships)
 
 def draw_text_center(screen, text, x, y, font_size=30,bg_color=None):
     """Center and draw text within a rect."""
-    font = pygame.font.SysFont(None, font_size)
+    font = get_font(font_size)
     surface = font.render(text, True, Config.WHITE,bg_color)
     rect = surface.get_rect(center=(x, y))
     screen.blit(surface, rect)
 
-def draw_modal(screen, title, subtitle, on_yes, on_no):
-    """Overlay a modal dialog with yes/no options."""
-    bg = screen.copy()
-    w, h = bg.get_size()
-    # 2) Downscale and upscale to approximate Gaussian blur
-    small = pygame.transform.smoothscale(bg, (w//10, h//10))
-    blurred = pygame.transform.smoothscale(small, (w, h))
-    screen.blit(blurred, (0, 0))
-
-    # 3) Darken slightly so modal text remains legible
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
+# ─── Modal caches: built when a modal opens, dropped when it closes ──────────
+_modal_backdrop = None    # blurred + darkened snapshot of the scene behind
+_modal_boxes    = {}      # (title, subtitle) -> pre-rendered dialog box
+_modal_blitted  = False   # backdrop already drawn this frame (stacked modals)
 
+def _modal_box_rect():
     box_w, box_h = 400, 180
-    box_rect = pygame.Rect((Config.WIDTH - box_w)//2, (Config.HEIGHT - box_h)//2, box_w, box_h)
-    pygame.draw.rect(screen, Config.DARK_GRAY, box_rect)
-    pygame.draw.rect(screen, Config.WHITE, box_rect, 2)
+    return pygame.Rect((Config.WIDTH - box_w)//2, (Config.HEIGHT - box_h)//2, box_w, box_h)
+
+def modal_backdrop_ready():
+    """True while a modal is open and its backdrop has been captured."""
+    return _modal_backdrop is not None
 
-    draw_text_center(screen, title, box_rect.centerx, box_rect.y + 40, 36)
-    draw_text_center(screen, subtitle, box_rect.centerx, box_rect.y + 80, 24)
+def release_modal_backdrop():
+    """Forget the cached backdrop/boxes (call once no modal is open)."""
+    global _modal_backdrop
+    _modal_backdrop = None
+    _modal_boxes.clear()
 
+def draw_modal_backdrop(screen, blur=True):
+    """
+    Blit the modal backdrop. The first call after a modal opens snapshots the
+    current screen (optionally blurred) and darkens it; later frames reuse it.
+    """
+    global _modal_backdrop, _modal_blitted
+    if _modal_backdrop is None:
+        bg = screen.copy()
+        w, h = bg.get_size()
+        if blur:
+            # Downscale and upscale to approximate Gaussian blur
+            small = pygame.transform.smoothscale(bg, (w//10, h//10))
+            bg = pygame.transform.smoothscale(small, (w, h))
+        # Darken slightly so modal text remains legible
+        overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        bg.blit(overlay, (0, 0))
+        _modal_backdrop = bg
+    if not _modal_blitted:
+        screen.blit(_modal_backdrop, (0, 0))
+        _modal_blitted = True
+
+def draw_modal_box(screen, title, subtitle):
+    """Blit the dialog box with its title/subtitle (rendered once per text)."""
+    box_rect = _modal_box_rect()
+    key = (title, subtitle)
+    box = _modal_boxes.get(key)
+    if box is None:
+        box = pygame.Surface(box_rect.size)
+        box.fill(Config.DARK_GRAY)
+        pygame.draw.rect(box, Config.WHITE, box.get_rect(), 2)
+        draw_text_center(box, title, box_rect.w // 2, 40, 36)
+        draw_text_center(box, subtitle, box_rect.w // 2, 80, 24)
+        _modal_boxes[key] = box
+    screen.blit(box, box_rect)
+    return box_rect
+
+def draw_modal(screen, title, subtitle, on_yes, on_no):
+    """Overlay a modal dialog with yes/no options."""
+    draw_modal_backdrop(screen)
+    box_rect = draw_modal_box(screen, title, subtitle)
+
+    # Only the modal's own buttons take clicks while it is open
+    button_layer.block_below()
     draw_button(screen, "Yes", box_rect.x + 60, box_rect.y + 120, 100, 40, Config.GREEN, Config.DARK_GREEN, on_yes,3)
     draw_button(screen, "No", box_rect.right - 160, box_rect.y + 120, 100, 40, Config.RED, Config.DARK_GRAY, on_no,3)
 
+def end_ui_frame():
+    """Per-frame bookkeeping once everything has been drawn into the canvas."""
+    global _modal_blitted
+    _modal_blitted = False
+    button_layer.end_frame()
+
 def draw_text_input_box(screen, user_text):
     """Draw an editable text input box."""
-    font       = pygame.font.SysFont(None, 36)
+    font       = get_font(36)
     # (prompt is now drawn by the caller, e.g. "Enter size (5-20):")
     input_box  = pygame.Rect(Config.WIDTH // 2 - 150, Config.HEIGHT // 2, 300, 40)
     pygame.draw.rect(screen, Config.WHITE, input_box, 2)
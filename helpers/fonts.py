@@ -0,0 +1,25 @@
+import pygame
+
+"""
+Module: fonts.py
+Purpose:
+  - Process-wide cache of pygame Font objects keyed by (size, bold).
+  - pygame.font.SysFont scans and loads a font file; doing it per draw call is costly.
+Future Hooks:
+  - Load a bundled theme font instead of the system default.
+"""
+
+_fonts = {}
+
+def get_font(size: int, bold: bool = False) -> pygame.font.Font:
+    """Return a cached SysFont(None, size, bold)."""
+    key = (size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(None, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+def clear_fonts():
+    """Forget cached fonts (they die with pygame.quit(); call after re-init)."""
+    _fonts.clear()
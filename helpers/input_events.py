@@ -0,0 +1,61 @@
+import pygame
+from core.config import Config
+
+"""
+Module: input_events.py
+Purpose:
+  - Per-frame input pipeline between pygame.event.get() and the scene handlers.
+  - install_event_filter(): only event types some screen listens to reach the
+    queue (pygame.event.set_allowed); key-ups, text input, wheel, joystick,
+    touch and audio-device events are dropped by SDL.
+  - frame_events(): consecutive MOUSEMOTION events collapse into the latest
+    one (rel summed), then pointer positions are mapped window -> canvas once.
+    A drag therefore costs one update per frame whatever the mouse polling
+    rate, while clicks keep their order relative to motion.
+  - mouse_pos(): last canvas-space pointer position, for code outside the
+    event loop (e.g. re-anchoring a dragged ship after rotation).
+Future Hooks:
+  - Allow KEYUP / MOUSEWHEEL once a screen needs them.
+"""
+
+POINTER_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+ALLOWED_EVENTS = [
+    pygame.QUIT, pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT,
+    pygame.KEYDOWN, *POINTER_EVENTS,
+    Config.AI_MOVE_EVENT,
+    # window notifications: rare, and SDL derives VIDEORESIZE / QUIT from them
+    *(getattr(pygame, name) for name in dir(pygame) if name.startswith("WINDOW")),
+]
+
+_mouse_pos = (0, 0)
+
+
+def install_event_filter() -> None:
+    """Block every event type, then re-allow ALLOWED_EVENTS (call after pygame.init)."""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(ALLOWED_EVENTS)
+
+
+def frame_events(raw_events, scale_x: float, scale_y: float) -> list:
+    """Coalesce runs of MOUSEMOTION and remap pointer positions into canvas space."""
+    global _mouse_pos
+    events = []
+    for ev in raw_events:
+        if ev.type == pygame.MOUSEMOTION and events and events[-1].type == pygame.MOUSEMOTION:
+            prev = events[-1]
+            ev.rel = (prev.rel[0] + ev.rel[0], prev.rel[1] + ev.rel[1])
+            events[-1] = ev
+        else:
+            events.append(ev)
+
+    for ev in events:
+        if ev.type in POINTER_EVENTS:
+            mx, my = ev.pos
+            ev.pos = _mouse_pos = (int(mx * scale_x), int(my * scale_y))
+    return events
+
+
+def mouse_pos() -> tuple:
+    """Canvas-space pointer position from the latest frame_events() call."""
+    return _mouse_pos
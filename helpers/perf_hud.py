@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import time
+from collections import deque
+
+import pygame
+from core.config import Config
+from helpers.fonts import get_font
+
+try:
+    import psutil    # optional: accurate cross-platform RSS
+except ImportError:
+    psutil = None
+
+"""
+Module: perf_hud.py
+Purpose:
+  - FrameProfiler: per-scene frame timings split into the main-loop phases
+    (turn logic, event dispatch, scene draw, modals, smoothscale/flip).
+  - Rolling p50/p95/p99 frame times, net allocated blocks per frame, and RSS.
+    "allocs" is the change in sys.getallocatedblocks() across the frame: blocks
+    allocated minus blocks freed, not an allocation count (a frame that churns
+    many short-lived objects can show 0).
+  - Toggleable overlay (F3) and a JSONL recorder (F4, or BATTLESHIP_PROFILE=1)
+    for comparing builds on the same machine. Frames are streamed to the log
+    as they end, so a long recording holds no history in memory.
+Future Hooks:
+  - Per-scene budget alerts (flash the HUD when p95 exceeds 1000/FPS ms).
+"""
+
+SECTIONS = ("turn", "events", "draw", "modals", "present")
+
+
+def _rss_kb():
+    """Current resident set size in KiB, or None when unavailable."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss // 1024
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _build_label():
+    """Identify the build: $BATTLESHIP_BUILD, else the checked-out git commit."""
+    label = os.environ.get("BATTLESHIP_BUILD")
+    if label:
+        return label
+    try:
+        with open(os.path.join(".git", "HEAD")) as f:
+            head = f.read().strip()
+        if head.startswith("ref: "):
+            with open(os.path.join(".git", head[5:])) as f:
+                return f.read().strip()[:12]
+        return head[:12]
+    except OSError:
+        return "unknown"
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class _SceneStats:
+    __slots__ = ("frames", "sections", "allocs")
+
+    def __init__(self, window):
+        self.frames   = deque(maxlen=window)
+        self.sections = {name: deque(maxlen=window) for name in SECTIONS}
+        self.allocs   = deque(maxlen=window)
+
+
+class FrameProfiler:
+    def __init__(self, window: int = None):
+        self.window    = window or Config.PERF_WINDOW
+        self.visible   = Config.PERF_HUD_ENABLED
+        self.recording = False
+        self.scenes    = {}          # scene name -> _SceneStats
+        self.rss_kb    = _rss_kb()
+        self.frame_no  = 0
+        self._log      = None        # open JSONL file while recording
+        self._build    = None
+        self._hud      = None        # cached overlay surface
+        self.info      = None        # () -> extra HUD line (str) or None, set by Main
+        self._scene    = None
+        self._cur      = None
+        self._last     = 0.0
+        self._blocks   = 0
+        if os.environ.get("BATTLESHIP_PROFILE"):
+            self.start_recording()
+
+    # ─── Per-frame measurement ──────────────────────────────────────────────
+    def begin_frame(self, scene: str):
+        self._scene  = scene
+        self._cur    = dict.fromkeys(SECTIONS, 0.0)
+        self._blocks = sys.getallocatedblocks()
+        self._last   = time.perf_counter()
+
+    def mark(self, section: str):
+        """Charge the time since the previous mark to `section`."""
+        now = time.perf_counter()
+        self._cur[section] += (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        if self._cur is None:
+            return
+        stats = self.scenes.get(self._scene)
+        if stats is None:
+            stats = self.scenes[self._scene] = _SceneStats(self.window)
+        total  = sum(self._cur.values())
+        allocs = sys.getallocatedblocks() - self._blocks   # net blocks, see module docstring
+        stats.frames.append(total)
+        stats.allocs.append(allocs)
+        for name, ms in self._cur.items():
+            stats.sections[name].append(ms)
+
+        self.frame_no += 1
+        if self.frame_no % Config.PERF_HUD_REFRESH == 0:
+            self.rss_kb = _rss_kb()
+            self._hud = None
+
+        if self.recording:
+            rec = {"type": "frame", "scene": self._scene, "frame_ms": round(total, 3),
+                   "allocs": allocs, "rss_kb": self.rss_kb}
+            rec.update({k: round(v, 3) for k, v in self._cur.items()})
+            rec["build"] = self._build
+            self._log.write(json.dumps(rec) + "\n")
+        self._cur = None
+
+    def summary(self, scene: str) -> dict:
+        """Percentiles and section means over the rolling window of one scene."""
+        stats = self.scenes.get(scene)
+        if stats is None or not stats.frames:
+            return {}
+        ordered = sorted(stats.frames)
+        n = len(ordered)
+        return {
+            "scene":  scene,
+            "frames": n,
+            "p50":    round(percentile(ordered, 50), 3),
+            "p95":    round(percentile(ordered, 95), 3),
+            "p99":    round(percentile(ordered, 99), 3),
+            "max":    round(ordered[-1], 3),
+            "sections": {k: round(sum(v) / len(v), 3) for k, v in stats.sections.items() if v},
+            "allocs": round(sum(stats.allocs) / len(stats.allocs), 1),
+            "rss_kb": self.rss_kb,
+        }
+
+    # ─── Recorder ───────────────────────────────────────────────────────────
+    def start_recording(self, path: str = None):
+        """Open the JSONL log (appending); every frame until stop_recording() goes to it."""
+        if self.recording:
+            return
+        try:
+            self._log = open(path or Config.PERF_LOG_PATH, "a", encoding="utf-8")
+        except OSError as e:
+            print("Perf log unavailable:", e)
+            return
+        self._build    = _build_label()
+        self.recording = True
+
+    def stop_recording(self):
+        """Append per-scene summaries, close the log and return its path."""
+        if not self.recording:
+            return None
+        self.recording = False
+        stamp = time.time()
+        with self._log as f:
+            for scene in self.scenes:
+                summ = self.summary(scene)
+                summ.update(type="summary", build=self._build, time=stamp)
+                f.write(json.dumps(summ) + "\n")
+        path, self._log = self._log.name, None
+        return path
+
+    # ─── Overlay ────────────────────────────────────────────────────────────
+    def handle_event(self, event) -> bool:
+        """F3 toggles the HUD, F4 starts/stops recording. Returns True if consumed."""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F3:
+            self.visible = not self.visible
+            self._hud = None
+            return True
+        if event.key == pygame.K_F4:
+            if self.recording:
+                print("Perf log written to", self.stop_recording())
+            else:
+                self.start_recording()
+            self._hud = None
+            return True
+        return False
+
+    def draw(self, screen, fps: float = 0.0):
+        """Blit the overlay (re-rendered every PERF_HUD_REFRESH frames)."""
+        if not self.visible:
+            return
+        if self._hud is None:
+            self._hud = self._render(fps)
+        screen.blit(self._hud, (8, Config.TOP_BAR_HEIGHT + 8))
+
+    def _render(self, fps):
+        summ = self.summary(self._scene) if self._scene else {}
+        lines = [f"{self._scene or '-'}  {fps:.0f} fps" + ("  REC" if self.recording else "")]
+        if summ:
+            lines.append(f"frame p50 {summ['p50']:.2f}  p95 {summ['p95']:.2f}  p99 {summ['p99']:.2f} ms")
+            lines.append("  ".join(f"{k} {v:.2f}" for k, v in summ["sections"].items()))
+            rss = f"{summ['rss_kb'] // 1024} MB" if summ["rss_kb"] else "n/a"
+            lines.append(f"net blocks/frame {summ['allocs']:.0f}   rss {rss}")
+        extra = self.info() if self.info else None
+        if extra:
+            lines.append(extra)
+
+        font = get_font(20)
+        rendered = [font.render(line, True, Config.WHITE) for line in lines]
+        w = max(s.get_width() for s in rendered) + 12
+        h = sum(s.get_height() for s in rendered) + 10
+        surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 170))
+        y = 5
+        for s in rendered:
+            surf.blit(s, (6, y))
+            y += s.get_height()
+        return surf
@@ -0,0 +1,143 @@
+import pygame
+from core.config import Config
+from helpers.fonts import get_font
+
+"""
+Module: widgets.py
+Purpose:
+  - Retained-mode button layer behind draw_button().
+  - Each distinct button is laid out and rendered once (normal + hover surfaces);
+    drawing it afterwards is a single blit.
+  - Hit testing goes through a coarse spatial hash of the buttons shown last frame.
+  - Hover and clicks are driven by (canvas-space) mouse events, not by polling.
+Future Hooks:
+  - Keyboard focus / tab navigation between buttons.
+  - Toggle and slider widgets sharing the same index.
+"""
+
+_BUCKET = 64   # spatial hash cell size in canvas pixels
+
+
+class Button:
+    __slots__ = ("key", "rect", "action", "normal", "hover", "pos", "seq")
+
+    def __init__(self, key, text, rect, color, hover_color, border):
+        self.key    = key
+        self.rect   = rect
+        self.action = None
+        self.seq    = 0
+        text_surf   = get_font(30).render(text, True, Config.WHITE)
+        text_rect   = text_surf.get_rect(center=rect.center)
+        # Long labels may overhang the button; the surface covers both
+        bounds      = rect.union(text_rect)
+        self.pos    = bounds.topleft
+        self.normal = self._render(bounds, text_surf, text_rect, color, border)
+        self.hover  = self._render(bounds, text_surf, text_rect, hover_color, border)
+
+    def _render(self, bounds, text_surf, text_rect, fill, border):
+        opaque = bounds == self.rect
+        surf = pygame.Surface(bounds.size, 0 if opaque else pygame.SRCALPHA)
+        local = self.rect.move(-bounds.x, -bounds.y)
+        surf.fill(fill, local)
+        if border > 0:
+            pygame.draw.rect(surf, Config.BLACK, local, border)
+        surf.blit(text_surf, text_rect.move(-bounds.x, -bounds.y))
+        return surf
+
+
+class ButtonLayer:
+    """
+    Buttons are (re)declared every frame via button(); the layer keeps only those
+    declared in the most recent frame, so its size is bounded by what is on screen.
+    """
+
+    def __init__(self):
+        self._buttons      = {}     # key -> Button, retained between frames
+        self._drawn        = []     # buttons declared this frame, in z-order
+        self._shown        = []     # buttons declared last frame (hit-testable)
+        self._index        = {}     # (bx, by) -> [Button] for self._shown
+        self._floor        = 0      # buttons below this seq are covered by a modal
+        self._floor_next   = 0
+        self._hover        = None
+        self._pressed      = None
+        self.mouse_pos     = None   # last known canvas-space mouse position
+
+    # ─── Drawing ────────────────────────────────────────────────────────────
+    def button(self, screen, text, x, y, w, h, color, hover_color, action=None, border=0):
+        key = (text, x, y, w, h, color, hover_color, border)
+        btn = self._buttons.get(key)
+        if btn is None:
+            btn = Button(key, text, pygame.Rect(x, y, w, h), color, hover_color, border)
+            self._buttons[key] = btn
+        btn.action = action
+        btn.seq    = len(self._drawn)
+        self._drawn.append(btn)
+        screen.blit(btn.hover if btn is self._hover else btn.normal, btn.pos)
+        return btn
+
+    def block_below(self):
+        """Called by modals: buttons declared so far this frame stop receiving input."""
+        self._floor_next = len(self._drawn)
+
+    def end_frame(self):
+        """Commit this frame's buttons as the hit-testable set."""
+        drawn = self._drawn
+        if [b.key for b in drawn] != [b.key for b in self._shown]:
+            self._buttons = {b.key: b for b in drawn}
+            self._index = {}
+            for b in drawn:
+                for bx in range(b.rect.left // _BUCKET, (b.rect.right - 1) // _BUCKET + 1):
+                    for by in range(b.rect.top // _BUCKET, (b.rect.bottom - 1) // _BUCKET + 1):
+                        self._index.setdefault((bx, by), []).append(b)
+        self._shown      = drawn
+        self._drawn      = []
+        self._floor      = self._floor_next
+        self._floor_next = 0
+        self._hover      = self.hit(self.mouse_pos)
+
+    def clear(self):
+        """Forget every button (e.g. after pygame re-init)."""
+        self.__init__()
+
+    # ─── Input ──────────────────────────────────────────────────────────────
+    def hit(self, pos):
+        """Topmost input-enabled button under pos, or None."""
+        if pos is None:
+            return None
+        x, y = pos
+        best = None
+        for b in self._index.get((int(x) // _BUCKET, int(y) // _BUCKET), ()):
+            if b.seq >= self._floor and b.rect.collidepoint(x, y):
+                if best is None or b.seq > best.seq:
+                    best = b
+        return best
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        Feed one canvas-space event. Fires a button's action on left-button
+        release over the same button it was pressed on. Returns True if a
+        button was hit.
+        """
+        if event.type == pygame.MOUSEMOTION:
+            self.mouse_pos = event.pos
+            self._hover = self.hit(event.pos)
+            return self._hover is not None
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.mouse_pos = event.pos
+            self._pressed = self.hit(event.pos)
+            return self._pressed is not None
+
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.mouse_pos = event.pos
+            target = self.hit(event.pos)
+            pressed, self._pressed = self._pressed, None
+            if target is not None and target is pressed and target.action:
+                target.action()
+            return target is not None
+
+        return False
+
+
+# The layer shared by every screen (one window, one canvas)
+button_layer = ButtonLayer()
@@ -53,6 +53,20 @@ class Network:
             self.port = port
             threading.Thread(target=self._listen, daemon=True).start()
 
+    @classmethod
+    def from_socket(cls, conn: socket.socket) -> "Network":
+        """
+        Wrap an already-connected socket (e.g. one end of socket.socketpair()).
+        Used by benchmarks to exercise the framing without a real host/client.
+        """
+        net = cls.__new__(cls)
+        net.queue = Queue()
+        net.sock  = conn
+        net.conn  = conn
+        net.port  = None
+        threading.Thread(target=net._listen, daemon=True).start()
+        return net
+
     def _accept_client(self):
         """
         Accept a client connection, then start listening thread.
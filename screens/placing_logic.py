@@ -2,7 +2,9 @@
 
 import pygame
 from game.draggable_ship import DraggableShip
-from game.board_helpers import Cell, get_grid_pos, create_board
+from game.board_helpers import (
+    Cell, get_grid_pos, create_board, place_fleet, legal_placements, occupancy_mask
+)
 from core.config import Config
 from helpers.draw_helpers import draw_top_bar
 
@@ -11,7 +13,18 @@ Module: placing_logic.py
 Purpose:
   - Pygame logic for the ship placement screen.
   - Manages drag-and-drop, rotation, undo, and ready actions.
+  - Randomize / Auto-place: whole or remaining fleet placed in one go with
+    board_helpers.place_fleet (same occupancy-mask sampler as the computer's).
+    If the remaining ships cannot fit around the ones already down, `notice`
+    tells the player (shown by PlacingRender) instead of failing silently.
+  - Board-changing actions are ignored once READY was sent (waiting_for_sync).
   - Validates placements against grid rules and communicates readiness over network.
+  - Legality is a bitmap of valid top-left cells per (ship length, orientation),
+    rebuilt only after the board changes, so drop checks and the live drag
+    preview are a single bit test.
+  - Geometry comes from the round's state.layout (grid origin, cell size);
+    a new round (e.g. after a grid-size change) resets placement through
+    GameState's reset callback.
 Future Hooks:
   - Implement retry and acknowledgment logic for placement messages.
   - Display remote opponent's ship placements in ghost mode.
@@ -26,16 +39,26 @@ class PlacingLogic:
         self.ship_queue   = []
         self.placed_ships = []
         self.ready_to_start = False  # <-- NEW FLAG
+        self.notice       = None     # message for the player (e.g. auto-place failed)
         self.setup_ships()
-        self.grid_offset_x = Config.BOARD_OFFSET_X + 34
-        self.grid_offset_y = Config.BOARD_OFFSET_Y + 31
         self.pass_play_placed_ships = [None, None]
+        self._legal       = {}     # (size, orientation) -> bitmask of legal top-left cells
+        self._legal_board = None   # board the bitmaps were built for
+
+    @property
+    def grid_offset_x(self) -> int:
+        return self.state.layout.grid_origin[0]
+
+    @property
+    def grid_offset_y(self) -> int:
+        return self.state.layout.grid_origin[1]
 
     def setup_ships(self):
-        """Create DraggableShip instances from Config.SHIP_SIZES."""
+        """Create DraggableShip instances for this round's fleet (state.rules)."""
         self.ship_queue = [
-            DraggableShip(size, *self.main_area_position())
-            for size in Config.SHIP_SIZES
+            DraggableShip(size, *self.main_area_position(),
+                          cell_size=self.state.layout.cell_size)
+            for size in self.state.rules.ship_sizes
         ]
         self.update_active_and_preview()  
 
@@ -62,7 +85,9 @@ class PlacingLogic:
         """Validate and commit current ship to placing_board if legal."""
         row, col = get_grid_pos(
             (ship.rect.centerx, ship.rect.centery),
-            self.grid_offset_x, self.grid_offset_y
+            self.grid_offset_x, self.grid_offset_y,
+            cell_size=self.state.layout.cell_size,
+            grid_size=self.state.rules.grid_size
         )
         if row is None or col is None:
             return False
@@ -72,39 +97,41 @@ class PlacingLogic:
         else:
             row -= ship.size // 2
 
-        size   = ship.size
-        coords = []
-        fits   = True
+        if not self.fits(ship.size, ship.orientation, row, col):
+            return False
 
-        if ship.orientation == 'h':
-            if col < 0 or col + size > Config.GRID_SIZE or not (0 <= row < Config.GRID_SIZE):
-                fits = False
-            else:
-                for i in range(size):
-                    if self.state.player_board[row][col+i] != Cell.EMPTY:
-                        fits = False
-                        break
-                if fits:
-                    for i in range(size):
-                        self.state.player_board[row][col+i] = Cell.SHIP
-                        coords.append((row, col+i))
-        else:
-            if row < 0 or row + size > Config.GRID_SIZE or not (0 <= col < Config.GRID_SIZE):
-                fits = False
-            else:
-                for i in range(size):
-                    if self.state.player_board[row+i][col] != Cell.EMPTY:
-                        fits = False
-                        break
-                if fits:
-                    for i in range(size):
-                        self.state.player_board[row+i][col] = Cell.SHIP
-                        coords.append((row+i, col))
-
-        if fits:
-            ship.place(coords)
-            return True
-        return False  
+        dr, dc = (0, 1) if ship.orientation == 'h' else (1, 0)
+        coords = [(row + i * dr, col + i * dc) for i in range(ship.size)]
+        for r, c in coords:
+            self.state.player_board[r][c] = Cell.SHIP
+        self._legal = {}
+        ship.place(coords)
+        return True
+
+    # ─── Legal-placement bitmaps ─────────────────────────────────────────
+    def legal_anchors(self, size: int, orientation: str) -> int:
+        """Bitmask (bit r*n + c) of top-left cells where the ship fits the current board."""
+        board = self.state.player_board
+        if board is not self._legal_board:
+            self._legal, self._legal_board = {}, board
+        key = (size, orientation)
+        anchors = self._legal.get(key)
+        if anchors is None:
+            n, occupied, anchors = len(board), occupancy_mask(board), 0
+            for mask, coords in legal_placements(size, n):
+                horizontal = coords[0][0] == coords[-1][0]
+                if (size < 2 or horizontal == (orientation == 'h')) and not mask & occupied:
+                    r, c = coords[0]
+                    anchors |= 1 << (r * n + c)
+            self._legal[key] = anchors
+        return anchors
+
+    def fits(self, size: int, orientation: str, row: int, col: int) -> bool:
+        """True if a ship with top-left cell (row, col) can be dropped there."""
+        n = self.state.rules.grid_size
+        if not (0 <= row < n and 0 <= col < n):
+            return False
+        return bool(self.legal_anchors(size, orientation) >> (row * n + col) & 1)
 
     def snap_back(self):
         if self.active_ship:
@@ -124,19 +151,21 @@ class PlacingLogic:
             if self.active_ship and self.active_ship.dragging:
                 self.active_ship.stop_dragging()
                 mx, my = self.active_ship.rect.center
-                
-                col = (mx - self.grid_offset_x) // Config.CELL_SIZE
-                row = (my - self.grid_offset_y) // Config.CELL_SIZE
+                cs = self.state.layout.cell_size
+
+                col = (mx - self.grid_offset_x) // cs
+                row = (my - self.grid_offset_y) // cs
 
                 if self.active_ship.orientation == 'h':
                     col -= self.active_ship.size // 2
                 else:
                     row -= self.active_ship.size // 2
 
-                if 0 <= row < Config.GRID_SIZE and 0 <= col < Config.GRID_SIZE:
+                n = self.state.rules.grid_size
+                if 0 <= row < n and 0 <= col < n:
                     self.active_ship.rect.topleft = (
-                        self.grid_offset_x + col * Config.CELL_SIZE,
-                        self.grid_offset_y + row * Config.CELL_SIZE
+                        self.grid_offset_x + col * cs,
+                        self.grid_offset_y + row * cs
                     )
 
                     if self.try_place_on_grid(self.active_ship):
@@ -207,10 +236,14 @@ class PlacingLogic:
 
     def undo_last_ship(self):
         """ Undo last ship """
+        if self.state.waiting_for_sync:
+            return
+        self.notice = None
         if self.placed_ships:
             last_ship = self.placed_ships.pop()
             for (r, c) in last_ship.coords:
                 self.state.player_board[r][c] = Cell.EMPTY
+            self._legal = {}
 
             if self.active_ship:
                 self.ship_queue.insert(0, self.active_ship)
@@ -225,12 +258,72 @@ class PlacingLogic:
 
             self.ready_to_start = False  # undo disables ready
 
+    def auto_place_remaining(self):
+        """Place the active ship and everything still queued around the ships already down."""
+        if self.state.waiting_for_sync:
+            return
+        ships = ([self.active_ship] if self.active_ship else []) + self.ship_queue
+        if not ships:
+            return
+        try:
+            layout = place_fleet(self.state.player_board, [ship.size for ship in ships])
+        except ValueError:
+            # proven: the ships already down leave no room for the rest
+            self.notice = "The remaining ships don't fit - undo or Randomize"
+            return
+        self.notice = None
+        for ship, coords in zip(ships, layout):
+            self._put(ship, coords)
+        self._legal = {}
+        self.ship_queue   = []
+        self.active_ship  = None
+        self.preview_ship = None
+        self.ready_to_start = True
+
+    def randomize(self):
+        """Pick up every ship and deal a fresh random layout (re-roll on each press)."""
+        if self.state.waiting_for_sync:
+            return
+        self.notice = None
+        ships = self.placed_ships + ([self.active_ship] if self.active_ship else []) + self.ship_queue
+        fleet = self.state.rules.ship_sizes
+        ships.sort(key=lambda ship: fleet.index(ship.size))   # keep fleet order stable
+        self.state.player_board = create_board(self.state.rules.grid_size)
+        self.placed_ships = []
+        self.active_ship  = ships[0] if ships else None
+        self.ship_queue   = ships[1:]
+
+        # first press after a match: the layout pre-generated during the stats screen
+        suggestion = self.state.suggested_layout
+        self.state.suggested_layout = None
+        if suggestion and [len(c) for c in suggestion] == [ship.size for ship in ships]:
+            for ship, coords in zip(ships, suggestion):
+                for r, c in coords:
+                    self.state.player_board[r][c] = Cell.SHIP
+                self._put(ship, coords)
+            self._legal = {}
+            self.ship_queue, self.active_ship, self.preview_ship = [], None, None
+            self.ready_to_start = True
+            return
+        self.auto_place_remaining()
+
+    def _put(self, ship, coords):
+        """Record `coords` (already marked on the board) as `ship`'s placement."""
+        ship.stop_dragging()
+        horizontal = len(coords) < 2 or coords[0][0] == coords[1][0]
+        if (ship.orientation == 'h') != horizontal:
+            ship.rotate()
+        ship.place(list(coords))
+        self.placed_ships.append(ship)
+
     def reset(self):
         """Clear board and reset ship queue to start placement over."""
-        self.state.player_board = create_board()
+        self.state.player_board = create_board(self.state.rules.grid_size)
         self.active_ship  = None
         self.preview_ship = None
         self.ship_queue   = []
         self.placed_ships = []
         self.ready_to_start = False
+        self.notice = None
+        self._legal = {}
         self.setup_ships()  
@@ -2,17 +2,24 @@
 
 import pygame
 from helpers.draw_helpers import (
-    draw_top_bar, draw_grid, draw_text_center, draw_button
+    draw_top_bar, draw_text_center, draw_button
 )
+from helpers.board_layers import StaticLayer, CellLayer, grid_lines, paint_marker
 from core.config import Config
-from game.board_helpers import Cell
 
 """
 Module: placing_render.py
 Purpose:
   - Pygame render layer for ship placement screen.
   - Draws grid, placed ships, live placement preview (valid/invalid).
-  - Buttons for rotate, undo, ready; overlays waiting message in multiplayer.
+  - Buttons for rotate, undo, randomize, auto-place, ready (the board-changing
+    ones are hidden once READY was sent); overlays waiting message in
+    multiplayer; shows PlacingLogic.notice (e.g. auto-place failed).
+  - Panel + grid lines come from a cached static layer; markers from a CellLayer.
+  - Drag preview: validity is one lookup in PlacingLogic's legal-placement
+    bitmap; the green/red tiles are cached per cell size.
+  - Geometry comes from the round's state.layout; the scaled panel is
+    rebuilt when a new round brings a different layout.
 Future Hooks:
   - Animate remote opponent placement steps via network updates.
 """
@@ -30,20 +37,53 @@ class PlacingRender:
                       .load("resources/images/grid_panel.png")
                       .convert_alpha()
             )
-        grid_px   = Config.GRID_SIZE * Config.CELL_SIZE
-        margin = int(1.9 * Config.CELL_SIZE)
-        padded_px = grid_px + 2 * margin
-        self.panel = pygame.transform.smoothscale(_panel_raw, (padded_px, padded_px))
+        self.layout       = None  # layout the panel was scaled for
+        self.panel        = None
+        self.static_layer = StaticLayer()
+        self.marks        = CellLayer(paint_marker)
+        self.tiles        = {}    # (cell size, valid) -> translucent preview tile
+        self._sync_layout(logic.state.layout)
+
+    def _sync_layout(self, layout):
+        """Rescale the panel when the round's layout differs from the last one drawn."""
+        if layout == self.layout:
+            return
+        old = self.layout
+        if old is None or (layout.grid_width, layout.cell_size) != (old.grid_width, old.cell_size):
+            margin = int(1.9 * layout.cell_size)
+            padded_px = layout.grid_width + 2 * margin
+            self.panel = pygame.transform.smoothscale(_panel_raw, (padded_px, padded_px))
+        if old is not None and layout.cell_size != old.cell_size:
+            self.tiles.clear()
+        self.layout = layout
+
+    def release(self):
+        """Scene exit: drop the canvas-sized layers; they repaint on the next visit."""
+        self.static_layer.release()
+        self.marks.release()
+
+    def preview_tile(self, valid):
+        cs = self.layout.cell_size
+        key = (cs, valid)
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = pygame.Surface((cs, cs), pygame.SRCALPHA)
+            tile.fill(Config.PREVIEW_GREEN if valid else Config.PREVIEW_RED)
+            self.tiles[key] = tile
+        return tile
 
     def draw_preview(self, cells, screen, valid):
+        tile = self.preview_tile(valid)
+        cs = self.layout.cell_size
+        gx, gy = self.layout.grid_origin
         for row, col in cells:
-            x = Config.BOARD_OFFSET_X + 34 + col * Config.CELL_SIZE
-            y = Config.BOARD_OFFSET_Y + 31 + row * Config.CELL_SIZE
-            s = pygame.Surface((Config.CELL_SIZE, Config.CELL_SIZE), pygame.SRCALPHA)
-            s.fill(Config.PREVIEW_GREEN if valid else Config.PREVIEW_RED)
-            screen.blit(s, (x, y))
+            screen.blit(tile, (gx + col * cs, gy + row * cs))
 
     def draw(self, screen, state):
+        layout = state.layout
+        self._sync_layout(layout)
+        cs, n = layout.cell_size, state.rules.grid_size
+
         # Top bar with Restart/Quit buttons
         draw_top_bar(screen, state)
 
@@ -58,36 +98,29 @@ class PlacingRender:
         draw_button(screen, "Back (esc)", 10, 40, 130, 30,
                     Config.GRAY, Config.DARK_GRAY, back, 3)
 
-        # ─── Grid Panel Frame ─────────────────────
-        padded = Config.CELL_SIZE * 2
-        size   = Config.GRID_WIDTH + padded
-        panel = pygame.transform.smoothscale(
-            _panel_raw,
-            (size, size)
-        )
+        # ─── Grid Panel Frame + grid lines (cached per layout) ─────
         panel_pos = (
-            Config.BOARD_OFFSET_X - 1 * Config.CELL_SIZE,
-            Config.BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT - 2.1 * Config.CELL_SIZE
+            layout.board_offset_x - 1 * cs,
+            layout.board_offset_y + Config.TOP_BAR_HEIGHT - 2.1 * cs
         )
-        screen.blit(self.panel, panel_pos)
+        grid_pos = layout.grid_origin
 
-        # Player Board Grid
-        draw_grid(
-            screen,
-            state.player_board,
-            Config.BOARD_OFFSET_X + 34,
-            Config.BOARD_OFFSET_Y + 31,
-            show_ships=False
-        )
+        def paint(surf):
+            surf.blit(self.panel, panel_pos)
+            surf.blit(grid_lines(n, cs), grid_pos)
+
+        key = (panel_pos, grid_pos, n, cs)
+        screen.blit(self.static_layer.get(key, paint), (0, 0))
+
+        # Player Board markers (ships hidden; sprites are drawn below)
+        screen.blit(self.marks.sync(state.player_board, cs), grid_pos)
 
         # Draw all placed ship sprites
         for ship in self.logic.placed_ships:
             rows = [r for r, c in ship.coords]
             cols = [c for r, c in ship.coords]
             row0, col0 = min(rows), min(cols)
-            x = Config.BOARD_OFFSET_X + 34 + col0 * Config.CELL_SIZE
-            y = Config.BOARD_OFFSET_Y + 31 + row0 * Config.CELL_SIZE
-            screen.blit(ship.image, (x, y))
+            screen.blit(ship.image, (grid_pos[0] + col0 * cs, grid_pos[1] + row0 * cs))
 
         # Ships Left Counter
         ships_left = len(self.logic.ship_queue) + (1 if self.logic.active_ship else 0)
@@ -97,22 +130,16 @@ class PlacingRender:
             Config.WIDTH - 300, 100, 28,
             Config.DARK_GRAY
         )
+        if self.logic.notice:
+            draw_text_center(screen, self.logic.notice, Config.WIDTH - 300, 140, 22,
+                             Config.RED)
 
         # Live Placement Preview
-        if self.logic.active_ship and self.logic.active_ship.dragging:
-            mx, my = self.logic.active_ship.rect.center
-            row = (my - (Config.BOARD_OFFSET_Y + 31)) // Config.CELL_SIZE
-            col = (mx - (Config.BOARD_OFFSET_X + 34)) // Config.CELL_SIZE
-
-            preview_cells = self.logic.active_ship.get_preview_cells(
-                Config.BOARD_OFFSET_X + 34,
-                Config.BOARD_OFFSET_Y + 31
-            )
+        ship = self.logic.active_ship
+        if ship and ship.dragging:
+            preview_cells = ship.get_preview_cells(*grid_pos, n)
             if preview_cells:
-                valid = all(
-                    state.player_board[r][c] == Cell.EMPTY
-                    for r, c in preview_cells
-                )
+                valid = self.logic.fits(ship.size, ship.orientation, *preview_cells[0])
                 self.draw_preview(preview_cells, screen, valid)
 
         # Draw Active Ship (dragging)
@@ -134,14 +161,33 @@ class PlacingRender:
             Config.GRAY, Config.DARK_GRAY,
             lambda: self.logic.active_ship.rotate() if self.logic.active_ship else None, 3
         )
-        draw_button(
-            screen, "Undo Last Ship",
-            Config.WIDTH - 350,
-            Config.HEIGHT // 2 + 160,
-            140, 40,
-            Config.GRAY, Config.DARK_GRAY,
-            self.logic.undo_last_ship, 3
-        )
+        if not state.waiting_for_sync:
+            # board-changing actions are locked once READY has been sent
+            draw_button(
+                screen, "Undo Last Ship",
+                Config.WIDTH - 350,
+                Config.HEIGHT // 2 + 160,
+                140, 40,
+                Config.GRAY, Config.DARK_GRAY,
+                self.logic.undo_last_ship, 3
+            )
+            draw_button(
+                screen, "Randomize",
+                Config.WIDTH - 200,
+                Config.HEIGHT // 2 + 100,
+                140, 40,
+                Config.GRAY, Config.DARK_GRAY,
+                self.logic.randomize, 3
+            )
+        if self.logic.active_ship and not state.waiting_for_sync:
+            draw_button(
+                screen, "Auto-place",
+                Config.WIDTH - 200,
+                Config.HEIGHT // 2 + 160,
+                140, 40,
+                Config.GRAY, Config.DARK_GRAY,
+                self.logic.auto_place_remaining, 3
+            )
 
         # READY BUTTON once all ships are placed
         if self.logic.ready_to_start and not state.waiting_for_sync:
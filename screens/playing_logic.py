@@ -1,21 +1,31 @@
+import time
 import pygame
-from random import randint
 
 from core.config import Config
 from core.game_state import GameState
 from game.board_helpers import Cell, get_grid_pos, fire_at
+from game.effects import EXPLOSION, SPLASH
+from game.ai_worker import AIWorker, AIView
+from game import ai_strategies
 """
 Module: playing_logic.py
 Purpose:
   - Core in-battle firing & turn management logic.
   - Supports single-player, pass-and-play, and multiplayer modes.
-  - Implements AI behaviors (random, hunt/destroy, advanced) based on difficulty.
+  - Drives the AI strategy registered for the chosen difficulty (game/ai_strategies.py).
+  - AI moves are decided on a worker thread from a masked view of the player's
+    board (choose), then fired on the main thread; exactly one shot per AI
+    turn. The strategy learns from it (observe) on the main thread, or on
+    the worker after the search still running when the deadline fired.
   - Handles network shot exchange and result propagation.
 Future Hooks:
   - Introduce acknowledgment & timeout handling for sent shots.
   - Add ping mechanism to detect stale connections.
 """
 
+# What the AI is allowed to see of a cell on the player's board
+_AI_MASK = {Cell.EMPTY: Cell.EMPTY, Cell.SHIP: Cell.EMPTY, Cell.HIT: Cell.HIT, Cell.MISS: Cell.MISS}
+
 
 class PlayingLogic:
     def __init__(self, screen, state: GameState, *, hit_sfx: pygame.mixer.Sound, miss_sfx: pygame.mixer.Sound):
@@ -24,18 +34,24 @@ class PlayingLogic:
             # store references to our sound effects
         self.hit_sfx  = hit_sfx
         self.miss_sfx = miss_sfx
+        self.worker   = AIWorker()
+        self.ai_token = 0
         self.reset()
 
     def reset(self) -> None:
         """
-        Reset AI hunt/destroy state and initialize turn flags for both
-        single-player and multiplayer modes.
+        Start a fresh AI strategy for the current difficulty and initialize
+        turn flags for both single-player and multiplayer modes.
         """
-        # AI hunt-and-destroy state
-        self.ai_mode            = 'search'
-        self.destroy_origin     = None
-        self.destroy_directions = []
-        self.current_direction  = None
+        # AI strategy (owns all of its own memory) + shots-to-sink bookkeeping
+        self.strategy     = ai_strategies.create(self.state.difficulty, self.state.rules)
+        self.ai_first_hit = {}      # id(ship) -> ai_shots at the first hit on it
+
+        # Off-thread move search; results carrying an older token are dropped
+        self.ai_token   += 1
+        self.ai_search   = None     # None | "running" | "done"
+        self.ai_move     = None
+        self.ai_think_ms = 0.0
 
         # Multiplayer turn flags
         if self.state.network:
@@ -70,9 +86,10 @@ class PlayingLogic:
             #    player 0 attacks on the right grid, player 1 on the left
             row, col = get_grid_pos(
                 event.pos,
-                Config.PLAY_ENEMY_OFFSET_X if p==0 else Config.PLAY_BOARD_OFFSET_X,
-                Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT,
-                cell_size=Config.PLAYING_CELL_SIZE
+                state.layout.play_enemy_offset_x if p==0 else state.layout.play_board_offset_x,
+                state.layout.play_top,
+                cell_size=state.layout.playing_cell_size,
+                grid_size=state.rules.grid_size
             )
             if row is None:
                 return
@@ -95,23 +112,8 @@ class PlayingLogic:
             now = pygame.time.get_ticks()
             #    board_idx: 1 for the right‐hand grid, 0 for left
             board_idx = 1 - p
-            if hit:
-                state.explosions.append({
-                    "row":       row,
-                    "col":       col,
-                    "time":      now,
-                    "board_idx": board_idx,
-                })
-            else:
-                state.miss_splashes.append({
-                    "row":       row,
-                    "col":       col,
-                    "time":      now,
-                    "board_idx": board_idx,
-                })
+            state.effects.spawn(EXPLOSION if hit else SPLASH, row, col, board_idx, now)
 
-
-            
              # ─── play the corresponding sound effect ─────────────
             if state.sfxenabled:
                 if hit:
@@ -161,9 +163,10 @@ class PlayingLogic:
 
         row, col = get_grid_pos(
             event.pos,
-            Config.PLAY_ENEMY_OFFSET_X,
-            Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT,
-            cell_size=Config.PLAYING_CELL_SIZE
+            state.layout.play_enemy_offset_x,
+            state.layout.play_top,
+            cell_size=state.layout.playing_cell_size,
+            grid_size=state.rules.grid_size
         )
         if row is None or col is None:
             return
@@ -196,32 +199,73 @@ class PlayingLogic:
                 state.game_state = "stats"
                 return
 
-            # Schedule AI turn
+            # Schedule AI turn; its search overlaps the cosmetic delay
             state.ai_turn_pending    = True
             state.ai_turn_start_time = now
+            self.start_ai_turn()
 
     def handle_ai_turn(self, current_time: int) -> None:
         """
-        Single-player AI logic after a fixed delay.
-        Chooses behavior based on difficulty.
+        Single-player AI: fire the searched move once the cosmetic delay has
+        passed. If the search misses Config.AI_DEADLINE_MS, fire a random
+        untried cell instead.
         """
-        if (not self.state.ai_turn_pending or
-            (current_time - self.state.ai_turn_start_time) < 1000):
+        if not self.state.ai_turn_pending:
             return
+        if self.ai_search is None:
+            # Turn was scheduled without a search (e.g. state restored)
+            self.start_ai_turn()
 
-        diff = self.state.difficulty
-        if diff == 'Easy':
-            self._ai_shot_random(seed_next=False)
-        elif diff == 'Medium':
-            if self.state.ai_targets:
-                self._ai_shot_from_targets()
-            else:
-                self._ai_shot_random(seed_next=True)
-        else:  # Hard
-            self._ai_advanced_shot()
+        elapsed = current_time - self.state.ai_turn_start_time
+        if elapsed < Config.AI_TURN_DELAY_MS:
+            return
+        if self.ai_search == "running" and elapsed < Config.AI_DEADLINE_MS:
+            return
+
+        move = self.ai_move
+        if move is None or not self._valid_target(*move):
+            self.ai_token += 1      # ignore the late result when it arrives
+            move = ai_strategies.random_target(self.ai_view())
+        self.ai_search = None
+        self.ai_move   = None
 
+        self._ai_fire(*move)
         self.state.ai_turn_pending = False
 
+    def start_ai_turn(self) -> None:
+        """Start searching for the AI's reply (called as the player's shot resolves)."""
+        self.ai_token  += 1
+        self.ai_search  = "running"
+        self.ai_move    = None
+        view   = self.ai_view()
+        choose = lambda v, strategy=self.strategy: ai_strategies.decide(strategy, v)
+        if Config.AI_WORKER_ENABLED:
+            self.worker.submit(self.ai_token, choose, view, Config.AI_TIME_BUDGET_MS)
+        else:
+            start = time.perf_counter()
+            self.ai_move     = choose(view._replace(deadline=start + Config.AI_TIME_BUDGET_MS / 1000))
+            self.ai_think_ms = (time.perf_counter() - start) * 1000
+            self.ai_search   = "done"
+
+    def receive_ai_move(self, event: pygame.event.Event) -> None:
+        """Main-loop handler for Config.AI_MOVE_EVENT posted by the worker."""
+        if event.token != self.ai_token or self.ai_search != "running":
+            return
+        self.ai_move     = event.move
+        self.ai_think_ms = event.think_ms
+        self.ai_search   = "done"
+
+    def ai_view(self) -> AIView:
+        """Snapshot of what the AI may know: HIT/MISS cells and which ships are sunk."""
+        board = self.state.player_board
+        mask  = _AI_MASK.__getitem__
+        sunk  = tuple(
+            tuple(ship.coords) for ship in getattr(self.state, "placed_ships", ())
+            if ship.coords and all(board[r][c] == Cell.HIT for r, c in ship.coords)
+        )
+        return AIView(tuple(tuple(map(mask, row)) for row in board),
+                      self.state.rules.ship_sizes, sunk)
+
     def handle_network_turn(self, current_time: int) -> None:
         """
         Multiplayer turn handling:
@@ -268,7 +312,7 @@ class PlayingLogic:
         hit = (self.state.player_board[r][c] == Cell.SHIP)
         if hit:
             self.state.ai_hits += 1
-        self._apply_shot_result(r, c, hit, seed_next=False)
+        self._apply_shot_result(r, c, hit)
 
         net.send({"type": "result", "hit": hit})
 
@@ -283,55 +327,40 @@ class PlayingLogic:
 
     # AI Helper Methods
 
-    def _ai_shot_random(self, seed_next: bool=False) -> None:
-        """
-        Fire at a random untried cell.
-        Optionally enqueue neighbors on a hit for hunt mode.
-        """
-        size = Config.GRID_SIZE
-        while True:
-            r, c = randint(0, size-1), randint(0, size-1)
-            cell = self.state.player_board[r][c]
-            if cell in (Cell.EMPTY, Cell.SHIP):
-                now = pygame.time.get_ticks()
-                self.state.ai_shots += 1
-                self.state.ai_shot_times.append(now)
-
-                hit = (cell == Cell.SHIP)
-                if hit:
-                    self.state.ai_hits += 1
-                self._apply_shot_result(r, c, hit, seed_next)
+    def _ai_fire(self, r: int, c: int) -> None:
+        """Resolve one AI shot on the player's board and let the strategy learn from it."""
+        now = pygame.time.get_ticks()
+        self.state.ai_shots += 1
+        self.state.ai_shot_times.append(now)
 
-                if hit and self.state.player_ships == 0:
-                    self.state.winner     = "AI"
-                    self.state.game_state = "stats"
-                break
+        hit = (self.state.player_board[r][c] == Cell.SHIP)
+        if hit:
+            self.state.ai_hits += 1
+        self._apply_shot_result(r, c, hit)
+        if self.worker.busy():
+            # an abandoned search is still inside choose(); learn after it returns
+            self.worker.call_after(self.strategy.observe, r, c, hit)
+        else:
+            self.strategy.observe(r, c, hit)
+        if hit:
+            self._track_sink(r, c)
 
-    def _ai_shot_from_targets(self) -> None:
-        """
-        Fire at the next queued neighbor (hunt mode).
-        """
-        while self.state.ai_targets:
-            r, c = self.state.ai_targets.pop(0)
-            cell = self.state.player_board[r][c]
-            if cell in (Cell.EMPTY, Cell.SHIP):
-                now = pygame.time.get_ticks()
-                self.state.ai_shots += 1
-                self.state.ai_shot_times.append(now)
-
-                hit = (cell == Cell.SHIP)
-                if hit:
-                    self.state.ai_hits += 1
-                self._apply_shot_result(r, c, hit, seed_next=True)
+        if hit and self.state.player_ships == 0:
+            self.state.winner     = "AI"
+            self.state.game_state = "stats"
 
-                if hit and self.state.player_ships == 0:
-                    self.state.winner     = "AI"
-                    self.state.game_state = "stats"
-                return
-        # Fallback
-        self._ai_shot_random(seed_next=True)
+    def _track_sink(self, r: int, c: int) -> None:
+        """Record shots-to-sink for the strategy when the ship at (r,c) goes down."""
+        board = self.state.player_board
+        for ship in getattr(self.state, "placed_ships", ()):
+            if (r, c) not in ship.coords:
+                continue
+            first = self.ai_first_hit.setdefault(id(ship), self.state.ai_shots)
+            if all(board[sr][sc] == Cell.HIT for sr, sc in ship.coords):
+                ai_strategies.record_sink(self.strategy.name, self.state.ai_shots - first + 1)
+            return
 
-    def _apply_shot_result(self, r: int, c: int, hit: bool, seed_next: bool) -> None:
+    def _apply_shot_result(self, r: int, c: int, hit: bool) -> None:
         """
         Mark result on player board for AI shots, and also
         spawn the fading animation so the player sees it.
@@ -340,9 +369,6 @@ class PlayingLogic:
         if hit:
             self.state.player_board[r][c] = Cell.HIT
             self.state.player_ships    -= 1
-            self.state.last_player_hit  = (r, c)
-            if seed_next:
-                self._enqueue_adjacent(r, c)
         else:
             self.state.player_board[r][c] = Cell.MISS
 
@@ -350,18 +376,7 @@ class PlayingLogic:
         #    that handle_fire uses for the player's shots :contentReference[oaicite:0]{index=0}:contentReference[oaicite:1]{index=1}.
         now = pygame.time.get_ticks()
         # board_idx=0 → left grid (your fleet), same as in draw_effects
-        anim = {
-            "row":       r,
-            "col":       c,
-            "time":      now,
-            "board_idx": 0,
-        }
-        if hit:
-            self.state.explosions.append(anim)
-            # ─── Play AI hit sound effect ─────────────────────
-        else:
-            self.state.miss_splashes.append(anim)
-            # ─── Play AI miss sound effect ────────────────────    
+        self.state.effects.spawn(EXPLOSION if hit else SPLASH, r, c, 0, now)
 
         if self.state.sfxenabled:
                 if hit:
@@ -369,133 +384,14 @@ class PlayingLogic:
                 else:
                     self.miss_sfx.play()
 
-            
-    def _enqueue_adjacent(self, r: int, c: int) -> None:
-        """
-        Queue orthogonal neighbors for hunt mode.
-        """
-        size = Config.GRID_SIZE
-        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nr, nc = r + dr, c + dc
-            if (0 <= nr < size and 0 <= nc < size and
-                self.state.player_board[nr][nc] == Cell.EMPTY and
-                (nr, nc) not in self.state.ai_targets):
-                self.state.ai_targets.append((nr, nc))
-
-    def _ai_advanced_shot(self) -> None:
-        """
-        Hard mode: random until hit, then destroy by following ship orientation.
-        """
-        if self.ai_mode == 'search':
-            # Initial random shot
-            while True:
-                rr, cc = randint(0, Config.GRID_SIZE-1), randint(0, Config.GRID_SIZE-1)
-                cell = self.state.player_board[rr][cc]
-                if cell in (Cell.EMPTY, Cell.SHIP):
-                    now = pygame.time.get_ticks()
-                    self.state.ai_shots += 1
-                    self.state.ai_shot_times.append(now)
-
-                    hit = (cell == Cell.SHIP)
-                    if hit:
-                        self.state.ai_hits += 1
-                    self._apply_shot_result(rr, cc, hit, seed_next=True)
-
-                    if hit:
-                        self.ai_mode            = 'destroy'
-                        self.destroy_origin     = (rr, cc)
-                        self.destroy_directions = [(-1,0),(1,0),(0,-1),(0,1)]
-                        self.current_direction  = None
-                    if hit and self.state.player_ships == 0:
-                        self.state.winner     = "AI"
-                        self.state.game_state = "stats"
-                    break
-        else:
-            # Destroy mode
-            if self.current_direction is None:
-                # Probe each direction once
-                while self.destroy_directions:
-                    dr, dc = self.destroy_directions.pop(0)
-                    r0, c0 = self.destroy_origin
-                    nr, nc = r0 + dr, c0 + dc
-                    if self._valid_target(nr, nc):
-                        now = pygame.time.get_ticks()
-                        self.state.ai_shots += 1
-                        self.state.ai_shot_times.append(now)
-
-                        hit = (self.state.player_board[nr][nc] == Cell.SHIP)
-                        if hit:
-                            self.state.ai_hits += 1
-                        self._apply_shot_result(nr, nc, hit, seed_next=False)
-
-                        if hit:
-                            self.current_direction = (dr, dc)
-                        if hit and self.state.player_ships == 0:
-                            self.state.winner     = "AI"
-                            self.state.game_state = "stats"
-                        return
-                # No valid probes -> back to search
-                self._reset_destroy_mode()
-                self._ai_shot_random(seed_next=True)
-                return
-
-            # Follow locked direction
-            dr, dc = self.current_direction
-            lr, lc = self.state.last_player_hit
-            nr, nc = lr + dr, lc + dc
-            if self._valid_target(nr, nc):
-                now = pygame.time.get_ticks()
-                self.state.ai_shots += 1
-                self.state.ai_shot_times.append(now)
-
-                hit = (self.state.player_board[nr][nc] == Cell.SHIP)
-                if hit:
-                    self.state.ai_hits += 1
-                self._apply_shot_result(nr, nc, hit, seed_next=False)
-
-                if hit:
-                    if self.state.player_ships == 0:
-                        self.state.winner     = "AI"
-                        self.state.game_state = "stats"
-                    return
-
-                # Reverse direction
-                odr, odc = -dr, -dc
-                self.current_direction     = (odr, odc)
-                self.state.last_player_hit = self.destroy_origin
-                rr, rc = self.destroy_origin[0] + odr, self.destroy_origin[1] + odc
-                if self._valid_target(rr, rc):
-                    now = pygame.time.get_ticks()
-                    self.state.ai_shots += 1
-                    self.state.ai_shot_times.append(now)
-
-                    hit = (self.state.player_board[rr][rc] == Cell.SHIP)
-                    if hit:
-                        self.state.ai_hits += 1
-                    self._apply_shot_result(rr, rc, hit, seed_next=False)
-                    if hit and self.state.player_ships == 0:
-                        self.state.winner     = "AI"
-                        self.state.game_state = "stats"
-
-            # Clean up and resume search
-            self._reset_destroy_mode()
-            self._ai_shot_random(seed_next=True)
-
     def _valid_target(self, r: int, c: int) -> bool:
         """
         True if cell at (r,c) is in bounds and unshot.
         """
-        size = Config.GRID_SIZE
+        size = self.state.rules.grid_size
         return (0 <= r < size and 0 <= c < size
                 and self.state.player_board[r][c] in (Cell.EMPTY, Cell.SHIP))
 
-    def _reset_destroy_mode(self) -> None:
-        """Reset from destroy mode back to pure search."""
-        self.ai_mode            = 'search'
-        self.destroy_origin     = None
-        self.destroy_directions = []
-        self.current_direction  = None
-
     def handle_fire(self, row: int, col: int, state: GameState) -> None:
         """
         Called when the player shoots at (row,col).
@@ -511,22 +407,7 @@ class PlayingLogic:
     
         # ─── spawn a fading explosion or splash ───────────
         now = pygame.time.get_ticks()
-        if hit:
-            state.explosions.append({
-                "row":       row,
-                "col":       col,
-                "time":      now,
-                "board_idx": 1
-            })
-            
-        else:
-            state.miss_splashes.append({
-                "row":       row,
-                "col":       col,
-                "time":      now,
-                "board_idx": 1
-            })
-            
+        state.effects.spawn(EXPLOSION if hit else SPLASH, row, col, 1, now)
 
         if self.state.sfxenabled:
             if hit:
@@ -1,20 +1,29 @@
 import pygame
 from helpers.draw_helpers import (
-    draw_top_bar, draw_grid, draw_text_center,
-    draw_button, draw_x
+    draw_top_bar, draw_text_center, draw_button
+)
+from helpers.board_layers import (
+    StaticLayer, CellLayer, grid_lines, ship_sprite, paint_marker, paint_hit_x
 )
 from core.config import Config
-from game.draggable_ship import DraggableShip, SHIP_IMAGE_FILES
+from helpers.fonts import get_font
 from game.board_helpers import Cell
+from game.effects import fade_frames
 
 """
 Module: playing_render.py
 Purpose:
   - Pygame render layer for in-battle screen.
   - Draws two-panel layout: your fleet & enemy waters.
-  - Renders hits, misses, sunk-ship overlays, and animations (explosions, splashes).
+  - Renders hits, misses, sunk-ship overlays, and animations (explosions, splashes)
+    from the pooled EffectPool using pre-baked fade frames.
   - Displays score, timer, and turn indicator (you vs opponent).
   - Handles end-of-game overlay with appropriate buttons.
+  - Composites cached layers: panels + grid lines (static per layout),
+    per-board markers (only changed cells repainted), then sprites/effects/UI.
+  - Geometry comes from the round's state.layout / state.rules; cell size,
+    margin and the scaled panel are rebuilt when a new round brings a
+    different board, and the cached layers re-key themselves.
 Future Hooks:
   - Animate remote shots landing with network timestamps.
   - Support custom UI skins via theme config.
@@ -24,21 +33,67 @@ _panel_raw = None
 class PlayingRender:
     def __init__(self, logic):
         self.logic = logic
+        self.layout    = None   # layout the geometry below was built for
+        self.grid_size = None
+        self._sync_layout(logic.state)
+
+        # ─── Cached layers ───────────────────────────────────────
+        self.static_layer = StaticLayer()
+        self.left_marks   = CellLayer(paint_marker)   # your fleet / player 1
+        self.right_marks  = CellLayer(paint_marker)   # enemy waters / player 2
+        self.hit_overlay  = CellLayer(paint_hit_x)    # X's above your ship sprites
+
+    def _sync_layout(self, state):
+        """Adopt the round's layout; rescale the panel only if the board's size changed."""
+        layout, grid_size = state.layout, state.rules.grid_size
+        old = self.layout
+        self.layout, self.grid_size = layout, grid_size
+        if old is not None and (old.playing_cell_size, old.playing_grid_width) == \
+                (layout.playing_cell_size, layout.playing_grid_width):
+            return
 
         # use scaled cell size
-        self.cell_size = Config.PLAYING_CELL_SIZE
-        grid_px = Config.GRID_SIZE * self.cell_size
+        self.cell_size = layout.playing_cell_size
+        grid_px = layout.playing_grid_width
         margin  = int(1.9 * self.cell_size)
         padded  = grid_px + 2 * margin
 
-        # scale the panel once
+        # scale the panel once per layout
         global _panel_raw
         if _panel_raw is None:
             _panel_raw = pygame.image.load("resources/images/grid_panel.png").convert_alpha()
         self.panel  = pygame.transform.smoothscale(_panel_raw, (padded, padded))
         self.margin = margin
+
+    def release(self):
+        """Scene exit: drop the canvas-sized layers; they repaint on the next visit."""
+        self.static_layer.release()
+        for layer in (self.left_marks, self.right_marks, self.hit_overlay):
+            layer.release()
+
+    def _blit_static(self, screen):
+        """Both panels + grid lines, rendered once per layout."""
+        layout = self.layout
+        top_y = layout.play_top
+        key = (layout.play_board_offset_x, layout.play_enemy_offset_x, top_y,
+               self.grid_size, self.cell_size, self.margin)
+
+        def paint(surf):
+            lines = grid_lines(self.grid_size, self.cell_size)
+            for offx in (layout.play_enemy_offset_x, layout.play_board_offset_x):
+                surf.blit(self.panel, (offx - self.margin, top_y - self.margin))
+                surf.blit(lines, (offx, top_y))
+
+        screen.blit(self.static_layer.get(key, paint), (0, 0))
+
+    def _blit_marks(self, screen, layer, board, offx):
+        top_y = self.layout.play_top
+        screen.blit(layer.sync(board, self.cell_size), (offx, top_y))
+
     def draw(self, screen, state):
         """Render the main battle UI elements each frame."""
+        if state.layout is not self.layout:
+            self._sync_layout(state)
         # 1) Always draw top bar
         draw_top_bar(screen, state)
 
@@ -58,43 +113,24 @@ class PlayingRender:
                          Config.WIDTH // 2,
                          Config.TOP_BAR_HEIGHT + 40)
 
-        # Two hidden boards
-         # --- LEFT: Player 1’s board (ships hidden) ---
-        # blit grid‐panel behind it
-        left_x = Config.PLAY_BOARD_OFFSET_X - self.margin
-        top_y  = Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT - self.margin
-        screen.blit(self.panel, (left_x, top_y))
-        draw_grid(
-            screen,
-            state.pass_play_boards[0],
-            Config.PLAY_BOARD_OFFSET_X,
-            Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT,
-            show_ships=False,
-            cell_size=self.cell_size
-        )
-
-        # RIGHT board…
-        right_x = Config.PLAY_ENEMY_OFFSET_X - self.margin
-        screen.blit(self.panel, (right_x, top_y))
-        draw_grid(
-            screen,
-            state.pass_play_boards[1],
-            Config.PLAY_ENEMY_OFFSET_X,
-            Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT,
-            show_ships=False,
-            cell_size=self.cell_size
-        )
+        # Two hidden boards (ships hidden): panels + grid from the static layer,
+        # hit/miss markers from each board's cell layer
+        self._blit_static(screen)
+        self._blit_marks(screen, self.left_marks, state.pass_play_boards[0],
+                         self.layout.play_board_offset_x)
+        self._blit_marks(screen, self.right_marks, state.pass_play_boards[1],
+                         self.layout.play_enemy_offset_x)
         # Player names + scores
-        label_y = Config.PLAY_BOARD_OFFSET_Y - 70 + Config.TOP_BAR_HEIGHT
-        cx1 = Config.PLAY_BOARD_OFFSET_X + Config.GRID_WIDTH // 2
-        cx2 = Config.PLAY_ENEMY_OFFSET_X + Config.GRID_WIDTH // 2
+        label_y = self.layout.play_top - 70
+        cx1 = self.layout.play_board_offset_x + self.layout.grid_width // 2
+        cx2 = self.layout.play_enemy_offset_x + self.layout.grid_width // 2
 
         # Draw both labels in a loop:
         for cx, player_idx in ((cx1, 0), (cx2, 1)):
             text = f"Player {player_idx+1}   Score: {state.pass_play_score[player_idx]}"
             # match font_size used by draw_text_center:
             font_size = 28
-            font = pygame.font.SysFont(None, font_size, bold=True)
+            font = get_font(font_size, bold=True)
             text_surf = font.render(text, True, (255, 255, 255))
             text_rect = text_surf.get_rect(center=(cx, label_y))
 
@@ -108,8 +144,8 @@ class PlayingRender:
 
         # Reveal sunk ships
         for idx, (ships, offx) in enumerate([
-            (state.pass_play_placed_ships[0], Config.PLAY_BOARD_OFFSET_X),
-            (state.pass_play_placed_ships[1], Config.PLAY_ENEMY_OFFSET_X)
+            (state.pass_play_placed_ships[0], self.layout.play_board_offset_x),
+            (state.pass_play_placed_ships[1], self.layout.play_enemy_offset_x)
         ]):
             board = state.pass_play_boards[idx]
             for coords in ships:
@@ -118,16 +154,10 @@ class PlayingRender:
                     r0 = min(r for r, _ in coords)
                     c0 = min(c for _, c in coords)
                     horiz = len({r for r, _ in coords}) == 1
-                    ship = DraggableShip(size, 0, 0)
-                    if not horiz: ship.rotate()
-                    # compute new pixel dims
-                    w = size * self.cell_size if horiz else self.cell_size
-                    h = self.cell_size       if horiz else size * self.cell_size
-                    img_scaled = pygame.transform.smoothscale(ship.image, (w, h))
-                    screen.blit(img_scaled, ( 
-    (offx + c0 * self.cell_size),
-    (Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT + r0 * self.cell_size)
-))
+                    screen.blit(ship_sprite(size, horiz, self.cell_size, self.layout.cell_size), (
+                        offx + c0 * self.cell_size,
+                        self.layout.play_top + r0 * self.cell_size
+                    ))
 
     def _draw_standard(self, screen, state):
         # Score & timer
@@ -136,30 +166,13 @@ class PlayingRender:
                          Config.WIDTH // 2,
                          Config.TOP_BAR_HEIGHT + 20,
                          font_size=24)
-        # Attack grid + own fleet
-        # --- draw “Enemy Waters” attack grid with background panel ---
-        top_y = Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT - self.margin
-        ex = Config.PLAY_ENEMY_OFFSET_X - self.margin
-        screen.blit(self.panel, (ex, top_y))
-        draw_grid(
-            screen,
-            state.player_attacks,
-            Config.PLAY_ENEMY_OFFSET_X,
-            Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT,
-            show_ships=False,
-            cell_size=self.cell_size
-        )
-        # --- draw “Your Fleet” board with the same panel behind it ---
-        bx = Config.PLAY_BOARD_OFFSET_X - self.margin
-        screen.blit(self.panel, (bx, top_y))
-        draw_grid(
-            screen,
-            state.player_board,
-            Config.PLAY_BOARD_OFFSET_X,
-            Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT,
-            show_ships=False,
-            cell_size=self.cell_size
-        )
+        # Attack grid + own fleet: panels/grid lines are cached once per layout,
+        # markers only repaint cells that changed since last frame
+        self._blit_static(screen)
+        self._blit_marks(screen, self.right_marks, state.player_attacks,
+                         self.layout.play_enemy_offset_x)
+        self._blit_marks(screen, self.left_marks, state.player_board,
+                         self.layout.play_board_offset_x)
 
         # Reveal sunk ships on computer board
         self._reveal_sunk_standard(screen, state)
@@ -199,10 +212,10 @@ class PlayingRender:
             # Show labels
             label = "Your Fleet"
             font_size = 24
-            font = pygame.font.SysFont(None, font_size, bold=True)
+            font = get_font(font_size, bold=True)
             text_surf = font.render(label, True, (255,255,255))
-            x = Config.PLAY_BOARD_OFFSET_X + Config.PLAYING_GRID_WIDTH // 2
-            y = Config.PLAY_BOARD_OFFSET_Y - 60 + Config.TOP_BAR_HEIGHT
+            x = self.layout.play_board_offset_x + self.layout.playing_grid_width // 2
+            y = self.layout.play_top - 60
             text_rect = text_surf.get_rect(center=(x, y))
             # draw dark background with 8px padding
             pad_x, pad_y = 8, 4
@@ -212,8 +225,8 @@ class PlayingRender:
             label = "Enemy Waters"
             # reuse same font
             text_surf = font.render(label, True, (255,255,255))
-            x = Config.PLAY_ENEMY_OFFSET_X + Config.PLAYING_GRID_WIDTH // 2
-            y = Config.PLAY_BOARD_OFFSET_Y - 60 + Config.TOP_BAR_HEIGHT
+            x = self.layout.play_enemy_offset_x + self.layout.playing_grid_width // 2
+            y = self.layout.play_top - 60
             text_rect = text_surf.get_rect(center=(x, y))
             bg_rect = text_rect.inflate(pad_x*2, pad_y*2)
             pygame.draw.rect(screen, Config.DARK_GRAY, bg_rect, border_radius=4)
@@ -229,24 +242,17 @@ class PlayingRender:
                 # 2) horizontal if all in same row
                 horiz = all(r == coords[0][0] for r, _ in coords)
 
-                # 3) compute scaled pixel dims
-                w = size * self.cell_size if horiz else self.cell_size
-                h = self.cell_size       if horiz else size * self.cell_size
-
-                # 4) scale the sprite into those smaller cells
-                img_scaled = pygame.transform.smoothscale(ship.image, (w, h))
+                # 3) cached sprite scaled into the smaller cells
+                img_scaled = ship_sprite(size, horiz, self.cell_size, self.layout.cell_size)
 
-                # 5) blit at the 90%-sized grid position
-                x = Config.PLAY_BOARD_OFFSET_X + c0 * self.cell_size
-                y = Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT + r0 * self.cell_size
+                # 4) blit at the 90%-sized grid position
+                x = self.layout.play_board_offset_x + c0 * self.cell_size
+                y = self.layout.play_top + r0 * self.cell_size
                 screen.blit(img_scaled, (x, y))
-                
-            for r in range(Config.GRID_SIZE):
-                for c in range(Config.GRID_SIZE):
-                    if state.player_board[r][c] == Cell.HIT:
-                        px = Config.PLAY_BOARD_OFFSET_X + c*self.cell_size + self.cell_size//2
-                        py = Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT + r*self.cell_size + self.cell_size//2
-                        draw_x(screen, px, py, self.cell_size)
+
+            # X marks for hits on your fleet, above the sprites
+            self._blit_marks(screen, self.hit_overlay, state.player_board,
+                             self.layout.play_board_offset_x)
 
     def _reveal_sunk_standard(self, screen, state):
         """
@@ -254,7 +260,7 @@ class PlayingRender:
         using the exact coords recorded in state.computer_ships_coords.
         """
         cs = self.cell_size
-        top_y = Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT
+        top_y = self.layout.play_top
 
         for coords in state.computer_ships_coords:
             # have all cells of this ship been hit?
@@ -269,18 +275,11 @@ class PlayingRender:
                 size = len(coords)
                 horiz = (min_r == max_r)
 
-                # create & orient sprite
-                ship = DraggableShip(size, 0, 0)
-                if not horiz:
-                    ship.rotate()
-
-                # scale to playing‐cell size
-                w = size * cs if horiz else cs
-                h = cs       if horiz else size * cs
-                img_scaled = pygame.transform.smoothscale(ship.image, (w, h))
+                # cached, oriented sprite at playing-cell size
+                img_scaled = ship_sprite(size, horiz, cs, self.layout.cell_size)
 
                 # compute pixel position
-                x = Config.PLAY_ENEMY_OFFSET_X + min_c * cs
+                x = self.layout.play_enemy_offset_x + min_c * cs
                 y = top_y + min_r * cs
                 screen.blit(img_scaled, (x, y))
 
@@ -293,34 +292,17 @@ class PlayingRender:
 
     def _draw_effects(self, screen, state):
         now = pygame.time.get_ticks()
-
-        # ─── Explosions ─────────────────────────────────────────
-        for exp in state.explosions[:]:
-            elapsed = now - exp["time"]
-            offx = Config.PLAY_BOARD_OFFSET_X if exp["board_idx"]==0 else Config.PLAY_ENEMY_OFFSET_X
-            x = offx + exp["col"] * self.cell_size
-            y = Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT + exp["row"] * self.cell_size
-
-            if elapsed < Config.EXPLOSION_FADE_DURATION:
-                img   = Config.EXPLOSION_IMG.copy()
-                alpha = int(255 * (1 - elapsed/Config.EXPLOSION_FADE_DURATION))
-                img.set_alpha(alpha)
-                screen.blit(img, (x, y))
-            else:
-                # **Drop the draw_x call** (we’ll get it for free in draw_grid) :contentReference[oaicite:2]{index=2}:contentReference[oaicite:3]{index=3}
-                state.explosions.remove(exp)
-
-        # ─── Miss splashes ───────────────────────────────────────
-        for ms in state.miss_splashes[:]:
-            elapsed = now - ms["time"]
-            offx = Config.PLAY_BOARD_OFFSET_X if ms["board_idx"]==0 else Config.PLAY_ENEMY_OFFSET_X
-            x = offx + ms["col"] * self.cell_size
-            y = Config.PLAY_BOARD_OFFSET_Y + Config.TOP_BAR_HEIGHT + ms["row"] * self.cell_size
-
-            if elapsed < Config.MISS_FADE_DURATION:
-                img   = Config.MISS_IMG.copy()
-                alpha = int(255 * (1 - elapsed/Config.MISS_FADE_DURATION))
-                img.set_alpha(alpha)
-                screen.blit(img, (x, y))
-            else:
-                state.miss_splashes.remove(ms)
+        effects = state.effects
+        effects.expire(now)
+        if not effects:
+            return
+
+        cs    = self.cell_size
+        steps = Config.EFFECT_FADE_STEPS
+        top_y = self.layout.play_top
+        for eff in effects:
+            offx = self.layout.play_board_offset_x if eff.board_idx == 0 else self.layout.play_enemy_offset_x
+            # pre-baked fade frame for how far through its life the effect is
+            step = min(steps - 1, (now - eff.start) * steps // eff.duration)
+            screen.blit(fade_frames(eff.kind, cs)[step],
+                        (offx + eff.col * cs, top_y + eff.row * cs))
@@ -2,12 +2,15 @@
 import pygame
 from core.config import Config
 from core.game_state import GameState
+from game import monte_carlo
 
 """
 Module: settings_logic.py
 Purpose:
   - Pygame event handling for Settings screen: grid size, custom input, and difficulty.
   - Validates and applies user inputs, toggles between presets/custom UI.
+  - Picking Expert starts the Monte Carlo worker pool right away (main thread),
+    so the first Expert move does not launch processes.
 Future Hooks:
   - Broadcast applied settings to network peer.
 """
@@ -34,6 +37,7 @@ class SettingsLogic:
     def apply_grid_size(self, size: int):
         """Apply a preset grid size and update layout immediately."""
         Config.GRID_SIZE = size
+        # GameState follows the layout change and starts a round on the new grid
         Config.update_layout()
         
 
@@ -58,4 +62,6 @@ class SettingsLogic:
     def apply_difficulty(self, level: str):
         """Set AI difficulty level in game state."""
         self.state.difficulty = level
+        if level == "Expert":
+            monte_carlo.prewarm(Config.MC_WORKERS)
         
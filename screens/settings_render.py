@@ -63,8 +63,9 @@ class SettingsRender:
 
             # AI Difficulty section
             draw_text_center(screen, "AI Difficulty", Config.WIDTH // 2, 380, 28)
+            row_w = len(Config.DIFFICULTIES) * 150 - 10
             for i, level in enumerate(Config.DIFFICULTIES):
-                x = Config.WIDTH // 2 - 150 + i * 150
+                x = (Config.WIDTH - row_w) // 2 + i * 150
                 is_selected = (state.difficulty == level)
                 draw_button(
                     screen, level,
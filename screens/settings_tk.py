@@ -209,11 +209,12 @@ class SettingsTk:
 
         # ─── AI Difficulty section with background (moved down) ──
         draw_label("AI Difficulty", self.diff_row - 0.08, "diff_label")
+        first = (len(self.diff_buttons) - 1) / 2    # keep the row centred
         for i, b in enumerate(self.diff_buttons):
             lvl = b.cget("text")
             b.config(font=uniform,
                      bg=_hex(Config.GREEN if self.state.difficulty == lvl else Config.GRAY))
-            col = mid_x + (i - 1) * self.spacing
+            col = mid_x + (i - first) * self.spacing
             b.place(relx=col, rely=self.diff_row, relwidth=self.btn_w, relheight=self.btn_h)
 
         # ─── Sound Effects checkbox ─────────────────────────────
@@ -1,4 +1,5 @@
 import pygame
+from typing import NamedTuple
 from helpers.draw_helpers import draw_top_bar, draw_text_center, draw_button
 from core.config import Config
 
@@ -9,12 +10,133 @@ Purpose:
   - Draws top bar, background panel, and per-mode stats display.
   - Supports Pass & Play vs AI/Network layouts: banners, scores.
   - Shows computed stats: Shots, Hits, Accuracy, Avg/Shot, Total time.
+  - Shows lifetime win rates/accuracy from the StatsStore rollups.
   - Renders action buttons: Play Again, Main Menu.
+  - Builds an immutable StatsSummary once on entering the scene and caches
+    the panel + text in one surface; only the buttons are drawn per frame.
 Future Hooks:
   - Animate stat transitions and graphs.
   - Share stats summary over the network.
 """
 
+class StatsSummary(NamedTuple):
+    """Everything the stats screen shows, formatted once per match."""
+    pass_play:    bool
+    banner:       str
+    scores:       tuple     # ((text, x, y, font_size), ...) under the banner
+    start_y:      int       # y of the column headers
+    left_label:   str
+    right_label:  str
+    rows:         tuple     # ((left_text, right_text), ...)
+    lifetime:     tuple     # extra summary lines from the StatsStore
+
+
+def _compute_stats(shots, hits, times):
+    """Format one column of the table (times is a TimingSeries)."""
+    accuracy = (hits / shots * 100) if shots else 0
+    # TimingSeries keeps these aggregates incrementally: O(1)
+    total_ms = times.total_ms
+    avg_ms   = times.mean_ms
+    return {
+        "Shots": shots,
+        "Hits": hits,
+        "Accuracy": f"{accuracy:.1f}%",
+        "Avg/Shot": f"{avg_ms/1000:.2f}s",
+        "Total": f"{total_ms/1000:.2f}s"
+    }
+
+
+def build_summary(state) -> StatsSummary:
+    """Snapshot the finished match (and lifetime rollups) into a StatsSummary."""
+    # ─── PASS & PLAY vs AI/Network split ────────────────────
+    if state.pass_play_mode:
+        # Pass & Play banner + per-player scores
+        title_y = 120
+        banner  = "Pass & Play Results"
+        score_y = title_y + 40
+        scores  = (
+            (f"Player 1 Score: {state.pass_play_score[0]}", Config.WIDTH // 4,     score_y, 28),
+            (f"Player 2 Score: {state.pass_play_score[1]}", Config.WIDTH * 3 // 4, score_y, 28),
+        )
+        # Shift down the stats table start
+        start_y = score_y + 50
+
+        # Per-player stats from pass_play arrays
+        p_stats = _compute_stats(
+            state.pass_play_shots[0],
+            state.pass_play_hits[0],
+            state.pass_play_shot_times[0]
+        )
+        o_stats = _compute_stats(
+            state.pass_play_shots[1],
+            state.pass_play_hits[1],
+            state.pass_play_shot_times[1]
+        )
+    else:
+        banner  = "You won!" if state.winner == "Player" else "You lost!"
+        scores  = ((f"Final Score: {state.score}", Config.WIDTH // 2, 180, 32),)
+        start_y = 200
+
+        # AI / network stats as before
+        p_stats = _compute_stats(
+            state.player_shots,
+            state.player_hits,
+            state.player_shot_times
+        )
+        o_stats = _compute_stats(
+            state.ai_shots,
+            state.ai_hits,
+            state.ai_shot_times
+        )
+
+    # Column headers: always “Player 1” / “Player 2” in Pass&Play,
+    # else the usual You/Computer or You/Opponent
+    if state.pass_play_mode:
+        left_label  = ""
+        right_label = ""
+    elif state.network:
+        left_label  = "You"
+        right_label = "Opponent"
+    else:
+        left_label  = "Player"
+        right_label = "Computer"
+
+    rows = tuple(
+        (f"{key}: {p_stats[key]}", f"{key}: {o_stats[key]}")
+        for key in p_stats
+    )
+
+    # Lifetime summary from the pre-aggregated rollups (no history scan)
+    lifetime = ()
+    store = state.stats_store
+    if store and not state.pass_play_mode:
+        life = store.summary()
+        mins, secs = divmod(int(life["avg_win_ms"] // 1000), 60)
+        n = state.rules.grid_size
+        by_size = store.summary("grid_size", n)
+        if state.network:
+            detail = f"Network win rate: {store.summary('mode', 'network')['win_rate']:.0f}%"
+        else:
+            by_diff = store.summary("difficulty", state.difficulty)
+            detail = f"{state.difficulty} win rate: {by_diff['win_rate']:.0f}%"
+        lifetime = (
+            f"Lifetime: {life['games']} games   Won: {life['win_rate']:.0f}%   "
+            f"Accuracy: {life['accuracy']:.1f}%   Avg win: {mins:02}:{secs:02}",
+            f"{detail}   {n}x{n} win rate: {by_size['win_rate']:.0f}%",
+        )
+
+    return StatsSummary(
+        pass_play=state.pass_play_mode,
+        banner=banner,
+        scores=scores,
+        start_y=start_y,
+        left_label=left_label,
+        right_label=right_label,
+        rows=rows,
+        lifetime=lifetime,
+    )
+
+
 class StatsRender:
     def __init__(self, logic):
         self.logic = logic
@@ -24,10 +146,21 @@ class StatsRender:
         except NameError:
             _stats_panel_raw = pygame.image.load("resources/images/grid_panel.png").convert_alpha()
         self.panel_raw = _stats_panel_raw
+        self.summary = None
+        self.surface = None   # panel + all static text, rendered once per match
 
-    def draw(self, screen, state):
-        # Draw the top bar (title, restart/quit buttons)
-        draw_top_bar(screen, state)
+    def on_enter(self, state):
+        """Scene changed to "stats": snapshot the match and pre-render it."""
+        self.summary = build_summary(state)
+        self.surface = self._render_summary(self.summary)
+
+    def on_exit(self):
+        """Drop the cached surface when leaving the stats screen."""
+        self.summary = None
+        self.surface = None
+
+    def _render_summary(self, summary: StatsSummary) -> pygame.Surface:
+        surf = pygame.Surface((Config.WIDTH, Config.HEIGHT), pygame.SRCALPHA)
 
         # ─── Draw a scaled frame around the stats area ───────────────────────────
         # Compute the panel size: leave 50px margin on left/right, top under the bar
@@ -36,123 +169,49 @@ class StatsRender:
         panel = pygame.transform.smoothscale(self.panel_raw, (panel_w, panel_h))
         panel_x = 50
         panel_y = Config.TOP_BAR_HEIGHT -20
-        screen.blit(panel, (panel_x, panel_y))
+        surf.blit(panel, (panel_x, panel_y))
 
-        # Now all subsequent text/buttons will render on top of this panel
-
-        # ─── PASS & PLAY vs AI/Network split ────────────────────
-        if state.pass_play_mode:
-            # Pass & Play banner + per-player scores
-            title_y = 120
-            draw_text_center(screen, "Pass & Play Results", Config.WIDTH // 2, title_y, 48)
-
-            # Draw each player's total score
-            score_y = title_y + 40
-            draw_text_center(
-                screen,
-                f"Player 1 Score: {state.pass_play_score[0]}",
-                Config.WIDTH // 4, score_y, font_size=28
-            )
-            draw_text_center(
-                screen,
-                f"Player 2 Score: {state.pass_play_score[1]}",
-                Config.WIDTH * 3 // 4, score_y, font_size=28
-            )
-            # Shift down the stats table start
-            stats_start_y = score_y + 50
-
-            
-        else:
-            
-            if state.winner == "Player":
-                msg = "You won!"
-            else:
-                msg = "You lost!"
-            draw_text_center(screen, msg, Config.WIDTH // 2, 120, 48)
-            draw_text_center(screen, msg, Config.WIDTH // 2, 120, 48)
-
-            draw_text_center(
-                screen,
-                f"Final Score: {state.score}",
-                Config.WIDTH // 2,
-                180,
-                32
-            )
- 
-
-        # Compute stats summary dictionaries
-        def compute_stats(shots, hits, times):
-            accuracy = (hits / shots * 100) if shots else 0
-            if len(times) > 1:
-                total_ms = times[-1] - times[0]
-                avg_ms   = total_ms / (len(times) - 1)
-            else:
-                total_ms = 0
-                avg_ms   = 0
-            return {
-                "Shots": shots,
-                "Hits": hits,
-                "Accuracy": f"{accuracy:.1f}%",
-                "Avg/Shot": f"{avg_ms/1000:.2f}s",
-                "Total": f"{total_ms/1000:.2f}s"
-            }
-
-        if state.pass_play_mode:
-            # Per-player stats from pass_play arrays
-            p_stats = compute_stats(
-                state.pass_play_shots[0],
-                state.pass_play_hits[0],
-                state.pass_play_shot_times[0]
-            )
-            o_stats = compute_stats(
-                state.pass_play_shots[1],
-                state.pass_play_hits[1],
-                state.pass_play_shot_times[1]
-            )
-        else:
-            # AI / network stats as before
-            p_stats = compute_stats(
-                state.player_shots,
-                state.player_hits,
-                state.player_shot_times
-            )
-            o_stats = compute_stats(
-                state.ai_shots,
-                state.ai_hits,
-                state.ai_shot_times
-            )
+        # Banner + score line(s)
+        draw_text_center(surf, summary.banner, Config.WIDTH // 2, 120, 48)
+        if not summary.pass_play:
+            # the win/lose banner is blitted twice: heavier anti-aliased edges
+            draw_text_center(surf, summary.banner, Config.WIDTH // 2, 120, 48)
+        for text, x, y, size in summary.scores:
+            draw_text_center(surf, text, x, y, size)
 
         # Layout: two columns
         left_x = Config.WIDTH // 4
         right_x = Config.WIDTH * 3 // 4
-        start_y  = locals().get('stats_start_y', 200)
+        start_y = summary.start_y
         line_h = 40
 
-        # Column headers: always “Player 1” / “Player 2” in Pass&Play,
-        # else the usual You/Computer or You/Opponent
-        if state.pass_play_mode:
-            left_label  = ""
-            right_label = ""
-        elif state.network:
-            left_label  = "You"
-            right_label = "Opponent"
-        else:
-            left_label  = "Player"
-            right_label = "Computer"
-
-        draw_text_center(screen, left_label, left_x, start_y, 36)
-        draw_text_center(screen, right_label, right_x, start_y, 36)
+        draw_text_center(surf, summary.left_label, left_x, start_y, 36)
+        draw_text_center(surf, summary.right_label, right_x, start_y, 36)
 
         # Draw each stat row
-        for i, key in enumerate(p_stats.keys()):
+        for i, (left, right) in enumerate(summary.rows):
             y = start_y + line_h * (i + 1)
-            draw_text_center(screen, f"{key}: {p_stats[key]}", left_x, y, 28)
-            draw_text_center(screen, f"{key}: {o_stats[key]}", right_x, y, 28)
+            draw_text_center(surf, left, left_x, y, 28)
+            draw_text_center(surf, right, right_x, y, 28)
+
+        for i, line in enumerate(summary.lifetime):
+            draw_text_center(surf, line, Config.WIDTH // 2, Config.HEIGHT - 150 + 25 * i, 24)
+
+        return surf
+
+    def draw(self, screen, state):
+        # Draw the top bar (title, restart/quit buttons)
+        draw_top_bar(screen, state)
+
+        if self.surface is None:
+            # Entered without a scene change (e.g. launched straight into stats)
+            self.on_enter(state)
+        screen.blit(self.surface, (0, 0))
 
         # Action buttons: Play Again and Main Menu
         btn_y = Config.HEIGHT - 100
         btn_x = Config.WIDTH // 2 - 80
-        if not state.pass_play_mode:
+        if not self.summary.pass_play:
             draw_button(
                 screen,
                 "Play Again",
@@ -175,4 +234,4 @@ class StatsRender:
             Config.GRAY,
             Config.DARK_GRAY,
             self.logic.to_menu,3
-        )
\ No newline at end of file
+        )
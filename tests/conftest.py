@@ -0,0 +1,33 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)    # resources/ paths are relative to the repo root
+
+import pygame
+import pytest
+
+from core.config import Config
+
+
+@pytest.fixture(scope="session")
+def display():
+    pygame.init()
+    screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
+    yield screen
+    pygame.quit()
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path, monkeypatch):
+    """Keep caches out of the user's home and restore the grid afterwards."""
+    monkeypatch.setattr(Config, "HEATMAP_CACHE_PATH", str(tmp_path / "heatmaps.json"))
+    monkeypatch.setattr(Config, "STATS_DB_PATH", str(tmp_path / "stats.db"))
+    grid = Config.GRID_SIZE
+    yield
+    Config.GRID_SIZE = grid
+    Config.update_layout()
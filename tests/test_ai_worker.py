@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pytest
+
+from core.rules import Rules
+from game import ai_strategies
+from game.ai_worker import AIWorker, AIView
+
+
+def test_observe_waits_for_a_running_search(display):
+    log, started = [], threading.Event()
+
+    def slow_choose(view):
+        started.set()
+        log.append("choose start")
+        time.sleep(0.1)
+        log.append("choose end")
+        return (0, 0)
+
+    worker = AIWorker()
+    worker.submit(1, slow_choose, AIView((), (3,), ()), 50)
+    started.wait(5)
+    assert worker.busy()
+    # the main thread's deadline fired: the shot's observe() is queued behind the search
+    done = threading.Event()
+    worker.call_after(lambda r, c, hit: (log.append(("observe", r, c, hit)), done.set()), 2, 3, True)
+    assert done.wait(5)
+    assert log == ["choose start", "choose end", ("observe", 2, 3, True)]
+    deadline = time.monotonic() + 5
+    while worker.busy() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not worker.busy()
+
+
+def test_expert_caches_are_per_instance():
+    rules = Rules(8, (4, 3))
+    a = ai_strategies.create("Expert", rules)
+    b = ai_strategies.create("Expert", rules)
+    assert a.endgame is not b.endgame and a.search is not b.search
+    assert a.lock is not b.lock
+
+
+def test_strategy_without_choose_is_rejected_at_registration():
+    class Incomplete(ai_strategies.AIStrategy):
+        __slots__ = ()
+
+        def observe(self, r, c, hit):
+            pass
+
+    with pytest.raises(TypeError, match="choose"):
+        ai_strategies.register("Incomplete")(Incomplete)
+    assert "Incomplete" not in ai_strategies.names()
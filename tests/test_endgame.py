@@ -0,0 +1,16 @@
+from game.endgame import EndgameSolver
+
+
+def test_bail_out_clears_the_previous_move_report():
+    solver = EndgameSolver(200, 12)
+    small = [["EMPTY"] * 6 for _ in range(6)]
+    for r in range(6):
+        for c in range(6):
+            if r > 1:
+                small[r][c] = "MISS"    # a 3-ship fits only in the top two rows
+    assert solver.best_cell(small, [3], (), float("inf")) is not None
+    assert solver.last_candidates == 8 and solver.last_exact
+
+    fresh = [["EMPTY"] * 10 for _ in range(10)]
+    assert solver.best_cell(fresh, [5, 4, 3], (), float("inf")) is None
+    assert solver.last_candidates == 0 and not solver.last_exact
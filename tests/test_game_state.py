@@ -0,0 +1,45 @@
+import time
+
+from core.config import Config
+from core.game_state import GameState
+from game.board_helpers import create_board
+
+
+def _wait(future):
+    deadline = time.monotonic() + 10
+    while not future.done() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert future.done()
+
+
+def test_prepared_boards_are_used_for_matching_rules():
+    state = GameState(lambda: None)
+    state.prepare_next_board()
+    future = state._next_boards
+    _wait(future)
+    _, board, coords, _ = future.result()
+    state.reset()
+    assert state.computer_board is board and state.computer_ships_coords is coords
+
+
+def test_stale_generation_is_never_consumed(display):
+    Config.GRID_SIZE = 8
+    Config.update_layout()
+    state = GameState(lambda: None)
+    state.prepare_next_board()
+    stale = state._next_boards
+    _wait(stale)
+
+    Config.GRID_SIZE = 9
+    Config.update_layout()       # new round on 9x9: the 8x8 build is dropped
+    assert state._next_boards is None and len(state.computer_board) == 9
+
+    state.prepare_next_board()
+    assert state._next_boards is not stale
+    _wait(state._next_boards)
+    state.reset()
+    assert len(state.computer_board) == 9
+
+
+def test_explicit_zero_grid_is_not_replaced_by_the_default():
+    assert create_board(0) == []
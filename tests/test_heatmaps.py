@@ -0,0 +1,53 @@
+import time
+import threading
+
+from core.rules import Rules
+from game import heatmaps
+from game.ai_strategies import OpeningOrder
+from game.board_helpers import placement_masks
+from game.monte_carlo import _placements
+
+
+def test_placement_masks_match_the_sampler_tables():
+    for n, length, blocked in ((5, 1, 0), (6, 3, 0b1011 << 7), (10, 5, 1 << 44)):
+        assert sorted(placement_masks(length, n, blocked)) == sorted(_placements(n, length, blocked))
+
+
+def test_opening_order_uses_parity_until_the_heatmap_is_ready():
+    rules = Rules(7, (4, 3, 2))
+    heatmaps._memory.pop((7, rules.ship_sizes), None)
+
+    order = OpeningOrder(rules)
+    assert not order.prior
+    assert sorted(order.cells) == [(r, c) for r in range(7) for c in range(7)]
+    assert all((r + c) % 2 == 0 for r, c in order.cells[:25])
+    parity = order.cells
+
+    deadline = time.monotonic() + 30
+    while heatmaps.peek(7, rules.ship_sizes) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    order.refresh()
+    assert order.prior and sorted(order.cells) == sorted(parity)
+
+
+def test_request_does_not_wait_for_a_running_build(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    real = heatmaps.compute
+
+    def slow_compute(n, fleet):
+        started.set()
+        release.wait(5)
+        return real(n, fleet)
+
+    monkeypatch.setattr(heatmaps, "compute", slow_compute)
+    for key in ((9, (4, 3)), (9, (3, 2))):
+        heatmaps._memory.pop(key, None)
+    heatmaps.request(9, [4, 3])
+    assert started.wait(5)
+
+    t0 = time.perf_counter()
+    heatmaps.request(9, [4, 3])       # same key, build underway
+    heatmaps.request(9, [3, 2])       # another key
+    assert heatmaps.peek(9, [4, 3]) is None
+    assert time.perf_counter() - t0 < 0.1
+    release.set()
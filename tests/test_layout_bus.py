@@ -0,0 +1,69 @@
+from core.config import Config
+from core.game_state import GameState
+from core.rules import Rules, Layout
+from screens.placing_logic import PlacingLogic
+from screens.placing_render import PlacingRender
+from screens.playing_logic import PlayingLogic
+from screens.playing_render import PlayingRender
+
+
+def test_grid_change_is_published_even_when_cell_size_is_unchanged(display):
+    Config.GRID_SIZE = 5
+    Config.update_layout()
+    cell, playing_cell = Config.CELL_SIZE, Config.PLAYING_CELL_SIZE
+    seen = []
+    callback = lambda: seen.append(Config.GRID_SIZE)
+    Config.subscribe_layout(callback)
+
+    Config.GRID_SIZE = 6
+    Config.update_layout()
+
+    assert (Config.CELL_SIZE, Config.PLAYING_CELL_SIZE) == (cell, playing_cell)
+    assert seen == [6]
+
+
+def test_no_notification_without_a_change(display):
+    Config.update_layout()
+    seen = []
+    callback = lambda: seen.append(Config.GRID_SIZE)
+    Config.subscribe_layout(callback)
+    Config.update_layout()
+    assert seen == []
+
+
+def test_subscribers_rebuild_on_5_to_6(display):
+    Config.GRID_SIZE = 5
+    Config.update_layout()
+    state = GameState(lambda: None)
+    placing = PlacingLogic(display, state)
+    state.reset_callback = placing.reset
+    placing_render = PlacingRender(placing)
+    playing_render = PlayingRender(PlayingLogic(display, state, hit_sfx=None, miss_sfx=None))
+    placing.randomize()
+    assert placing.placed_ships
+
+    panels = placing_render.panel.get_width(), playing_render.panel.get_width()
+    layout = state.layout
+    Config.GRID_SIZE = 6
+    Config.update_layout()
+
+    # the state follows Config into a new round; renders pick it up on draw
+    assert state.rules.grid_size == 6 and len(state.player_board) == 6
+    assert state.layout != layout
+    assert placing.placed_ships == [] and placing.active_ship is not None
+    assert placing.grid_offset_x == Config.BOARD_OFFSET_X + 34
+    placing_render.draw(display, state)
+    playing_render.draw(display, state)
+    assert placing_render.panel.get_width() > panels[0]
+    assert playing_render.panel.get_width() > panels[1]
+
+
+def test_fixed_rules_ignore_config_changes(display):
+    Config.GRID_SIZE = 5
+    Config.update_layout()
+    state = GameState(lambda: None, rules=Rules.for_grid(8))
+    layout = state.layout
+    Config.GRID_SIZE = 6
+    Config.update_layout()
+    assert state.rules.grid_size == 8 and state.layout is layout
+    assert state.layout == Layout.compute(8)
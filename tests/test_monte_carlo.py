@@ -0,0 +1,35 @@
+import sys
+import time
+
+# Kept free of game imports beyond monte_carlo: the pool's workers import
+# this module to run _imports_pygame() (under pytest, __main__ is pytest's).
+
+from game import monte_carlo
+
+
+def _imports_pygame() -> bool:
+    return "pygame" in sys.modules
+
+
+def test_worker_tasks_do_not_import_pygame():
+    try:
+        monte_carlo.prewarm(2, block=True)
+        assert "pygame" in sys.modules
+        assert monte_carlo.pool().submit(_imports_pygame).result(timeout=30) is False
+    finally:
+        monte_carlo.shutdown()
+
+
+def test_best_cell_reports_its_sampling_rate():
+    board  = [["EMPTY"] * 8 for _ in range(8)]
+    search = monte_carlo.MonteCarloSearch(2)
+    try:
+        # cold pool: the first move samples in-process instead of waiting for spawns
+        assert search.best_cell(board, [4, 3], (), time.perf_counter() + 0.1) is not None
+        monte_carlo.prewarm(2, block=True)
+        move = search.best_cell(board, [4, 3], (), time.perf_counter() + 0.2)
+    finally:
+        monte_carlo.shutdown()
+    assert move is not None
+    assert search.last_samples > 0 and search.last_rate > 0
+
@@ -0,0 +1,20 @@
+import json
+
+from helpers.perf_hud import FrameProfiler
+
+
+def test_frames_are_streamed_not_buffered(tmp_path):
+    path = tmp_path / "perf.jsonl"
+    perf = FrameProfiler()
+    perf.start_recording(str(path))
+    for _ in range(3):
+        perf.begin_frame("playing")
+        perf.mark("draw")
+        perf.end_frame()
+    perf._log.flush()
+    assert len(path.read_text().splitlines()) == 3    # already on disk
+
+    assert perf.stop_recording() == str(path)
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["type"] for r in records] == ["frame"] * 3 + ["summary"]
+    assert all(r["build"] for r in records)
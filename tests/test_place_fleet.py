@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from game import board_helpers
+from game.board_helpers import Cell, create_board, fleet_fits, place_fleet
+
+
+def _layout(board):
+    return frozenset((r, c) for r, row in enumerate(board) for c, cell in enumerate(row)
+                     if cell is Cell.SHIP)
+
+
+def test_fallback_layouts_are_random(monkeypatch):
+    # no budget for the random restarts: every fleet goes through the fallback search
+    monkeypatch.setattr(board_helpers, "PLACEMENT_SEARCH_NODES", 0)
+    rng = random.Random(1)
+    layouts = set()
+    for _ in range(10):
+        board = create_board(6)
+        place_fleet(board, [3, 3, 2], rng)
+        layouts.add(_layout(board))
+    assert len(layouts) > 1
+
+
+def test_tight_fleet_fits():
+    board = create_board(5)
+    coords = place_fleet(board, [5, 5, 5, 5, 3, 2])
+    assert sum(map(len, coords)) == len(_layout(board)) == 25
+
+
+def test_does_not_fit_only_when_proven():
+    assert not fleet_fits([5, 5, 5, 3, 3, 3], 5)
+    with pytest.raises(ValueError):
+        place_fleet(create_board(5), [5, 5, 5, 3, 3, 3])
+
+
+def test_does_not_fit_around_placed_ships(monkeypatch):
+    monkeypatch.setattr(board_helpers, "PLACEMENT_SEARCH_NODES", 0)
+    board = create_board(5)
+    for c in range(5):
+        board[2][c] = Cell.SHIP      # a full middle row leaves two 2-row bands
+    place_fleet(board, [5, 5, 5, 5])
+    with pytest.raises(ValueError):
+        place_fleet(board, [3])
@@ -0,0 +1,41 @@
+from core.game_state import GameState
+from game.board_helpers import Cell
+from screens.placing_logic import PlacingLogic
+
+
+def _logic(display):
+    state = GameState(lambda: None)
+    return state, PlacingLogic(display, state)
+
+
+def test_auto_place_failure_is_shown_not_printed(display, capsys):
+    state, logic = _logic(display)
+    board = state.player_board
+    for r, row in enumerate(board):
+        for c in range(len(row)):
+            if (r + c) % 2 == 0:
+                row[c] = Cell.SHIP    # checkerboard: no room for any ship
+    queued = len(logic.ship_queue)
+
+    logic.auto_place_remaining()
+    assert logic.notice
+    assert capsys.readouterr().out == ""
+    assert not logic.placed_ships and len(logic.ship_queue) == queued
+
+    logic.reset()
+    assert logic.notice is None
+
+
+def test_board_is_locked_while_waiting_for_sync(display):
+    state, logic = _logic(display)
+    logic.randomize()
+    placed = [ship.coords for ship in logic.placed_ships]
+    state.waiting_for_sync = True
+
+    logic.randomize()
+    logic.undo_last_ship()
+    assert [ship.coords for ship in logic.placed_ships] == placed
+
+    state.waiting_for_sync = False
+    logic.undo_last_ship()
+    assert len(logic.placed_ships) == len(placed) - 1
@@ -0,0 +1,14 @@
+from core.game_state import GameState
+from game import monte_carlo
+from screens.settings_logic import SettingsLogic
+
+
+def test_choosing_expert_starts_the_pool(display):
+    settings = SettingsLogic(display, GameState(lambda: None))
+    try:
+        settings.apply_difficulty("Hard")
+        assert monte_carlo._pool is None
+        settings.apply_difficulty("Expert")
+        assert monte_carlo._pool is not None
+    finally:
+        monte_carlo.shutdown()
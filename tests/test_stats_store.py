@@ -0,0 +1,43 @@
+import sqlite3
+
+from core.stats_store import StatsStore
+
+
+def test_malformed_rows_are_skipped_not_fatal(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    results = [
+        {"won": "yes", "shots": "20", "hits": "9", "grid_size": "10"},
+        {"won": "no", "played_at": "yesterday"},
+        {"won": "no", "shots": "lots"},
+        {"won": "no", "shots": "12", "hits": "4", "grid_size": "10"},
+    ]
+    assert store.import_results(results) == 2
+    assert store.skipped == 2
+    store.close()
+    assert StatsStore(store.path).summary()["games"] == 2
+
+
+def test_failed_write_is_rolled_out_of_the_rollups(tmp_path):
+    path = str(tmp_path / "stats.db")
+    StatsStore(path)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TRIGGER fail BEFORE INSERT ON games "
+                 "BEGIN SELECT RAISE(ABORT, 'disk full'); END")
+    conn.commit()
+    conn.close()
+
+    store = StatsStore(path)
+    store.record({"won": True, "shots": 20, "hits": 9, "difficulty": "Hard"})
+    store.flush()
+    assert store.summary()["games"] == 0
+    assert store.breakdown("difficulty") == {}
+    store.close()
+
+
+def test_in_memory_store_keeps_its_database(capsys):
+    store = StatsStore(":memory:")
+    store.record({"won": True, "shots": 20, "hits": 9})
+    store.close()
+    assert "failed" not in capsys.readouterr().out
+    assert store._memory_conn.execute("SELECT COUNT(*) FROM games").fetchone() == (1,)
+    assert store.summary()["games"] == 1